@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+from google.cloud import bigquery
+
+from src.common.exceptions import require_env
+from src.storage.exceptions import make_bq_client, assert_dataset_access
+
+
+load_dotenv()
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# --------- Layouts ---------
+# "current" is what the tables had before the redesign, "proposed" is what
+# sql/ddl/002_silver.sql and the dbt mart configs use now.
+
+LAYOUTS = {
+    "incident_current": {
+        "current": {"partition_by": None, "cluster_by": ["incident_id", "quadrant"]},
+        "proposed": {"partition_by": "TIMESTAMP_TRUNC(start_ts, MONTH)", "cluster_by": ["quadrant", "incident_id"]},
+    },
+    "fact_incident": {
+        "current": {"partition_by": "TIMESTAMP_TRUNC(loaded_at, DAY)", "cluster_by": ["incident_id", "location_key"]},
+        "proposed": {"partition_by": "TIMESTAMP_TRUNC(start_ts, MONTH)", "cluster_by": ["location_key", "incident_id"]},
+    },
+}
+
+# --------- Query set ---------
+# Representative access paths: by start date, by quadrant, by incident.
+
+QUERIES = {
+    "incident_current": {
+        "by_start_date": """
+            SELECT incident_id, incident_info, quadrant, start_ts
+            FROM `{table}`
+            WHERE start_ts >= TIMESTAMP('{start_date}') AND start_ts < TIMESTAMP('{end_date}')
+        """,
+        "by_quadrant": """
+            SELECT incident_info, COUNT(*) AS incidents
+            FROM `{table}`
+            WHERE quadrant = '{quadrant}'
+            GROUP BY incident_info
+        """,
+        "by_incident": """
+            SELECT *
+            FROM `{table}`
+            WHERE incident_id = '{incident_id}'
+        """,
+    },
+    "fact_incident": {
+        "by_start_date": """
+            SELECT DATE(start_ts) AS day, COUNT(*) AS incidents
+            FROM `{table}`
+            WHERE start_ts >= TIMESTAMP('{start_date}') AND start_ts < TIMESTAMP('{end_date}')
+            GROUP BY day
+        """,
+        "by_quadrant": """
+            SELECT location_key, COUNT(*) AS incidents
+            FROM `{table}`
+            WHERE STARTS_WITH(location_key, '{quadrant}_')
+            GROUP BY location_key
+        """,
+        "by_incident": """
+            SELECT *
+            FROM `{table}`
+            WHERE incident_id = '{incident_id}'
+        """,
+    },
+}
+
+
+def _source_tables() -> dict[str, str]:
+    GCP_PROJECT_ID = require_env("GCP_PROJECT_ID")
+    SILVER_DATASET_ID = require_env("SILVER_DATASET_ID")
+    SILVER_TABLE_ID = require_env("SILVER_TABLE_ID")
+    MARTS_DATASET_ID = os.getenv("MARTS_DATASET_ID", "traffic_marts")
+
+    return {
+        "incident_current": f"{GCP_PROJECT_ID}.{SILVER_DATASET_ID}.{SILVER_TABLE_ID}",
+        "fact_incident": f"{GCP_PROJECT_ID}.{MARTS_DATASET_ID}.fact_incident",
+    }
+
+
+def _layout_table(bench_dataset: str, name: str, layout: str) -> str:
+    return f"{bench_dataset}.{name}__{layout}"
+
+
+def create_layout_tables(client: bigquery.Client, bench_dataset: str, sources: dict[str, str]) -> None:
+    """Copy each source table once per layout (one full scan per copy)."""
+    for name, layouts in LAYOUTS.items():
+        for layout, spec in layouts.items():
+            table = _layout_table(bench_dataset, name, layout)
+            partition = f"PARTITION BY {spec['partition_by']}" if spec["partition_by"] else ""
+            sql = f"""
+                CREATE OR REPLACE TABLE `{table}`
+                {partition}
+                CLUSTER BY {", ".join(spec["cluster_by"])}
+                AS SELECT * FROM `{sources[name]}`
+            """
+            print(f"[bench] creating {table}")
+            client.query(sql).result()
+
+
+def run_query_set(
+    client: bigquery.Client,
+    bench_dataset: str,
+    params: dict,
+    *,
+    execute: bool = False,
+) -> list[dict]:
+    """
+    Dry-run every query against every layout copy. Dry runs only see partition
+    pruning; with execute=True the queries also run (cache off) so
+    bytes_billed reflects clustering too.
+    """
+    results = []
+    for name, queries in QUERIES.items():
+        for layout in LAYOUTS[name]:
+            table = _layout_table(bench_dataset, name, layout)
+            for query_name, template in queries.items():
+                sql = template.format(table=table, **params)
+
+                dry = client.query(sql, job_config=bigquery.QueryJobConfig(dry_run=True, use_query_cache=False))
+                row = {
+                    "table": name,
+                    "layout": layout,
+                    "query": query_name,
+                    "dry_run_bytes": dry.total_bytes_processed,
+                    "bytes_processed": None,
+                    "bytes_billed": None,
+                }
+
+                if execute:
+                    job = client.query(sql, job_config=bigquery.QueryJobConfig(use_query_cache=False))
+                    job.result()
+                    row["bytes_processed"] = job.total_bytes_processed
+                    row["bytes_billed"] = job.total_bytes_billed
+
+                print(
+                    f"[bench] {name:<17} {layout:<9} {query_name:<14} "
+                    f"dry_run_bytes={row['dry_run_bytes']} bytes_billed={row['bytes_billed']}"
+                )
+                results.append(row)
+    return results
+
+
+def _default_incident_id(client: bigquery.Client, source_table: str) -> str:
+    rows = list(client.query(f"SELECT incident_id FROM `{source_table}` LIMIT 1").result())
+    if not rows:
+        raise RuntimeError(f"No rows in {source_table} to pick an incident_id from")
+    return rows[0]["incident_id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes scanned per table layout for a representative query set")
+    parser.add_argument("--bench-dataset", default=os.getenv("BENCH_DATASET_ID", "traffic_bench"),
+                        help="Scratch dataset for the per-layout copies")
+    parser.add_argument("--create", action="store_true", help="(Re)create the per-layout copies first")
+    parser.add_argument("--execute", action="store_true",
+                        help="Also run the queries (billed) to capture clustering pruning")
+    parser.add_argument("--start-date", default=None, help="YYYY-MM-DD (default: 30 days ago)")
+    parser.add_argument("--end-date", default=None, help="YYYY-MM-DD (default: today)")
+    parser.add_argument("--quadrant", default="NW")
+    parser.add_argument("--incident-id", default=None, help="Default: any incident_id from silver")
+    args = parser.parse_args()
+
+    GCP_PROJECT_ID = require_env("GCP_PROJECT_ID")
+    bench_dataset = f"{GCP_PROJECT_ID}.{args.bench_dataset}"
+
+    client = make_bq_client()
+    assert_dataset_access(client, bench_dataset)
+
+    sources = _source_tables()
+    if args.create:
+        create_layout_tables(client, bench_dataset, sources)
+
+    today = datetime.now(timezone.utc).date()
+    params = {
+        "start_date": args.start_date or (today - timedelta(days=30)).isoformat(),
+        "end_date": args.end_date or today.isoformat(),
+        "quadrant": args.quadrant,
+        "incident_id": args.incident_id or _default_incident_id(client, sources["incident_current"]),
+    }
+
+    results = run_query_set(client, bench_dataset, params, execute=args.execute)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RESULTS_DIR / f"bq_layout_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    out.write_text(
+        json.dumps({"params": params, "layouts": LAYOUTS, "results": results}, indent=2),
+        encoding="utf-8",
+    )
+    print(f"[bench] wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
+
+# Usage (from repo root):
+# python -m benchmarks.bq_layout --create
+# python -m benchmarks.bq_layout --execute --quadrant SE --start-date 2026-01-01 --end-date 2026-02-01
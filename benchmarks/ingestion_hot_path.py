@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+# Offline: the fake endpoint below replaces requests.post, these only satisfy require_env.
+os.environ.setdefault("API_BASE_URL", "https://bench.invalid/api")
+os.environ.setdefault("APP_TOKEN", "bench")
+
+import pydantic
+
+import src.ingestion.runner as runner
+from src.common.instrumentation import collect_stages, summarize_stages
+from src.ingestion.mappers import IngestionMeta, _iso, to_bronze_row
+from src.ingestion.socrata_models import TrafficIncidentRow, _parse_dt
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+SUITE = "ingestion_hot_path"
+SCHEMA_VERSION = 1
+BASELINE_PATH = RESULTS_DIR / f"{SUITE}_baseline.json"
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+PAGE_SIZE = 1000
+# Distinct fake pages served in rotation; pre-encoded so building responses
+# is not part of the pull being timed.
+FAKE_PAGES = 10
+
+DEFAULT_MICRO_ROWS = 10_000
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.10
+
+
+# --------- Fixtures ---------
+
+def make_raw_row(i: int) -> dict:
+    """One API row shaped like the Socrata response (strings, padded text, point, system fields)."""
+    lon = -114.0719 + (i % 500) * 1e-4
+    lat = 51.0447 + (i % 300) * 1e-4
+    return {
+        "incident_info": f"  {i % 97} Street and {i % 89} Avenue NW  ",
+        "description": "Traffic incident. Blocking the right lane" if i % 3 else "Stalled vehicle",
+        "start_dt": f"2026-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:02.000",
+        "modified_dt": f"2026-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:45.000" if i % 2 else None,
+        "quadrant": ["nw", "NE", " sw", "SE"][i % 4],
+        "longitude": f"{lon:.7f}",
+        "latitude": f"{lat:.7f}",
+        "count": "1",
+        "id": f"inc_{i:08d}",
+        "point": {"type": "Point", "coordinates": [float(f"{lon:.7f}"), float(f"{lat:.7f}")]},
+        ":id": f"row-{i:08d}",
+        ":version": f"rv-{i:08d}",
+        ":created_at": f"2026-01-{1 + i % 28:02d}T{i % 24:02d}:00:00.000Z",
+        ":updated_at": f"2026-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:59.833Z",
+        ":@computed_region_4b54_tmc4": str(i % 14),
+    }
+
+
+def _meta() -> IngestionMeta:
+    return IngestionMeta(
+        snapshot_id="bench_snapshot",
+        snapshot_ts=datetime(2026, 2, 1, tzinfo=timezone.utc),
+        run_type="backfill",
+        query_name="bench",
+    )
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeEndpoint:
+    """Stands in for requests.post: serves total_rows rows in pages, then an empty page."""
+
+    def __init__(self, total_rows: int, page_size: int = PAGE_SIZE) -> None:
+        self.total_rows = total_rows
+        self.page_size = page_size
+        pages = [
+            [make_raw_row(p * page_size + i) for i in range(page_size)]
+            for p in range(min(FAKE_PAGES, -(-total_rows // page_size)))
+        ]
+        self.pages = [json.dumps({"data": rows}).encode("utf-8") for rows in pages]
+        last = total_rows % page_size
+        self.last_page = json.dumps({"data": pages[0][:last]}).encode("utf-8") if last else None
+
+    def __call__(self, url, **kwargs) -> FakeResponse:
+        page_number = kwargs["json"]["page"]["pageNumber"]
+        remaining = self.total_rows - (page_number - 1) * self.page_size
+        if remaining <= 0:
+            return FakeResponse(b'{"data": []}')
+        if remaining < self.page_size:
+            return FakeResponse(self.last_page)
+        return FakeResponse(self.pages[(page_number - 1) % len(self.pages)])
+
+
+# --------- Harness ---------
+
+def measure(name: str, fn: Callable[[], object], *, items: int, repeat: int, warmup: int = 1) -> dict:
+    """Run fn repeat times (after warmup runs) with gc off, like timeit; items is work per run."""
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    median = statistics.median(timings)
+    result = {
+        "items": items,
+        "repeat": repeat,
+        "median_s": round(median, 6),
+        "min_s": round(min(timings), 6),
+        "max_s": round(max(timings), 6),
+        "stdev_s": round(statistics.stdev(timings), 6) if len(timings) > 1 else 0.0,
+        "items_per_sec": round(items / median, 1) if median > 0 else None,
+        "us_per_item": round(median / items * 1e6, 3) if items else None,
+    }
+    print(
+        f"[bench] {name:<22} median={result['median_s']:.4f}s "
+        f"{result['us_per_item']:>9.3f}us/item {result['items_per_sec']:>12.0f} items/s"
+    )
+    return result
+
+
+def micro_benchmarks(rows: int, repeat: int) -> dict[str, dict]:
+    raw_rows = [make_raw_row(i) for i in range(rows)]
+    validated = [TrafficIncidentRow.model_validate(r) for r in raw_rows]
+    meta = _meta()
+    bronze_rows = [to_bronze_row(meta, v) for v in validated]
+    naive_ts = [r["start_dt"] for r in raw_rows]
+    utc_ts = [r[":updated_at"] for r in raw_rows]
+    datetimes = [v.socrata_updated_at for v in validated]
+
+    return {
+        "model_validate": measure(
+            "model_validate", lambda: [TrafficIncidentRow.model_validate(r) for r in raw_rows],
+            items=rows, repeat=repeat,
+        ),
+        "to_bronze_row": measure(
+            "to_bronze_row", lambda: [to_bronze_row(meta, v) for v in validated],
+            items=rows, repeat=repeat,
+        ),
+        "parse_dt_naive": measure(
+            "parse_dt_naive", lambda: [_parse_dt(s) for s in naive_ts],
+            items=rows, repeat=repeat,
+        ),
+        "parse_dt_utc": measure(
+            "parse_dt_utc", lambda: [_parse_dt(s) for s in utc_ts],
+            items=rows, repeat=repeat,
+        ),
+        "iso": measure(
+            "iso", lambda: [_iso(dt) for dt in datetimes],
+            items=rows, repeat=repeat,
+        ),
+        "json_dumps_bronze": measure(
+            "json_dumps_bronze", lambda: [json.dumps(b, ensure_ascii=False) for b in bronze_rows],
+            items=rows, repeat=repeat,
+        ),
+    }
+
+
+def pull_benchmark(label: str, total_rows: int, repeat: int, work_dir: str) -> dict:
+    """The whole _pull_pages_to_ndjson loop (decode, validate, map, serialize, write) against FakeEndpoint."""
+    endpoint = FakeEndpoint(total_rows)
+    out_path = os.path.join(work_dir, f"pull_{label}.jsonl")
+    real_post = runner.requests.post
+    runner.requests.post = endpoint
+    stages: dict = {}
+    try:
+        def pull():
+            # the pull's own summary print is noise here
+            with collect_stages() as collected, contextlib.redirect_stdout(io.StringIO()):
+                stats = runner._pull_pages_to_ndjson(
+                    soql="SELECT *", page_size=PAGE_SIZE, max_pages=None, meta=_meta(), out_path=out_path,
+                )
+            if stats.rows_written != total_rows:
+                raise RuntimeError(f"pull wrote {stats.rows_written} rows, expected {total_rows}")
+            stages.update(summarize_stages(collected)["stages"])
+
+        result = measure(f"pull_pages_{label}", pull, items=total_rows, repeat=repeat, warmup=0)
+    finally:
+        runner.requests.post = real_post
+        if os.path.exists(out_path):
+            os.remove(out_path)
+    return {**result, "stages": stages}
+
+
+# --------- Results ---------
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "pydantic": pydantic.VERSION,
+        "git_commit": _git_commit(),
+    }
+
+
+def run_suite(*, sizes: list[str], micro_rows: int, repeat: int) -> dict:
+    results: dict[str, dict] = {}
+    if micro_rows:
+        results.update(micro_benchmarks(micro_rows, repeat))
+
+    with tempfile.TemporaryDirectory(prefix="bench_pull_") as work_dir:
+        for label in sizes:
+            total_rows = SIZES[label]
+            # big pulls take seconds and vary little; one timed run each
+            pull_repeat = repeat if total_rows <= 10_000 else 1
+            results[f"pull_pages_{label}"] = pull_benchmark(label, total_rows, pull_repeat, work_dir)
+
+    return {
+        "suite": SUITE,
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "env": environment(),
+        "params": {"sizes": sizes, "micro_rows": micro_rows, "repeat": repeat, "page_size": PAGE_SIZE},
+        "results": results,
+    }
+
+
+def write_result(report: dict, path: Path | None = None) -> Path:
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = path or RESULTS_DIR / f"{SUITE}_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"[bench] wrote {path}")
+    return path
+
+
+def compare(baseline: dict, current: dict, *, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """
+    Median time per item, current vs baseline, for benchmarks in both reports.
+
+    A benchmark regressed when it got slower by more than threshold (0.10 = 10%).
+    """
+    if baseline.get("env", {}).get("python") != current.get("env", {}).get("python"):
+        print(
+            f"[bench] WARNING: comparing across Python versions "
+            f"({baseline.get('env', {}).get('python')} -> {current.get('env', {}).get('python')})"
+        )
+
+    rows = []
+    for name in sorted(set(baseline["results"]) & set(current["results"])):
+        before = baseline["results"][name]["us_per_item"]
+        after = current["results"][name]["us_per_item"]
+        change = (after - before) / before if before else 0.0
+        status = "regressed" if change > threshold else "improved" if change < -threshold else "same"
+        rows.append({"name": name, "baseline_us": before, "current_us": after, "change": round(change, 4), "status": status})
+        print(f"[bench] {name:<22} {before:>10.3f}us -> {after:>10.3f}us  {change:+7.1%}  {status}")
+
+    for name in sorted(set(baseline["results"]) ^ set(current["results"])):
+        print(f"[bench] {name:<22} only in {'baseline' if name in baseline['results'] else 'current'}")
+    return rows
+
+
+def _read(path: str | Path) -> dict:
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if report.get("suite") != SUITE:
+        raise ValueError(f"{path} is not a {SUITE} result (suite={report.get('suite')})")
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the ingestion hot path")
+    parser.add_argument("--sizes", default="1k,100k,1M", help=f"pull sizes, comma-separated from {list(SIZES)}")
+    parser.add_argument("--micro-rows", type=int, default=DEFAULT_MICRO_ROWS, help="rows per micro-benchmark run (0 skips them)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write {BASELINE_PATH.name}")
+    parser.add_argument("--compare", nargs="?", const=str(BASELINE_PATH), default=None,
+                        help="compare against a baseline result (default: the saved baseline)")
+    parser.add_argument("--current", default=None, help="with --compare: an existing result to compare instead of running")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="regression threshold, 0.10 = 10%% slower")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown sizes {unknown}; expected some of {list(SIZES)}")
+
+    if args.current:
+        if not args.compare:
+            parser.error("--current needs --compare")
+        current = _read(args.current)
+    else:
+        current = run_suite(sizes=sizes, micro_rows=args.micro_rows, repeat=args.repeat)
+        write_result(current)
+        if args.save_baseline:
+            write_result(current, BASELINE_PATH)
+
+    if args.compare:
+        rows = compare(_read(args.compare), current, threshold=args.threshold)
+        regressed = [r["name"] for r in rows if r["status"] == "regressed"]
+        if regressed:
+            print(f"[bench] REGRESSED beyond {args.threshold:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+
+# Usage (from repo root):
+# python -m benchmarks.ingestion_hot_path --save-baseline
+# python -m benchmarks.ingestion_hot_path --sizes 1k,100k --compare
+# python -m benchmarks.ingestion_hot_path --compare benchmarks/results/ingestion_hot_path_baseline.json --current benchmarks/results/ingestion_hot_path_<ts>.json
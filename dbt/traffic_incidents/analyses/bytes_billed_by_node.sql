@@ -0,0 +1,40 @@
+-- Bytes processed/billed per dbt node and day, from BigQuery job history.
+-- Relies on `query-comment: job-label: true` in dbt_project.yml (node_id label).
+-- Compare a window before and after a model change:
+--   dbt compile -s bytes_billed_by_node --vars '{bytes_report_days: 14}'
+--   then run target/compiled/traffic_incidents/analyses/bytes_billed_by_node.sql
+-- Data tests only (node_id labels are the sanitized unique_id, e.g. test_traffic_incidents_...):
+--   dbt compile -s bytes_billed_by_node --vars '{bytes_report_node_prefix: test_}'
+
+{% set days = var('bytes_report_days', 14) %}
+{% set node_prefix = var('bytes_report_node_prefix', '') %}
+
+with jobs as (
+    select
+        creation_time,
+        (select value from unnest(labels) where key = 'node_id') as node_id,
+        total_bytes_processed,
+        total_bytes_billed,
+        total_slot_ms,
+        timestamp_diff(end_time, start_time, millisecond) as run_ms
+    from `region-{{ target.location | lower }}`.INFORMATION_SCHEMA.JOBS_BY_PROJECT
+    where creation_time >= timestamp_sub(current_timestamp(), interval {{ days }} day)
+        and job_type = 'QUERY'
+        and state = 'DONE'
+)
+
+select
+    date(creation_time) as run_date,
+    node_id,
+    count(*) as jobs,
+    sum(total_bytes_processed) as bytes_processed,
+    sum(total_bytes_billed) as bytes_billed,
+    sum(total_slot_ms) as slot_ms,
+    sum(run_ms) as run_ms
+from jobs
+where node_id is not null
+{% if node_prefix %}
+    and starts_with(node_id, '{{ node_prefix }}')
+{% endif %}
+group by run_date, node_id
+order by node_id, run_date
@@ -0,0 +1,35 @@
+{% macro incremental_lower_bound(column, lookback_days) %}
+  {#-
+    Lower bound for an incremental run: the day of max(column) already in
+    {{ this }}, minus lookback_days. Rendered as a timestamp literal (not a
+    subquery) so BigQuery can prune the upstream partitions, and day-aligned
+    so insert_overwrite models always rebuild whole partitions.
+
+    When the pipeline passes the snapshot being built (--vars snapshot_ts),
+    the bound is taken from that snapshot's day instead and {{ this }} is not
+    queried.
+
+    --vars incremental_lookback_days widens the lookback of every model at
+    once (never narrows it). The scheduled full build sets it so that it
+    rebuilds the last couple of weeks, repairing what a failed or skipped run
+    left behind in that window. Gaps older than that are only repaired by a
+    --full-refresh build.
+  -#}
+  {%- set days = [lookback_days, var('incremental_lookback_days', 0) | int] | max -%}
+  {%- set value = none -%}
+  {%- set snapshot_ts = var('snapshot_ts', none) -%}
+  {%- if snapshot_ts -%}
+    {%- set snapshot_day = modules.datetime.date.fromisoformat(snapshot_ts[:10]) -%}
+    {%- set value = (snapshot_day - modules.datetime.timedelta(days=days)).isoformat() -%}
+  {%- elif execute -%}
+    {%- set sql -%}
+      select format_timestamp(
+        '%Y-%m-%d',
+        timestamp_sub(timestamp_trunc(max({{ column }}), day), interval {{ days }} day)
+      )
+      from {{ this }}
+    {%- endset -%}
+    {%- set value = run_query(sql).columns[0].values()[0] -%}
+  {%- endif -%}
+  timestamp('{{ value or "1970-01-01" }}')
+{%- endmacro %}
@@ -0,0 +1,29 @@
+{% macro test_window_start() %}
+  {#-
+    First day a scoped data test looks at: the day of the snapshot being built
+    (--vars snapshot_ts, passed by the pipeline) or of the dbt invocation,
+    minus test_window_days. Rendered as a literal so BigQuery prunes partitions.
+  -#}
+  {%- set snapshot_ts = var('snapshot_ts', none) -%}
+  {%- if snapshot_ts -%}
+    {%- set anchor = modules.datetime.date.fromisoformat(snapshot_ts[:10]) -%}
+  {%- else -%}
+    {%- set anchor = run_started_at.date() -%}
+  {%- endif -%}
+  {%- set start = anchor - modules.datetime.timedelta(days=var('test_window_days', 3)) -%}
+  timestamp('{{ start.isoformat() }}')
+{%- endmacro %}
+
+
+{% macro test_window(column) %}
+  {#-
+    Predicate restricting a singular test to recently built partitions of
+    `column`. With --vars '{full_scan_tests: true}' (the scheduled full build)
+    it renders `true` and the test checks the whole table.
+  -#}
+  {%- if var('full_scan_tests', false) -%}
+    true
+  {%- else -%}
+    {{ column }} >= {{ test_window_start() }}
+  {%- endif -%}
+{%- endmacro %}
@@ -1,3 +1,21 @@
+{{ config(
+    materialized='incremental',
+    incremental_strategy='merge',
+    unique_key=['incident_id', 'valid_from'],
+    partition_by={"field": "observed_snapshot_ts", "data_type": "timestamp", "granularity": "day"},
+    cluster_by=["incident_id"]
+) }}
+
+-- Incremental: only bronze rows from new snapshots (plus a lookback) are read.
+-- They are compared against the latest stored event of the same incident, so
+-- only versions newer than that are appended. Late rows older than the latest
+-- stored version need a --full-refresh.
+--
+-- observed_snapshot_ts is the first snapshot that showed a version, not the
+-- one whose row was kept: later snapshots keep re-observing a version, so
+-- "latest" would depend on which snapshots a build happened to read and
+-- incremental and full builds would disagree.
+
 with base as (
     select
         incident_id,
@@ -9,6 +27,9 @@ with base as (
     from {{ ref('stg_traffic_incidents_raw') }}
     where incident_id is not null
         and source_updated_at is not null
+    {% if is_incremental() %}
+        and snapshot_ts >= {{ incremental_lower_bound('observed_snapshot_ts', var('scd2_lookback_days', 2)) }}
+    {% endif %}
 ),
 
 -- if multiple records land with the same source_updated_at for an incident,
@@ -18,6 +39,9 @@ dedup_same_updated_at as (
     from (
         select
             *,
+            min(snapshot_ts) over (
+                partition by incident_id, source_updated_at
+            ) as first_snapshot_ts,
             row_number() over (
                 partition by incident_id, source_updated_at
                 order by snapshot_ts desc, snapshot_id desc
@@ -27,6 +51,47 @@ dedup_same_updated_at as (
     where rn = 1
 ),
 
+{% if is_incremental() %}
+-- latest stored version of every touched incident: the starting point for
+-- change detection (never re-emitted)
+anchor as (
+    select
+        incident_id,
+        incident_info,
+        description,
+        valid_from as source_updated_at,
+        observed_snapshot_ts as snapshot_ts,
+        cast(null as string) as snapshot_id,
+        observed_snapshot_ts as first_snapshot_ts,
+        true as is_anchor
+    from {{ this }}
+    where incident_id in (select incident_id from dedup_same_updated_at)
+    qualify row_number() over (partition by incident_id order by valid_from desc) = 1
+),
+
+candidates as (
+    select
+        d.*,
+        false as is_anchor
+    from dedup_same_updated_at d
+    left join anchor a
+        on d.incident_id = a.incident_id
+    where a.incident_id is null
+        or d.source_updated_at > a.source_updated_at
+
+    union all
+
+    select * from anchor
+),
+{% else %}
+candidates as (
+    select
+        *,
+        false as is_anchor
+    from dedup_same_updated_at
+),
+{% endif %}
+
 -- identify actual change events (including the first observed state).
 changes as (
     select
@@ -39,16 +104,20 @@ changes as (
             partition by incident_id
             order by source_updated_at, snapshot_ts, snapshot_id
         ) as prev_description
-    from dedup_same_updated_at
+    from candidates
 )
 
 select
     incident_id,
     incident_info,
     description,
-    source_updated_at as valid_from
+    source_updated_at as valid_from,
+    first_snapshot_ts as observed_snapshot_ts
 from changes
-    where prev_incident_info is null
-    or prev_description is null
-    or incident_info != prev_incident_info
-    or description != prev_description
\ No newline at end of file
+    where not is_anchor
+    and (
+        prev_incident_info is null
+        or prev_description is null
+        or incident_info != prev_incident_info
+        or description != prev_description
+    )
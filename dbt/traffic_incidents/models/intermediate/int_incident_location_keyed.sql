@@ -1,12 +1,6 @@
 {{ config(materialized='view') }}
 
-select
-    *,
-    concat(
-        quadrant, '_',
-        cast(round(latitude, 3) as string), '_',
-        cast(round(longitude, 3) as string)
-    ) as location_key,
-    round(latitude, 3) as latitude_bucket,
-    round(longitude, 3) as longitude_bucket
+-- location_key is computed at ingestion (src/utils/geo_utils.py) and stored
+-- on silver; nothing is derived here anymore.
+select *
 from {{ ref('stg_incident_current') }}
\ No newline at end of file
@@ -24,16 +24,13 @@ select
     latitude,
     longitude,
 
-    -- same location_key logic as dim_location
-    concat(
-        quadrant, '_',
-        cast(round(latitude, 3) as string), '_',
-        cast(round(longitude, 3) as string)
-    ) as location_key
+    -- location bucket computed at ingestion (src/utils/geo_utils.py)
+    location_key
 
 from {{ ref('stg_traffic_incidents_raw') }}
 where incident_id is not null
     and snapshot_id is not null
     and quadrant is not null
     and latitude is not null
-    and longitude is not null
\ No newline at end of file
+    and longitude is not null
+    and location_key is not null
\ No newline at end of file
@@ -1,4 +1,7 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='table',
+    cluster_by=["incident_id"]
+) }}
 
 select
     incident_id,
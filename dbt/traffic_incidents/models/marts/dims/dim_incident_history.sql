@@ -1,17 +1,58 @@
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='merge',
+    unique_key=['incident_id', 'valid_from'],
     partition_by={"field": "valid_from", "data_type": "timestamp"},
     cluster_by=["incident_id"]
 ) }}
 
+-- Incremental: only incidents with new change events are touched. Their open
+-- (is_current) version is re-emitted with valid_to closed by the first newer
+-- event, and the new versions are appended; merge on (incident_id, valid_from).
+
 with events as (
     select
         incident_id,
         incident_info,
         description,
-        valid_from
+        valid_from,
+        observed_snapshot_ts
     from {{ ref('int_incident_attr_change_events') }}
+    {% if is_incremental() %}
+    where observed_snapshot_ts >= {{ incremental_lower_bound('observed_snapshot_ts', var('scd2_lookback_days', 2)) }}
+    {% endif %}
+),
+
+{% if is_incremental() %}
+open_versions as (
+    select
+        incident_id,
+        incident_info,
+        description,
+        valid_from,
+        observed_snapshot_ts
+    from {{ this }}
+    where is_current
+        and incident_id in (select incident_id from events)
+),
+
+versions as (
+    select e.*
+    from events e
+    left join open_versions o
+        on e.incident_id = o.incident_id
+    where o.incident_id is null
+        or e.valid_from > o.valid_from
+
+    union all
+
+    select * from open_versions
+),
+{% else %}
+versions as (
+    select * from events
 ),
+{% endif %}
 
 scd as (
     select
@@ -22,8 +63,9 @@ scd as (
         lead(valid_from) over (
             partition by incident_id
             order by valid_from
-        ) as valid_to
-    from events
+        ) as valid_to,
+        observed_snapshot_ts
+    from versions
 )
 
 select
@@ -32,5 +74,6 @@ select
     description,
     valid_from,
     valid_to,
-    valid_to is null as is_current
-from scd
\ No newline at end of file
+    valid_to is null as is_current,
+    observed_snapshot_ts
+from scd
@@ -1,11 +1,49 @@
-{{ config(materialized='table') }}
+{{ config(
+    materialized='incremental',
+    incremental_strategy='merge',
+    unique_key='location_key',
+    cluster_by=["quadrant", "location_key"]
+) }}
 
-select distinct
+-- location_key is computed at ingestion (src/utils/geo_utils.py), so this only
+-- collects keys. Incremental runs read recent bronze partitions and insert keys
+-- not seen before; existing rows never change. Sourced from bronze so every
+-- key in fact_incident_snapshot has a row, not just the current locations.
+
+with observed as (
+    select
+        location_key,
+        quadrant,
+        latitude,
+        longitude,
+        snapshot_ts
+    from {{ ref('stg_traffic_incidents_raw') }}
+    where location_key is not null
+    {% if is_incremental() %}
+        and snapshot_ts >= {{ incremental_lower_bound('first_seen_snapshot_ts', var('dim_location_lookback_days', 2)) }}
+    {% endif %}
+),
+
+first_seen as (
+    select
+        location_key,
+        array_agg(
+            struct(quadrant, latitude, longitude)
+            order by snapshot_ts
+            limit 1
+        )[offset(0)] as first_point,
+        min(snapshot_ts) as first_seen_snapshot_ts
+    from observed
+    group by location_key
+)
+
+select
     location_key,
-    quadrant,
-    latitude_bucket as latitude,
-    longitude_bucket as longitude
-from {{ ref('int_incident_location_keyed') }}
-where latitude_bucket is not null
-    and longitude_bucket is not null
-    and quadrant is not null
\ No newline at end of file
+    first_point.quadrant as quadrant,
+    round(first_point.latitude, 3) as latitude,
+    round(first_point.longitude, 3) as longitude,
+    first_seen_snapshot_ts
+from first_seen
+{% if is_incremental() %}
+where location_key not in (select location_key from {{ this }})
+{% endif %}
@@ -1,9 +1,13 @@
 {{ config(
   materialized='table',
-  partition_by={"field": "loaded_at", "data_type": "timestamp"},
-  cluster_by=["incident_id","location_key"]
+  partition_by={"field": "start_ts", "data_type": "timestamp", "granularity": "month"},
+  cluster_by=["location_key","incident_id"]
 ) }}
 
+-- Layout follows the query set in benchmarks/bq_layout.py: start-date ranges
+-- prune months, and location_key starts with the quadrant, so quadrant
+-- filters (starts_with(location_key, 'NW_')) and incident lookups use clustering.
+
 select
     -- grain: 1 row per incident (current/latest state)
     incident_id,
@@ -1,9 +1,14 @@
 {{ config(
-    materialized='table',
-    partition_by={"field": "snapshot_ts", "data_type": "timestamp"},
+    materialized='incremental',
+    incremental_strategy='insert_overwrite',
+    partition_by={"field": "snapshot_ts", "data_type": "timestamp", "granularity": "day"},
     cluster_by=["incident_id", "location_key"]
 ) }}
 
+-- Incremental: only snapshot partitions from the latest loaded day minus a
+-- lookback (late arrivals / reruns) are rebuilt. Full rebuild:
+--   dbt build --full-refresh -s fact_incident_snapshot
+
 select
     snapshot_id,
     snapshot_ts,
@@ -23,4 +28,7 @@ select
     run_type,
     query_name
 
-from {{ ref('int_snapshot_incident_location_keyed') }}
\ No newline at end of file
+from {{ ref('int_snapshot_incident_location_keyed') }}
+{% if is_incremental() %}
+where snapshot_ts >= {{ incremental_lower_bound('snapshot_ts', var('fact_incident_snapshot_lookback_days', 2)) }}
+{% endif %}
@@ -11,10 +11,7 @@ with f as (
   from {{ ref('fact_incident_snapshot') }}
   {% if is_incremental() %}
     -- reprocess a small lookback window to handle late arrivals / reruns
-    where snapshot_ts >= timestamp_sub(
-      (select max(snapshot_ts) from {{ this }}),
-      interval 2 day
-    )
+    where snapshot_ts >= {{ incremental_lower_bound('snapshot_ts', var('fact_incident_snapshot_enriched_lookback_days', 2)) }}
   {% endif %}
 ),
 
@@ -26,6 +23,7 @@ scd as (
     valid_from,
     valid_to
   from {{ ref('dim_incident_history') }}
+  where incident_id in (select incident_id from f)
 ),
 
 cur as (
@@ -34,15 +32,58 @@ cur as (
     incident_info,
     description
   from {{ ref('dim_incident') }}
+),
+
+-- As-of lookup without a range join: interleave each incident's SCD2 version
+-- starts with its snapshot rows and carry the latest version start forward.
+-- Version starts sort first on ties, matching snapshot_ts >= valid_from; the
+-- carried valid_from is then the version key for a plain equi-join.
+timeline as (
+  select
+    snapshot_id,
+    incident_id,
+    snapshot_ts,
+    location_key,
+    run_type,
+    query_name,
+    snapshot_ts as event_ts,
+    1 as event_order,
+    cast(null as timestamp) as version_valid_from
+  from f
+
+  union all
+
+  select
+    cast(null as string) as snapshot_id,
+    incident_id,
+    cast(null as timestamp) as snapshot_ts,
+    cast(null as string) as location_key,
+    cast(null as string) as run_type,
+    cast(null as string) as query_name,
+    valid_from as event_ts,
+    0 as event_order,
+    valid_from as version_valid_from
+  from scd
+),
+
+keyed as (
+  select
+    * except(version_valid_from),
+    last_value(version_valid_from ignore nulls) over (
+      partition by incident_id
+      order by event_ts, event_order
+      rows between unbounded preceding and current row
+    ) as version_valid_from
+  from timeline
 )
 
 select
-  f.snapshot_id,
-  f.incident_id,
-  f.snapshot_ts,
-  f.location_key,
-  f.run_type,
-  f.query_name,
+  k.snapshot_id,
+  k.incident_id,
+  k.snapshot_ts,
+  k.location_key,
+  k.run_type,
+  k.query_name,
 
   (scd.incident_id is null) as used_current_fallback,
   coalesce(scd.incident_info, cur.incident_info) as incident_info_asof,
@@ -51,11 +92,12 @@ select
   scd.valid_from,
   scd.valid_to
 
-from f
+from keyed k
 left join scd
-  on f.incident_id = scd.incident_id
- and f.snapshot_ts >= scd.valid_from
- and (f.snapshot_ts < scd.valid_to or scd.valid_to is null)
+  on k.incident_id = scd.incident_id
+ and k.version_valid_from = scd.valid_from
 
 left join cur
-  on f.incident_id = cur.incident_id
+  on k.incident_id = cur.incident_id
+
+where k.event_order = 1
@@ -1,6 +1,38 @@
-{{ config(materialized='table') }}
+{{ config(
+  materialized='incremental',
+  incremental_strategy='merge',
+  unique_key='snapshot_id',
+  partition_by={"field": "snapshot_ts", "data_type": "timestamp", "granularity": "day"}
+) }}
 
-with bronze as (
+-- Fed by the run-stats records run_pipeline writes to traffic_control.pipeline_runs.
+-- Snapshots without a record (runs before the table existed, or without
+-- --record-run-stats) are aggregated from bronze instead. Incremental runs only
+-- read recent partitions of both.
+
+{% if is_incremental() %}
+  {% set lower_bound = incremental_lower_bound('snapshot_ts', var('pipeline_run_log_lookback_days', 2)) %}
+{% endif %}
+
+with run_stats as (
+  select
+    snapshot_id,
+    snapshot_ts,
+    run_type,
+    query_name,
+    rows_loaded,
+    distinct_incidents,
+    min_source_updated_at,
+    max_source_updated_at
+  from {{ source('traffic_control', 'pipeline_runs') }}
+  where rows_loaded > 0
+  {% if is_incremental() %}
+    and snapshot_ts >= {{ lower_bound }}
+  {% endif %}
+  qualify row_number() over (partition by snapshot_id order by recorded_at desc) = 1
+),
+
+bronze as (
   select
     snapshot_id,
     snapshot_ts,
@@ -9,9 +41,13 @@ with bronze as (
     incident_id,
     source_updated_at
   from {{ ref('stg_traffic_incidents_raw') }}
+  where snapshot_id not in (select snapshot_id from run_stats)
+  {% if is_incremental() %}
+    and snapshot_ts >= {{ lower_bound }}
+  {% endif %}
 ),
 
-agg as (
+bronze_agg as (
   select
     snapshot_id,
     any_value(snapshot_ts) as snapshot_ts,
@@ -22,12 +58,18 @@ agg as (
     count(distinct incident_id) as distinct_incidents,
 
     min(source_updated_at) as min_source_updated_at,
-    max(source_updated_at) as max_source_updated_at,
-
-    current_timestamp() as loaded_at
+    max(source_updated_at) as max_source_updated_at
   from bronze
   group by snapshot_id
+),
+
+agg as (
+  select * from run_stats
+  union all
+  select * from bronze_agg
 )
 
-select *
+select
+  *,
+  current_timestamp() as loaded_at
 from agg
@@ -18,6 +18,7 @@ select
     upper(cast(quadrant as string)) as quadrant,
     cast(longitude as float64) as longitude,
     cast(latitude as float64) as latitude,
+    cast(location_key as string) as location_key,
     cast(count as int64) as count,
 
     -- source lineage
@@ -3,8 +3,9 @@ with x as (
         count(*) as total_rows,
         sum(case when used_current_fallback then 1 else 0 end) as fallback_rows
     from {{ ref('fact_incident_snapshot_enriched') }}
+    where {{ test_window('snapshot_ts') }}
 )
 
 select *
 from x
-where safe_divide(fallback_rows, total_rows) > 0.05
\ No newline at end of file
+where safe_divide(fallback_rows, total_rows) > 0.05
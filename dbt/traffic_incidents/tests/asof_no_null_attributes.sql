@@ -2,5 +2,6 @@ select
     snapshot_id,
     incident_id
 from {{ ref('fact_incident_snapshot_enriched') }}
-where incident_info_asof is null
-    or description_asof is null
\ No newline at end of file
+where {{ test_window('snapshot_ts') }}
+    and (incident_info_asof is null
+        or description_asof is null)
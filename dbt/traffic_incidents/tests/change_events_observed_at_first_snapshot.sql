@@ -0,0 +1,25 @@
+-- Incremental and full builds must agree: every change event is stamped with
+-- the first snapshot that showed its version, whichever build emitted it.
+with events as (
+  select incident_id, valid_from, observed_snapshot_ts
+  from {{ ref('int_incident_attr_change_events') }}
+  where {{ test_window('observed_snapshot_ts') }}
+),
+first_seen as (
+  select
+    s.incident_id,
+    s.source_updated_at,
+    min(s.snapshot_ts) as first_snapshot_ts
+  from {{ ref('stg_traffic_incidents_raw') }} s
+  join (select distinct incident_id from events) e
+    on s.incident_id = e.incident_id
+  group by s.incident_id, s.source_updated_at
+)
+
+select e.*, f.first_snapshot_ts
+from events e
+left join first_seen f
+  on e.incident_id = f.incident_id
+  and e.valid_from = f.source_updated_at
+where f.first_snapshot_ts is null
+  or e.observed_snapshot_ts != f.first_snapshot_ts
@@ -1,10 +1,18 @@
 {% set hours = var('freshness_hours', 36) %}
 
-with max_ts as (
-  select max(snapshot_ts) as max_snapshot_ts
-  from {{ ref('fact_incident_snapshot') }}
+-- Fail only if the table has data but nothing within the freshness window.
+-- count(*) without a filter is answered from table metadata and the recent
+-- count only reads the last partitions, unlike max(snapshot_ts) over the table.
+with stats as (
+  select
+    (select count(*) from {{ ref('fact_incident_snapshot') }}) as total_rows,
+    (
+      select count(*)
+      from {{ ref('fact_incident_snapshot') }}
+      where snapshot_ts >= timestamp_sub(current_timestamp(), interval {{ hours }} hour)
+    ) as recent_rows
 )
-select max_snapshot_ts
-from max_ts
-where max_snapshot_ts is not null
-  and max_snapshot_ts < timestamp_sub(current_timestamp(), interval {{ hours }} hour)
+select *
+from stats
+where total_rows > 0
+  and recent_rows = 0
@@ -1,9 +1,12 @@
 -- Fail only if the table has data but nothing recent
 with stats as (
   select
-    count(*) as total_rows,
-    countif(snapshot_ts >= timestamp_sub(current_timestamp(), interval 36 hour)) as recent_rows
-  from {{ ref('pipeline_run_log') }}
+    (select count(*) from {{ ref('pipeline_run_log') }}) as total_rows,
+    (
+      select count(*)
+      from {{ ref('pipeline_run_log') }}
+      where snapshot_ts >= timestamp_sub(current_timestamp(), interval 36 hour)
+    ) as recent_rows
 )
 select *
 from stats
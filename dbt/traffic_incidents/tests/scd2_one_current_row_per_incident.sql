@@ -1,5 +1,14 @@
+-- Scoped to incidents with a version starting in the test window (the ones an
+-- incremental build can have touched); their current rows are checked in full.
+with touched as (
+    select distinct incident_id
+    from {{ ref('dim_incident_history') }}
+    where {{ test_window('valid_from') }}
+)
+
 select incident_id
 from {{ ref('dim_incident_history') }}
 where is_current = true
+    and incident_id in (select incident_id from touched)
 group by incident_id
-having count(*) > 1
\ No newline at end of file
+having count(*) > 1
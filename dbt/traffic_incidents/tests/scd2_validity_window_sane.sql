@@ -1,4 +1,5 @@
 select *
 from {{ ref('dim_incident_history') }}
-where valid_to is not null
-    and valid_to <= valid_from
\ No newline at end of file
+where {{ test_window('valid_from') }}
+    and valid_to is not null
+    and valid_to <= valid_from
@@ -1,14 +1,16 @@
 with latest_day as (
   select timestamp_trunc(max(snapshot_ts), day) as day
   from {{ ref('fact_incident_snapshot') }}
+  where {{ test_window('snapshot_ts') }}
 ),
 cnt as (
   select count(*) as n
   from {{ ref('fact_incident_snapshot') }} f
   join latest_day d
     on timestamp_trunc(f.snapshot_ts, day) = d.day
+  where {{ test_window('f.snapshot_ts') }}
 )
 
 select n
 from cnt
-where n = 0
\ No newline at end of file
+where n = 0
@@ -1,23 +1,109 @@
+import json
+import os
 from pathlib import Path
 
-from dagster import AssetExecutionContext, AssetKey
-from dagster_dbt import DbtCliResource, DagsterDbtTranslator, dbt_assets
+from dagster import AssetExecutionContext, AssetKey, MaterializeResult, get_dagster_logger
+from dagster_dbt import DagsterDbtTranslator, DagsterDbtTranslatorSettings, dbt_assets
 
-# repo_root/orchestration/traffic_orchestrator/traffic_orchestrator/assets_dbt.py
-REPO_ROOT = Path(__file__).resolve().parents[3]
-DBT_PROJECT_DIR = REPO_ROOT / "dbt" / "traffic_incidents"
-DBT_MANIFEST_PATH = DBT_PROJECT_DIR / "target" / "manifest.json"
+from .assets_ingestion import BRONZE_KEY
+from .dbt_critical_path import critical_path_from_target
+from .dbt_runner import DBT_PROJECT_DIR, write_manifest
+from .dbt_selection import dbt_build_args, dbt_vars
+from .ingestion_results import INGESTION_RESULTS_KEY
+from .ops import invoke_dbt
+
+# Models are BigQuery jobs, so threads mostly wait on the warehouse; the dims,
+# fact_incident and fact_incident_snapshot have no dependencies on each other
+# and all run at once with 8.
+DBT_THREADS = int(os.getenv("DBT_THREADS", "8"))
+
+
+def prepare_manifest() -> Path:
+    """
+    The manifest dbt_assets is built from, parsed in-process when a fresh
+    checkout has none (or a model changed). A project that does not parse
+    fails the code location load instead of loading without its dbt assets.
+    """
+    log = get_dagster_logger()
+    try:
+        manifest_path = write_manifest()
+    except Exception:
+        log.exception(f"[dbt] cannot parse {DBT_PROJECT_DIR}")
+        raise
+    log.info(f"[dbt] assets built from {manifest_path}")
+    return manifest_path
 
-dbt_cli = DbtCliResource(project_dir=str(DBT_PROJECT_DIR))
 
 class Translator(DagsterDbtTranslator):
    def get_group_name(self, dbt_resource_props) -> str:
       return "dbt"
 
-@dbt_assets(
-    manifest=str(DBT_MANIFEST_PATH),
-    dagster_dbt_translator=Translator()
-)
-def dbt_models(context: AssetExecutionContext, dbt: DbtCliResource):
-   # Equivalent of "dbt build" (runs models + tests)
-   yield from dbt.cli(["build"], context=context).stream()
\ No newline at end of file
+
+def _ingestion_in_run(context: AssetExecutionContext) -> bool:
+    """Whether traffic_ingestion is part of this run (None = the job's whole selection, which includes it)."""
+    selection = context.run.asset_selection
+    return selection is None or BRONZE_KEY in selection
+
+
+def _build_args(context: AssetExecutionContext) -> list[str]:
+    """
+    After traffic_ingestion in the same run: the models that run changed, with
+    its snapshot vars, as in run_dbt_build; nothing when it loaded nothing. A
+    subset of the models is built as selected, with the run's vars when there
+    are any. Without ingestion in the run: exactly the selected models.
+    """
+    selected = context.selected_asset_keys
+    ingestion_result = None
+    if _ingestion_in_run(context):
+        ingestion_result = context.resources.ingestion_results.load_for_run(context.run_id, BRONZE_KEY)
+        if ingestion_result is None:
+            return []
+        if selected == set(context.assets_def.keys):
+            return dbt_build_args(ingestion_result)
+
+    args = ["build", "--select", *sorted(key.path[-1] for key in selected)]
+    if ingestion_result is not None and ingestion_result["snapshot_ids"]:
+        args += ["--vars", json.dumps(dbt_vars(ingestion_result))]
+    return args
+
+
+def _build_dbt_models(manifest_path):
+    # dbt tests run inside "dbt build" and fail the step; they are not modelled as asset checks.
+    translator = Translator(settings=DagsterDbtTranslatorSettings(enable_asset_checks=False))
+
+    @dbt_assets(
+        manifest=manifest_path,
+        dagster_dbt_translator=translator,
+        required_resource_keys={INGESTION_RESULTS_KEY},
+    )
+    def dbt_models(context: AssetExecutionContext):
+        args = _build_args(context)
+        if not args:
+            context.log.info("[dbt] skipped: this run's ingestion loaded nothing dbt reads")
+            return
+
+        output = invoke_dbt(context, [*args, "--threads", str(DBT_THREADS)], observe_models=False)
+
+        for node in output["nodes"]:
+            key = AssetKey(node["unique_id"].split(".")[-1])
+            if node["resource_type"] == "model" and node["status"] == "success" and key in context.selected_asset_keys:
+                yield MaterializeResult(
+                    asset_key=key,
+                    metadata={"dbt_status": node["status"], "dbt_duration_s": node["duration_s"]},
+                )
+
+        report = critical_path_from_target()
+        context.log.info(
+            f"[dbt] threads={DBT_THREADS} nodes={report['nodes']} "
+            f"critical_path_s={report['critical_path_s']} elapsed_s={report['elapsed_s']} "
+            f"effective_parallelism={report['effective_parallelism']}"
+        )
+        context.log.info(
+            "[dbt] critical path: "
+            + " -> ".join(f"{step['unique_id']} ({step['execution_time']}s)" for step in report["path"])
+        )
+
+    return dbt_models
+
+
+dbt_models = _build_dbt_models(prepare_manifest())
@@ -0,0 +1,54 @@
+from dagster import AssetExecutionContext, AssetKey, AssetOut, Output, multi_asset
+
+from src.ingestion.runner import run_pipeline
+
+from .ingestion_results import INGESTION_RESULTS_KEY
+from .ops import IngestionConfig, ingestion_metadata, log_ingestion_result, profiler, pull_limits
+
+# Keys match the dbt sources (source_name, table_name), so dagster-dbt wires the
+# dbt models downstream of these without extra mapping.
+BRONZE_KEY = AssetKey(["traffic_bronze", "traffic_incidents_raw"])
+SILVER_KEY = AssetKey(["traffic_silver", "incident_current"])
+
+
+@multi_asset(
+    outs={
+        "bronze": AssetOut(key=BRONZE_KEY, group_name="ingestion", is_required=False, io_manager_key=INGESTION_RESULTS_KEY),
+        "silver": AssetOut(key=SILVER_KEY, group_name="ingestion", is_required=False, io_manager_key=INGESTION_RESULTS_KEY),
+    },
+    internal_asset_deps={"bronze": set(), "silver": {BRONZE_KEY}},
+    can_subset=False,
+)
+def traffic_ingestion(context: AssetExecutionContext, config: IngestionConfig):
+    """
+    Pull from the API, load bronze and merge silver. Only the tables that
+    actually changed are materialized; downstream dbt steps are skipped when
+    their upstream wasn't. Each output's value is the run result, which the
+    dbt assets read to select and parameterize their build.
+    """
+    with profiler(config) as prof:
+        result = run_pipeline(
+            command=config.mode,
+            since=config.since,
+            month=config.month,
+            page_size=config.page_size,
+            out=config.out,
+            load_to_bq=config.load_to_bq,
+            run_silver_merge_flag=config.run_silver_merge,
+            record_job_stats_flag=config.record_job_stats,
+            record_run_stats_flag=config.record_run_stats,
+            plan=config.plan,
+            **pull_limits(config),
+        )
+    if prof.result:
+        result["profile"] = prof.result
+
+    log_ingestion_result(context, result)
+    metadata = ingestion_metadata(result)
+
+    # A ledger-skipped load still counts: an earlier attempt put the rows in
+    # bronze and may have failed before anything downstream was built.
+    if result["loaded_to_bq"] and result["snapshot_ids"]:
+        yield Output(result, output_name="bronze", metadata=metadata)
+    if result["silver_merge_ran"]:
+        yield Output(result, output_name="silver", metadata=metadata)
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from dagster import (
+    AssetExecutionContext,
+    AssetIn,
+    Config,
+    DailyPartitionsDefinition,
+    MetadataValue,
+    MonthlyPartitionsDefinition,
+    asset,
+)
+
+from src.ingestion.runner import WATERMARK_OVERLAP_MINUTES, run_pipeline
+from src.storage.backend import get_backend
+from src.storage.bq_telemetry import collect_job_stats, summarize_job_stats
+
+from .ops import ingestion_metadata, log_ingestion_result, pull_limits
+
+# Daily partitions pull [day - overlap, day + 1) on :updated_at; monthly
+# partitions backfill a month by start_dt. Launching a Dagster backfill over a
+# range of partitions runs the pulls/loads in parallel (multiprocess executor),
+# while the silver merges queue on one concurrency key. The limit lives on the
+# instance:
+#   dagster instance concurrency set silver_merge_incident_current 1
+daily_partitions = DailyPartitionsDefinition(start_date="2025-01-01", timezone="UTC")
+monthly_partitions = MonthlyPartitionsDefinition(start_date="2025-01-01", timezone="UTC")
+
+SILVER_MERGE_CONCURRENCY_KEY = "silver_merge_incident_current"
+
+
+class PartitionedIngestionConfig(Config):
+    page_size: int = 1000
+    max_pages: int = 10
+    exhaustive: bool = True                 # a partition is a bounded window; pull all of it
+    max_seconds: Optional[float] = 1800     # budget; a truncated partition resumes from its checkpoint
+    max_rows: Optional[int] = None
+    max_bytes: Optional[int] = None
+    plan: bool = True                       # day counts pick the page size; expected vs actual rows
+    load_to_bq: bool = True
+    record_job_stats: bool = False  # also write BigQuery job stats to traffic_control
+    record_run_stats: bool = True   # write the run-stats record read by dbt pipeline_run_log
+
+
+def _merge_silver(context: AssetExecutionContext, pulled: dict) -> dict:
+    """
+    Silver MERGE for the snapshots holding one partition's rows; a no-op when
+    nothing was loaded. A retried partition whose load the ledger skipped
+    merges the earlier attempt's snapshots.
+    """
+    snapshot_ids = pulled["snapshot_ids"] if pulled["loaded_to_bq"] else []
+    if not snapshot_ids:
+        context.log.info(f"[RUN][silver] skipped (nothing loaded) partition={context.partition_key}")
+        context.add_output_metadata({"skipped": True, "snapshot_ids": MetadataValue.json([])})
+        return {"skipped": True, "snapshot_ids": [], "silver_merge_job_id": None}
+
+    warehouse = get_backend(pulled.get("backend"))
+    with collect_job_stats() as bq_jobs:
+        job_id = warehouse.merge_silver(snapshot_ids=snapshot_ids)
+
+    context.log.info(
+        f"[RUN][silver] partition={context.partition_key} snapshot_ids={snapshot_ids} job_id={job_id}"
+    )
+    context.add_output_metadata(
+        {
+            "skipped": False,
+            "snapshot_ids": MetadataValue.json(snapshot_ids),
+            "silver_merge_job_id": job_id or "none",
+            **summarize_job_stats(bq_jobs),
+            "bq_jobs": MetadataValue.json(bq_jobs),
+        }
+    )
+    return {"skipped": False, "snapshot_ids": snapshot_ids, "silver_merge_job_id": job_id}
+
+
+# --------- Daily ---------
+
+@asset(
+    key_prefix=["ingestion"],
+    group_name="ingestion_partitioned",
+    partitions_def=daily_partitions,
+)
+def daily_pull(context: AssetExecutionContext, config: PartitionedIngestionConfig) -> dict:
+    day = datetime.fromisoformat(context.partition_key).replace(tzinfo=timezone.utc)
+    since = day - timedelta(minutes=WATERMARK_OVERLAP_MINUTES)
+    until = day + timedelta(days=1)
+
+    result = run_pipeline(
+        command="pull",
+        since=since,
+        until=until,
+        page_size=config.page_size,
+        out=f"data/raw/incremental/dagster_pull_{context.partition_key}.jsonl",
+        load_to_bq=config.load_to_bq,
+        run_silver_merge_flag=False,
+        record_job_stats_flag=config.record_job_stats,
+        record_run_stats_flag=config.record_run_stats,
+        plan=config.plan,
+        **pull_limits(config),
+    )
+
+    log_ingestion_result(context, result)
+    context.add_output_metadata(ingestion_metadata(result))
+    return result
+
+
+@asset(
+    key_prefix=["ingestion"],
+    group_name="ingestion_partitioned",
+    partitions_def=daily_partitions,
+    ins={"pulled": AssetIn(key=daily_pull.key)},
+    op_tags={"dagster/concurrency_key": SILVER_MERGE_CONCURRENCY_KEY},
+)
+def daily_silver_merge(context: AssetExecutionContext, pulled: dict) -> dict:
+    return _merge_silver(context, pulled)
+
+
+# --------- Monthly ---------
+
+@asset(
+    key_prefix=["ingestion"],
+    group_name="ingestion_partitioned",
+    partitions_def=monthly_partitions,
+)
+def monthly_backfill(context: AssetExecutionContext, config: PartitionedIngestionConfig) -> dict:
+    month = context.partition_key[:7]   # "2026-01-01" -> "2026-01"
+
+    result = run_pipeline(
+        command="backfill",
+        month=month,
+        page_size=config.page_size,
+        out=f"data/raw/backfill/dagster_backfill_{month}.jsonl",
+        load_to_bq=config.load_to_bq,
+        run_silver_merge_flag=False,
+        record_job_stats_flag=config.record_job_stats,
+        record_run_stats_flag=config.record_run_stats,
+        plan=config.plan,
+        **pull_limits(config),
+    )
+
+    log_ingestion_result(context, result)
+    context.add_output_metadata(ingestion_metadata(result))
+    return result
+
+
+@asset(
+    key_prefix=["ingestion"],
+    group_name="ingestion_partitioned",
+    partitions_def=monthly_partitions,
+    ins={"pulled": AssetIn(key=monthly_backfill.key)},
+    op_tags={"dagster/concurrency_key": SILVER_MERGE_CONCURRENCY_KEY},
+)
+def monthly_silver_merge(context: AssetExecutionContext, pulled: dict) -> dict:
+    return _merge_silver(context, pulled)
@@ -0,0 +1,84 @@
+import argparse
+import json
+from pathlib import Path
+
+# repo_root/orchestration/traffic_orchestrator/traffic_orchestrator/dbt_critical_path.py
+REPO_ROOT = Path(__file__).resolve().parents[3]
+DBT_TARGET_DIR = REPO_ROOT / "dbt" / "traffic_incidents" / "target"
+
+
+def critical_path(run_results: dict, manifest: dict) -> dict:
+    """
+    Longest dependency chain (by execution_time) through the nodes of one dbt invocation.
+
+    With enough threads a build can't finish faster than its critical path;
+    elapsed_s well above critical_path_s means nodes were waiting on threads.
+    """
+    durations = {r["unique_id"]: float(r["execution_time"] or 0.0) for r in run_results["results"]}
+
+    deps: dict[str, list[str]] = {}
+    for uid in durations:
+        node = manifest["nodes"].get(uid, {})
+        deps[uid] = [d for d in node.get("depends_on", {}).get("nodes", []) if d in durations]
+
+    finish: dict[str, float] = {}
+    via: dict[str, str | None] = {}
+
+    def finish_time(uid: str) -> float:
+        if uid not in finish:
+            upstream = max(deps[uid], key=finish_time, default=None)
+            via[uid] = upstream
+            finish[uid] = durations[uid] + (finish_time(upstream) if upstream else 0.0)
+        return finish[uid]
+
+    for uid in durations:
+        finish_time(uid)
+
+    path = []
+    uid = max(finish, key=finish.get, default=None)
+    while uid is not None:
+        path.append({"unique_id": uid, "execution_time": round(durations[uid], 3)})
+        uid = via[uid]
+    path.reverse()
+
+    total_node_s = sum(durations.values())
+    elapsed_s = float(run_results.get("elapsed_time") or 0.0)
+
+    return {
+        "nodes": len(durations),
+        "critical_path_s": round(finish[path[-1]["unique_id"]], 3) if path else 0.0,
+        "elapsed_s": round(elapsed_s, 3),
+        "total_node_s": round(total_node_s, 3),
+        "effective_parallelism": round(total_node_s / elapsed_s, 2) if elapsed_s else None,
+        "path": path,
+    }
+
+
+def critical_path_from_target(target_dir: Path = DBT_TARGET_DIR) -> dict:
+    run_results = json.loads((target_dir / "run_results.json").read_text(encoding="utf-8"))
+    manifest = json.loads((target_dir / "manifest.json").read_text(encoding="utf-8"))
+    return critical_path(run_results, manifest)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Critical-path report for the last dbt invocation")
+    parser.add_argument("--target-dir", type=Path, default=DBT_TARGET_DIR)
+    args = parser.parse_args()
+
+    report = critical_path_from_target(args.target_dir)
+
+    print(
+        f"[dbt] nodes={report['nodes']} critical_path_s={report['critical_path_s']} "
+        f"elapsed_s={report['elapsed_s']} total_node_s={report['total_node_s']} "
+        f"effective_parallelism={report['effective_parallelism']}"
+    )
+    for step in report["path"]:
+        print(f"  {step['execution_time']:>8.3f}s  {step['unique_id']}")
+
+
+if __name__ == "__main__":
+    main()
+
+# Usage:
+# python -m traffic_orchestrator.dbt_critical_path
+# python -m traffic_orchestrator.dbt_critical_path --target-dir dbt/traffic_incidents/target
@@ -0,0 +1,151 @@
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from dbt.cli.main import dbtRunner
+
+# repo_root/orchestration/traffic_orchestrator/traffic_orchestrator/dbt_runner.py
+REPO_ROOT = Path(__file__).resolve().parents[3]
+DBT_PROJECT_DIR = REPO_ROOT / "dbt" / "traffic_incidents"
+
+# Files whose changes require a re-parse of the cached manifest.
+_PROJECT_GLOBS = ("dbt_project.yml", "models/**/*", "macros/**/*", "tests/**/*", "analyses/**/*")
+
+# Parsed manifest kept for the lifetime of the process. Across processes
+# (each Dagster run), dbt's own partial parsing (target/partial_parse.msgpack)
+# keeps the parse cheap.
+_manifest = None
+_manifest_fingerprint: Optional[float] = None
+
+
+def _project_args() -> list[str]:
+    return ["--project-dir", str(DBT_PROJECT_DIR), "--profiles-dir", str(DBT_PROJECT_DIR)]
+
+
+def _project_fingerprint() -> float:
+    """Newest mtime across the project sources."""
+    newest = 0.0
+    for pattern in _PROJECT_GLOBS:
+        for f in DBT_PROJECT_DIR.glob(pattern):
+            if f.is_file():
+                newest = max(newest, f.stat().st_mtime)
+    return newest
+
+
+def get_manifest(*, refresh: bool = False):
+    """Parse the project once per process; re-parse when project files change."""
+    global _manifest, _manifest_fingerprint
+
+    fingerprint = _project_fingerprint()
+    if _manifest is None or refresh or fingerprint != _manifest_fingerprint:
+        res = dbtRunner().invoke(["parse", *_project_args()])
+        if not res.success:
+            raise RuntimeError(f"dbt parse failed: {res.exception}")
+        _manifest = res.result
+        _manifest_fingerprint = fingerprint
+
+    return _manifest
+
+
+def write_manifest() -> Path:
+    """
+    target/manifest.json for dagster-dbt, parsed (and written) when it is
+    missing or older than the project sources. target/ is not checked in.
+    """
+    manifest_path = DBT_PROJECT_DIR / "target" / "manifest.json"
+    if not manifest_path.exists() or manifest_path.stat().st_mtime < _project_fingerprint():
+        get_manifest(refresh=True)  # dbt parse writes target/manifest.json
+    return manifest_path
+
+
+# --------- Node timings ---------
+
+@dataclass
+class NodeTiming:
+    unique_id: str
+    resource_type: str
+    status: str
+    started_s: float        # offset from invocation start
+    duration_s: float
+
+
+class _NodeTimingCollector:
+    """dbtRunner callback: turns NodeStart/NodeFinished events into NodeTiming rows."""
+
+    def __init__(self, started: float, on_node_finished: Optional[Callable[[NodeTiming], None]] = None):
+        self.started = started
+        self.on_node_finished = on_node_finished
+        self.first_node_s: Optional[float] = None
+        self.timings: list[NodeTiming] = []
+        self._node_started: dict[str, float] = {}
+
+    def __call__(self, event) -> None:
+        name = event.info.name
+        if name not in ("NodeStart", "NodeFinished"):
+            return
+
+        node_info = event.data.node_info
+        now = time.perf_counter() - self.started
+
+        if name == "NodeStart":
+            if self.first_node_s is None:
+                self.first_node_s = now
+            self._node_started[node_info.unique_id] = now
+            return
+
+        started_s = self._node_started.pop(node_info.unique_id, now)
+        timing = NodeTiming(
+            unique_id=node_info.unique_id,
+            resource_type=node_info.resource_type,
+            status=node_info.node_status,
+            started_s=round(started_s, 3),
+            duration_s=round(now - started_s, 3),
+        )
+        self.timings.append(timing)
+        if self.on_node_finished is not None:
+            self.on_node_finished(timing)
+
+
+# --------- Invocation ---------
+
+def run_dbt(
+    args: list[str],
+    *,
+    on_node_finished: Optional[Callable[[NodeTiming], None]] = None,
+) -> dict:
+    """
+    Run a dbt command in-process against the cached manifest.
+
+    Returns command, success, returncode (dbt CLI convention: 0 ok, 1 node
+    failures, 2 error), parse_s, startup_s (invocation start -> first node
+    start, parse included), elapsed_s and per-node timings.
+    """
+    started = time.perf_counter()
+
+    manifest = get_manifest()
+    parse_s = time.perf_counter() - started
+
+    collector = _NodeTimingCollector(started, on_node_finished)
+    runner = dbtRunner(manifest=manifest, callbacks=[collector])
+    res = runner.invoke([*args, *_project_args()])
+
+    elapsed_s = time.perf_counter() - started
+
+    if res.exception is not None:
+        returncode = 2
+    elif not res.success:
+        returncode = 1
+    else:
+        returncode = 0
+
+    return {
+        "command": " ".join(["dbt", *args]),
+        "success": res.success,
+        "returncode": returncode,
+        "error": str(res.exception) if res.exception is not None else None,
+        "parse_s": round(parse_s, 3),
+        "startup_s": round(collector.first_node_s, 3) if collector.first_node_s is not None else None,
+        "elapsed_s": round(elapsed_s, 3),
+        "nodes": [asdict(t) for t in collector.timings],
+    }
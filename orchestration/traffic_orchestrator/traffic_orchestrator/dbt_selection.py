@@ -0,0 +1,57 @@
+import json
+
+# Which dbt models one ingestion run needs rebuilt, from what it changed.
+#
+# Views (staging, the location-keyed intermediates) read their sources live,
+# so a run never has to rebuild them; they and their tests are built by the
+# weekly full build. A run materializes only:
+#   - the snapshot-fed incremental models, when its rows are in bronze: loaded
+#     now, or by an earlier attempt the ledger skipped (which may have failed
+#     before dbt ran), under that attempt's snapshot_ids
+#     (snapshot facts, change events / SCD2 history, dim_location, run log);
+#   - the current-state tables, when its silver MERGE changed rows
+#     (dim_incident, fact_incident).
+# "a,b" is dbt's intersection: downstream of the source AND of that materialization.
+SNAPSHOT_SELECTION = "source:traffic_bronze+,config.materialized:incremental"
+CURRENT_STATE_SELECTION = "source:traffic_silver+,config.materialized:table"
+
+
+def silver_changed(ingestion_result: dict) -> bool:
+    """True when the run's silver MERGE changed rows (unknown counts as changed)."""
+    if not ingestion_result["silver_merge_ran"]:
+        return False
+    merges = [job for job in ingestion_result.get("bq_jobs", []) if job["kind"] == "merge"]
+    if not merges:
+        return True
+    return any(job.get("rows_affected") is None or job["rows_affected"] > 0 for job in merges)
+
+
+def dbt_selection(ingestion_result: dict) -> list[str]:
+    """Selectors for the models affected by one ingestion run (empty = nothing to build)."""
+    if not ingestion_result["loaded_to_bq"] or not ingestion_result.get("snapshot_ids"):
+        return []
+
+    selection = [SNAPSHOT_SELECTION]
+    if silver_changed(ingestion_result):
+        selection.append(CURRENT_STATE_SELECTION)
+    return selection
+
+
+def dbt_vars(ingestion_result: dict) -> dict:
+    """
+    Snapshot vars for a selective build. incremental_lower_bound uses snapshot_ts
+    (the earliest of snapshot_ids) to bound incremental models without querying
+    {{ this }} first.
+    """
+    return {
+        "snapshot_ids": ingestion_result["snapshot_ids"],
+        "snapshot_ts": ingestion_result["snapshot_ts"],
+    }
+
+
+def dbt_build_args(ingestion_result: dict) -> list[str]:
+    """dbt build args for one run, or [] when it changed nothing dbt reads."""
+    selection = dbt_selection(ingestion_result)
+    if not selection:
+        return []
+    return ["build", "--select", *selection, "--vars", json.dumps(dbt_vars(ingestion_result))]
@@ -1,17 +1,54 @@
 from dagster import Definitions
 
-from .jobs import traffic_pipeline_job, cleanup_job
+from .assets_dbt import dbt_models
+from .assets_ingestion import traffic_ingestion
+from .assets_partitioned import daily_pull, daily_silver_merge, monthly_backfill, monthly_silver_merge
+from .ingestion_results import INGESTION_RESULTS_KEY, IngestionResultIOManager
+from .jobs import (
+    traffic_pipeline_job,
+    cleanup_job,
+    bronze_compaction_job,
+    dbt_full_build_job,
+    traffic_assets_job,
+    daily_ingestion_job,
+    monthly_ingestion_job,
+    microbatch_job,
+)
 from .schedules import (
     daily_pull_at_utc_midnight,
     monthly_backfill_previous_month,
-    cleanup_schedule
+    cleanup_schedule,
+    bronze_compaction_schedule,
+    dbt_full_build_schedule,
 )
+from .sensors import microbatch_sensor
 
 defs = Definitions(
-    jobs=[traffic_pipeline_job, cleanup_job],
+    assets=[
+        traffic_ingestion,
+        dbt_models,
+        daily_pull,
+        daily_silver_merge,
+        monthly_backfill,
+        monthly_silver_merge,
+    ],
+    jobs=[
+        traffic_pipeline_job,
+        cleanup_job,
+        bronze_compaction_job,
+        dbt_full_build_job,
+        traffic_assets_job,
+        daily_ingestion_job,
+        monthly_ingestion_job,
+        microbatch_job,
+    ],
     schedules=[
         daily_pull_at_utc_midnight, 
         monthly_backfill_previous_month, 
-        cleanup_schedule
+        cleanup_schedule,
+        bronze_compaction_schedule,
+        dbt_full_build_schedule,
         ],
+    sensors=[microbatch_sensor],
+    resources={INGESTION_RESULTS_KEY: IngestionResultIOManager()},
 )
\ No newline at end of file
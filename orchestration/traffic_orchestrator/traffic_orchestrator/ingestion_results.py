@@ -0,0 +1,38 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+from dagster import AssetKey, ConfigurableIOManager, InputContext, OutputContext
+
+from .dbt_runner import REPO_ROOT
+
+# traffic_ingestion's run_pipeline result, stored as JSON per run and asset, so
+# the dbt assets of the same run read what ingestion actually returned instead
+# of rebuilding it from stringified materialization metadata. The dbt assets
+# take no inputs (their upstreams are dbt sources), so they read it through
+# this resource by run id.
+INGESTION_RESULTS_KEY = "ingestion_results"
+
+
+class IngestionResultIOManager(ConfigurableIOManager):
+    base_dir: str = str(REPO_ROOT / "state" / "ingestion_results")
+
+    def _path(self, run_id: str, asset_key: AssetKey) -> Path:
+        return Path(self.base_dir) / run_id / f"{'__'.join(asset_key.path)}.json"
+
+    def handle_output(self, context: OutputContext, obj: dict) -> None:
+        path = self._path(context.run_id, context.asset_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(obj, default=str), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def load_input(self, context: InputContext) -> dict:
+        return self.load_for_run(context.upstream_output.run_id, context.asset_key)
+
+    def load_for_run(self, run_id: str, asset_key: AssetKey) -> Optional[dict]:
+        """The result stored for asset_key in run_id, or None when that run did not materialize it."""
+        path = self._path(run_id, asset_key)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
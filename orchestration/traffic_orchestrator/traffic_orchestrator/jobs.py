@@ -1,7 +1,18 @@
-from dagster import job, in_process_executor
+from dagster import AssetSelection, define_asset_job, job, in_process_executor, multiprocess_executor
 
-from .ops import run_dbt_build, run_ingestion
-from .ops_cleanup import cleanup_raw_files
+from .assets_ingestion import traffic_ingestion
+from .assets_partitioned import (
+    daily_partitions,
+    daily_pull,
+    daily_silver_merge,
+    monthly_backfill,
+    monthly_partitions,
+    monthly_silver_merge,
+)
+from .ops import run_dbt_build, run_dbt_full_build, run_ingestion
+from .ops_cleanup import manage_raw_files
+from .ops_compaction import compact_bronze_partitions
+from .ops_microbatch import run_microbatch
 
 @job(executor_def=in_process_executor)
 def traffic_pipeline_job():
@@ -10,4 +21,42 @@ def traffic_pipeline_job():
 
 @job(executor_def=in_process_executor)
 def cleanup_job():
-    cleanup_raw_files()
\ No newline at end of file
+    manage_raw_files()
+
+@job(executor_def=in_process_executor)
+def bronze_compaction_job():
+    compact_bronze_partitions()
+
+@job(executor_def=in_process_executor)
+def dbt_full_build_job():
+    run_dbt_full_build()
+
+@job(executor_def=in_process_executor)
+def microbatch_job():
+    run_microbatch()
+
+# Ingestion + every dbt model as its own asset. Independent models run in
+# parallel inside the dbt step (DBT_THREADS); the multiprocess executor runs
+# each step in its own process so later assets don't queue behind in-process ones.
+traffic_assets_job = define_asset_job(
+    name="traffic_assets_job",
+    selection=AssetSelection.assets(traffic_ingestion).downstream(),
+    executor_def=multiprocess_executor.configured({"max_concurrent": 4}),
+)
+
+# Partitioned ingestion for Dagster backfills: many partitions run side by side,
+# each pull/load in its own process; silver merges are serialized by the
+# silver_merge_incident_current concurrency key (see assets_partitioned.py).
+daily_ingestion_job = define_asset_job(
+    name="daily_ingestion_job",
+    selection=AssetSelection.assets(daily_pull, daily_silver_merge),
+    partitions_def=daily_partitions,
+    executor_def=multiprocess_executor.configured({"max_concurrent": 8}),
+)
+
+monthly_ingestion_job = define_asset_job(
+    name="monthly_ingestion_job",
+    selection=AssetSelection.assets(monthly_backfill, monthly_silver_merge),
+    partitions_def=monthly_partitions,
+    executor_def=multiprocess_executor.configured({"max_concurrent": 8}),
+)
\ No newline at end of file
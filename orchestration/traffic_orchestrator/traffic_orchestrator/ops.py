@@ -1,14 +1,22 @@
-import os
-import subprocess
-import sys
-from pathlib import Path
+import json
 from typing import Literal, Optional
 
-from dagster import op, OpExecutionContext, Config, MetadataValue, RetryPolicy
+from dagster import (
+    op,
+    AssetKey,
+    AssetObservation,
+    OpExecutionContext,
+    Config,
+    MetadataValue,
+    RetryPolicy,
+)
 
-from src.ingestion.runner import run_pipeline
+from src.common.instrumentation import collect_stages, format_stages, stage, summarize_stages
+from src.common.profiling import profile_prefix, profile_run
+from src.ingestion.runner import PullBudget, run_pipeline
 
-REPO_ROOT = Path(__file__).resolve().parents[3]
+from .dbt_runner import DBT_PROJECT_DIR, NodeTiming, run_dbt
+from .dbt_selection import dbt_build_args, dbt_selection
 
 
 RunMode = Literal["pull", "backfill"]
@@ -26,24 +34,47 @@ class IngestionConfig(Config):
     # common
     page_size: int = 1000
     max_pages: int = 10
+    exhaustive: bool = False                # ignore max_pages and page until the source is exhausted
+    max_seconds: Optional[float] = None     # budget for exhaustive pulls
+    max_rows: Optional[int] = None
+    max_bytes: Optional[int] = None
+    plan: bool = False                      # count the window by day first; sizes pages/slices/workers
     out: str = "data/raw/dagster/run.jsonl"
     load_to_bq: bool = True
     run_silver_merge: bool = True
+    record_job_stats: bool = False  # also write BigQuery job stats to traffic_control
+    record_run_stats: bool = False  # write the run-stats record read by dbt pipeline_run_log
+    profile: bool = False                   # cProfile the run; .prof/.collapsed next to out
+    profile_stage: Optional[str] = None     # profile only this stage (e.g. "validate"); implies profile
 
 
-@op(retry_policy=RetryPolicy(max_retries=3))
-def run_ingestion(context: OpExecutionContext, config: IngestionConfig) -> dict:
-    result = run_pipeline(
-        command=config.mode,
-        since=config.since,
-        month=config.month,
-        page_size=config.page_size,
-        max_pages=config.max_pages,
-        out=config.out,
-        load_to_bq=config.load_to_bq,
-        run_silver_merge_flag=config.run_silver_merge,
+def pull_limits(config) -> dict:
+    """max_pages / budget kwargs for run_pipeline from an ingestion config."""
+    budget = None
+    if config.max_seconds is not None or config.max_rows is not None or config.max_bytes is not None:
+        budget = PullBudget(max_seconds=config.max_seconds, max_rows=config.max_rows, max_bytes=config.max_bytes)
+    return {"max_pages": None if config.exhaustive else config.max_pages, "budget": budget}
+
+
+def profiler(config):
+    """profile_run() for an ingestion config; a no-op unless profile or profile_stage is set."""
+    return profile_run(
+        profile_prefix(config.out),
+        stage=config.profile_stage,
+        enabled=config.profile or config.profile_stage is not None,
     )
 
+
+def stage_metadata(stages: dict) -> dict:
+    """Stage breakdown as metadata: the full table plus one plottable seconds value per top-level stage."""
+    metadata = {"stages": MetadataValue.json(stages)}
+    for name, s in stages.items():
+        if "." not in name:
+            metadata[f"stage_{name}_s"] = s["seconds"]
+    return metadata
+
+
+def log_ingestion_result(context: OpExecutionContext, result: dict) -> None:
     context.log.info(
         f"[RUN][ingestion] mode={result['command']} "
         f"snapshot_id={result['snapshot_id']} "
@@ -54,6 +85,13 @@ def run_ingestion(context: OpExecutionContext, config: IngestionConfig) -> dict:
     )
     
     context.log.info(f"[RUN][ingestion] output_path={result['output_path']}")
+
+    if result.get("truncated"):
+        context.log.warning(
+            f"[RUN][ingestion] truncated stop_reason={result['stop_reason']} "
+            f"resume_since={result['resume_since']} rows_written={result['rows_written']} "
+            f"expected_rows={result.get('expected_rows')}"
+        )
     
     if result.get("watermark_before"):
         context.log.info(f"[RUN][ingestion] watermark_before={result['watermark_before']}")
@@ -61,93 +99,240 @@ def run_ingestion(context: OpExecutionContext, config: IngestionConfig) -> dict:
         context.log.info(f"[RUN][ingestion] watermark_after={result['watermark_after']}")
     if result.get("silver_merge_job_id"):
         context.log.info(f"[RUN][ingestion] silver_merge_job_id={result['silver_merge_job_id']}")
-    
-    context.add_output_metadata(
-        {
-            "command": result["command"],
-            "snapshot_id": result["snapshot_id"] or "none",
-            "rows_written": result["rows_written"],
-            "rows_loaded": result["rows_loaded"],
-            "output_path": MetadataValue.path(result["output_path"]),
-            "loaded_to_bq": result["loaded_to_bq"],
-            "silver_merge_ran": result["silver_merge_ran"],
-            "watermark_before": result["watermark_before"] or "none",
-            "watermark_after": result["watermark_after"] or "none",
-            "silver_merge_job_id": result["silver_merge_job_id"] or "none",
 
-        }
-    )
+    for job_stats in result.get("bq_jobs", []):
+        context.log.info(
+            f"[RUN][bq] kind={job_stats['kind']} job_id={job_stats['job_id']} "
+            f"queue_ms={job_stats['queue_ms']} run_ms={job_stats['run_ms']} "
+            f"bytes_billed={job_stats['bytes_billed']} slot_ms={job_stats['slot_ms']} "
+            f"rows_affected={job_stats['rows_affected']}"
+        )
+
+    if result.get("stages"):
+        context.log.info(f"[RUN][stages]\n{format_stages(result['stages'])}")
+
+
+def ingestion_metadata(result: dict) -> dict:
+    return {
+        "command": result["command"],
+        "snapshot_id": result["snapshot_id"] or "none",
+        "snapshot_ids": MetadataValue.json(result.get("snapshot_ids", [])),
+        "snapshot_ts": result.get("snapshot_ts") or "none",
+        "run_type": result.get("run_type") or "none",
+        "rows_written": result["rows_written"],
+        "rows_loaded": result["rows_loaded"],
+        "distinct_incidents": result["distinct_incidents"],
+        "output_path": MetadataValue.path(result["output_path"]),
+        "loaded_to_bq": result["loaded_to_bq"],
+        "silver_merge_ran": result["silver_merge_ran"],
+        "watermark_before": result["watermark_before"] or "none",
+        "watermark_after": result["watermark_after"] or "none",
+        "silver_merge_job_id": result["silver_merge_job_id"] or "none",
+        "stop_reason": result.get("stop_reason") or "none",
+        "truncated": bool(result.get("truncated")),
+        "expected_rows": result["expected_rows"] if result.get("expected_rows") is not None else -1,
+        "rows_vs_expected": result["rows_vs_expected"] if result.get("rows_vs_expected") is not None else 0,
+        "plan": MetadataValue.json(result.get("plan") or {}),
+        "bytes_written": result.get("bytes_written", 0),
+        "bq_bytes_processed": result.get("bq_bytes_processed", 0),
+        "bq_bytes_billed": result.get("bq_bytes_billed", 0),
+        "bq_slot_ms": result.get("bq_slot_ms", 0),
+        "bq_jobs": MetadataValue.json(result.get("bq_jobs", [])),
+        **stage_metadata(result.get("stages", {})),
+        **profile_metadata(result.get("profile")),
+    }
+
+
+def profile_metadata(profile: dict | None) -> dict:
+    if not profile or not profile.get("stats_path"):
+        return {}
+    return {
+        "profile_stage": profile["stage"] or "all",
+        "profile_s": profile["profiled_s"],
+        "profile_stats": MetadataValue.path(profile["stats_path"]),
+        "profile_collapsed": MetadataValue.path(profile["collapsed_path"]),
+        "profile_top_functions": MetadataValue.json(profile["top_functions"]),
+    }
+
+
+@op(retry_policy=RetryPolicy(max_retries=3))
+def run_ingestion(context: OpExecutionContext, config: IngestionConfig) -> dict:
+    with profiler(config) as prof:
+        result = run_pipeline(
+            command=config.mode,
+            since=config.since,
+            month=config.month,
+            page_size=config.page_size,
+            out=config.out,
+            load_to_bq=config.load_to_bq,
+            run_silver_merge_flag=config.run_silver_merge,
+            record_job_stats_flag=config.record_job_stats,
+            record_run_stats_flag=config.record_run_stats,
+            plan=config.plan,
+            **pull_limits(config),
+        )
+    if prof.result:
+        result["profile"] = prof.result
+
+    log_ingestion_result(context, result)
+    context.add_output_metadata(ingestion_metadata(result))
 
     return result
 
+# --------- dbt ---------
+
+# Weekly full build: how far back every incremental model is rebuilt.
+FULL_BUILD_LOOKBACK_DAYS = 14
+
+
+def invoke_dbt(context: OpExecutionContext, args: list[str], *, observe_models: bool = True) -> dict:
+    """
+    Run dbt in-process (dbt_runner) with per-node logs; raises when dbt fails.
+
+    observe_models logs an AssetObservation per model; dbt assets turn off and
+    report materializations instead.
+    """
+    context.log.info(f"Running in-process: dbt {' '.join(args)} (project={DBT_PROJECT_DIR})")
+
+    def on_node_finished(timing: NodeTiming) -> None:
+        context.log.info(
+            f"[RUN][dbt] node={timing.unique_id} status={timing.status} "
+            f"duration_s={timing.duration_s}"
+        )
+        if observe_models and timing.resource_type == "model":
+            context.log_event(
+                AssetObservation(
+                    asset_key=AssetKey(timing.unique_id.split(".")[-1]),
+                    metadata={
+                        "dbt_status": timing.status,
+                        "dbt_duration_s": timing.duration_s,
+                    },
+                )
+            )
+
+    with collect_stages() as stages:
+        with stage("dbt"):
+            result = run_dbt(args, on_node_finished=on_node_finished)
+
+    context.log.info(
+        f"[RUN][dbt] returnCode={result['returncode']} parse_s={result['parse_s']} "
+        f"startup_s={result['startup_s']} elapsed_s={result['elapsed_s']}"
+    )
+
+    if not result["success"]:
+        if result["error"]:
+            context.log.error(result["error"])
+        raise RuntimeError(f"{result['command']} failed (returncode={result['returncode']})")
+
+    return {
+        "skipped": False,
+        "command": result["command"],
+        "cwd": str(DBT_PROJECT_DIR),
+        "returncode": result["returncode"],
+        "parse_s": result["parse_s"],
+        "startup_s": result["startup_s"],
+        "elapsed_s": result["elapsed_s"],
+        "nodes": result["nodes"],
+        **summarize_stages(stages),
+    }
+
+
+def _dbt_timing_metadata(output: dict) -> dict:
+    return {
+        "dbt_parse_s": output["parse_s"],
+        "dbt_startup_to_first_node_s": output["startup_s"] if output["startup_s"] is not None else "none",
+        "dbt_elapsed_s": output["elapsed_s"],
+        "dbt_nodes": MetadataValue.json(output["nodes"]),
+        **stage_metadata(output.get("stages", {})),
+    }
+
+
 @op
 def run_dbt_build(context: OpExecutionContext, ingestion_result: dict) -> dict:
-    dbt_dir = REPO_ROOT / "dbt" / "traffic_incidents"
+    selection = dbt_selection(ingestion_result)
 
-    if ingestion_result["rows_loaded"] == 0:
-        context.log.info("[dbt] skipped (no new data)")
+    if not selection:
+        reason = "not_loaded" if not ingestion_result["loaded_to_bq"] else "no_new_data"
         output = {
             "skipped": True,
             "command": None,
-            "cwd": str(dbt_dir),
+            "cwd": str(DBT_PROJECT_DIR),
             "returncode": None,
+            "selection": [],
         }
         context.log.info(
-            f"[RUN][dbt] skipped=True reason=no_new_data "
+            f"[RUN][dbt] skipped=True reason={reason} "
             f"snapshot_id={ingestion_result.get('snapshot_id')}"
         )
         context.add_output_metadata(
             {
                 "skipped": True,
-                "reason": "no_new_data",
+                "reason": reason,
                 "cwd": MetadataValue.path(output["cwd"]),
                 "returncode": output["returncode"],
             }
         )
         return output
 
-    dbt_exe = Path(sys.executable).parent / "dbt.exe"
-    cmd = [str(dbt_exe), "build", "--debug"]
+    output = invoke_dbt(context, dbt_build_args(ingestion_result))
+    output["selection"] = selection
 
-    context.log.info(f"Running: {' '.join(cmd)} (cwd={dbt_dir})")
+    context.log.info(
+        f"[RUN][dbt] skipped=False returnCode={output['returncode']} "
+        f"selection={' '.join(selection)} "
+        f"snapshot_id={ingestion_result.get('snapshot_id')}"
+    )
 
-    result = subprocess.run(
-        cmd,
-        cwd=str(dbt_dir),
-        text=True,
-        env=os.environ,
+    context.add_output_metadata(
+        {
+            "skipped": False,
+            "command": output["command"],
+            "selection": " ".join(selection),
+            "cwd": MetadataValue.path(output["cwd"]),
+            "returncode": output["returncode"],
+            **_dbt_timing_metadata(output),
+        }
     )
 
+    return output
 
-    if result.returncode != 0:
-        if result.stderr:
-            context.log.error(result.stderr)
-        raise subprocess.CalledProcessError(
-            result.returncode,
-            result.args,
-            result.stdout,
-            result.stderr,
-        )
 
-    output = {
-        "skipped": False,
-        "command": " ".join(cmd),
-        "cwd": str(dbt_dir),
-        "returncode": result.returncode,
+@op
+def run_dbt_full_build(context: OpExecutionContext, config: dict) -> dict:
+    """
+    Build and test the whole project without snapshot vars: the views and
+    view tests per-run builds leave out, plus every incremental model
+    rebuilt over the last lookback_days (default 14) before its {{ this }}
+    watermark, which repairs what a failed or skipped run left behind in
+    that window. Singular tests scan whole tables. Older gaps need
+    full_refresh.
+
+    Uses simple dict config, same as manage_raw_files.
+    """
+    build_vars = {
+        # Singular tests check whole tables here instead of the recent test window.
+        "full_scan_tests": config.get("full_scan_tests", True),
+        "incremental_lookback_days": config.get("lookback_days", FULL_BUILD_LOOKBACK_DAYS),
     }
+    args = ["build", "--vars", json.dumps(build_vars)]
+    if config.get("full_refresh", False):
+        args.append("--full-refresh")
+
+    output = invoke_dbt(context, args)
 
     context.log.info(
-        f"f[RUN][dbt] skipped=False returnCode={output['returncode']} "
-        f"snapshot_id={ingestion_result.get('snapshot_id')}"
+        f"[RUN][dbt] full_build=True full_refresh={config.get('full_refresh', False)} "
+        f"returnCode={output['returncode']}"
     )
 
     context.add_output_metadata(
         {
-            "skipped": False,
             "command": output["command"],
+            "full_refresh": config.get("full_refresh", False),
             "cwd": MetadataValue.path(output["cwd"]),
             "returncode": output["returncode"],
+            **_dbt_timing_metadata(output),
         }
     )
 
-    return output
\ No newline at end of file
+    return output
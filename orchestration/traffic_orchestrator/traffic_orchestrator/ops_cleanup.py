@@ -1,75 +1,66 @@
-from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Iterable
 
-from dagster import op, OpExecutionContext
+from dagster import op, OpExecutionContext, MetadataValue
 
-
-def _iter_files(root: Path, patterns: list[str] | None) -> Iterable[Path]:
-    if patterns:
-        for pat in patterns:
-            yield from root.rglob(pat)
-    else:
-        yield from root.rglob("*")
+from src.ingestion.raw_lifecycle import (
+    ARCHIVE_ROOT,
+    DEFAULT_ARCHIVE_AFTER_DAYS,
+    DEFAULT_COMPRESS_AFTER_DAYS,
+    DEFAULT_DELETE_AFTER_DAYS,
+    RAW_ROOTS,
+    run_lifecycle,
+)
 
 
 @op
-def cleanup_raw_files(context: OpExecutionContext, config: dict) -> None:
+def manage_raw_files(context: OpExecutionContext, config: dict) -> dict:
     """
-    Delete raw files older than N days.
+    Compress raw files after N days, archive them after M, delete after K.
 
-    Uses simple dict config instead of Dagster Config (more stable).
+    Archived files stay replayable through the manifest index
+    (data/raw/archive/manifest.jsonl). Uses simple dict config instead of
+    Dagster Config (more stable).
     """
 
     repo_root = Path(__file__).resolve().parents[3]
 
-    paths = config.get("paths", ["data/raw/incremental", "data/raw/backfill"])
-    patterns = config.get("include_patterns", ["*.jsonl", "*.ndjson"])
-    older_than_days = config.get("older_than_days", 7)
-    dry_run = config.get("dry_run", False)
-
-    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
-
-    deleted = 0
-    kept = 0
-    bytes_deleted = 0
-
-    for p in paths:
-        root = Path(p)
-        if not root.is_absolute():
-            root = repo_root / root
-
-        if not root.exists():
-            context.log.info(f"[cleanup] skip (missing): {root}")
-            continue
-
-        for f in _iter_files(root, patterns):
-            if not f.is_file():
-                continue
-
-            mtime = datetime.fromtimestamp(f.stat().st_mtime, tz=timezone.utc)
-
-            if mtime < cutoff:
-                size = f.stat().st_size
-
-                if dry_run:
-                    context.log.info(
-                        f"[cleanup][dry-run] would delete: {f} (mtime={mtime.isoformat()})"
-                    )
-                else:
-                    try:
-                        f.unlink()
-                        deleted += 1
-                        bytes_deleted += size
-                        context.log.info(
-                            f"[cleanup] deleted {f} (mtime={mtime.isoformat()})"
-                        )
-                    except Exception as e:
-                        context.log.error(f"[cleanup] failed to delete {f}: {e}")
-            else:
-                kept += 1
-
+    def resolve(p: str) -> str:
+        path = Path(p)
+        return str(path if path.is_absolute() else repo_root / path)
+
+    result = run_lifecycle(
+        roots=[resolve(p) for p in config.get("paths", list(RAW_ROOTS))],
+        archive_root=resolve(config.get("archive_root", ARCHIVE_ROOT)),
+        compress_after_days=config.get("compress_after_days", DEFAULT_COMPRESS_AFTER_DAYS),
+        archive_after_days=config.get("archive_after_days", DEFAULT_ARCHIVE_AFTER_DAYS),
+        delete_after_days=config.get("delete_after_days", DEFAULT_DELETE_AFTER_DAYS),
+        dry_run=config.get("dry_run", False),
+    )
+
+    for error in result["errors"]:
+        context.log.error(f"[lifecycle] {error}")
     context.log.info(
-        f"[cleanup] done: deleted={deleted} files, kept={kept} files, "
-        f"bytes_deleted={bytes_deleted}, older_than_days={older_than_days}"
-    )
\ No newline at end of file
+        f"[lifecycle] done: scanned={result['scanned']} kept={result['kept']} "
+        f"compressed={result['compressed']} archived={result['archived']} deleted={result['deleted']} "
+        f"bytes_reclaimed={result['bytes_reclaimed']} dry_run={result['dry_run']}"
+    )
+
+    context.add_output_metadata(
+        {
+            "dry_run": result["dry_run"],
+            "scanned": result["scanned"],
+            "kept": result["kept"],
+            "compressed": result["compressed"],
+            "archived": result["archived"],
+            "deleted": result["deleted"],
+            "bytes_before": result["bytes_before"],
+            "bytes_after": result["bytes_after"],
+            "bytes_reclaimed": result["bytes_reclaimed"],
+            "errors": len(result["errors"]),
+            "manifest_path": result["manifest_path"],
+            "manifest_entries": result["manifest_entries"],
+            "actions": MetadataValue.json(result["actions"][:200]),
+        }
+    )
+
+    return result
@@ -0,0 +1,46 @@
+from dagster import op, OpExecutionContext, MetadataValue
+
+from src.storage.bq_compaction import compact_bronze
+
+
+@op
+def compact_bronze_partitions(context: OpExecutionContext, config: dict) -> dict:
+    """
+    Drop exact duplicate rows within a snapshot from bronze partitions older than N days.
+
+    Uses simple dict config, same as manage_raw_files.
+    """
+
+    older_than_days = config.get("older_than_days", 30)
+    since_days = config.get("since_days")
+    dry_run = config.get("dry_run", True)
+
+    result = compact_bronze(
+        older_than_days=older_than_days,
+        since_days=since_days,
+        dry_run=dry_run,
+    )
+
+    context.log.info(
+        f"[compaction] dry_run={result['dry_run']} cutoff_date={result['cutoff_date']} "
+        f"rows_scanned={result['rows_scanned']} rows_removed={result['rows_removed']} "
+        f"bytes_reclaimed={result['bytes_reclaimed']}"
+    )
+
+    context.add_output_metadata(
+        {
+            "dry_run": result["dry_run"],
+            "cutoff_date": result["cutoff_date"],
+            "since_date": result["since_date"] or "none",
+            "rows_scanned": result["rows_scanned"],
+            "rows_kept": result["rows_kept"],
+            "rows_removed": result["rows_removed"],
+            "bytes_before": result["bytes_before"],
+            "bytes_after": result["bytes_after"],
+            "bytes_reclaimed": result["bytes_reclaimed"],
+            "job_id": result["job_id"] or "none",
+            "result": MetadataValue.json(result),
+        }
+    )
+
+    return result
@@ -0,0 +1,69 @@
+from dagster import op, OpExecutionContext, Config, MetadataValue
+
+from src.ingestion.microbatch import run_micro_batch
+
+from .ops import stage_metadata
+
+
+class MicroBatchConfig(Config):
+    page_size: int = 1000
+    max_pages: int = 2
+    flush_max_rows: int = 5000          # flush once this many rows are spooled...
+    flush_max_age_minutes: float = 30   # ...or the oldest spooled pull is this old
+    record_run_stats: bool = True
+
+
+@op
+def run_microbatch(context: OpExecutionContext, config: MicroBatchConfig) -> dict:
+    """Pull since the watermark into the spool; load + merge the spool when it is due."""
+    result = run_micro_batch(
+        page_size=config.page_size,
+        max_pages=config.max_pages,
+        flush_max_rows=config.flush_max_rows,
+        flush_max_age_minutes=config.flush_max_age_minutes,
+        record_run_stats_flag=config.record_run_stats,
+    )
+
+    pulled = result["pull"]
+    spool = result["spool"]
+    flush = result["flush"]
+
+    context.log.info(
+        f"[RUN][microbatch] rows_pulled={pulled['rows_written']} spool_files={spool['files']} "
+        f"spool_rows={spool['rows']} flushed={flush['flushed']}"
+    )
+
+    metadata = {
+        "rows_pulled": pulled["rows_written"],
+        "snapshot_id": pulled["snapshot_id"] or "none",
+        "watermark_after": pulled["watermark_after"] or "none",
+        "spool_files": spool["files"],
+        "spool_rows": spool["rows"],
+        "spool_oldest_age_s": spool["oldest_age_s"],
+        "spool_pending_batches": spool["pending_batches"],
+        "flushed": flush["flushed"],
+        **stage_metadata(pulled.get("stages", {})),
+    }
+    if flush["flushed"]:
+        context.log.info(
+            f"[RUN][microbatch] flushed files={flush['files']} rows_loaded={flush['rows_loaded']} "
+            f"silver_merge_job_id={flush['silver_merge_job_id']} "
+            f"latency_p50_s={flush['latency_p50_s']} latency_max_s={flush['latency_max_s']}"
+        )
+        metadata.update(
+            {
+                "rows_loaded": flush["rows_loaded"],
+                "load_skipped": flush["load_skipped"],
+                "snapshot_ids": MetadataValue.json(flush["snapshot_ids"]),
+                "silver_merge_job_id": flush["silver_merge_job_id"] or "none",
+                "source_to_silver_latency_p50_s": flush["latency_p50_s"],
+                "source_to_silver_latency_p95_s": flush["latency_p95_s"],
+                "source_to_silver_latency_max_s": flush["latency_max_s"],
+                "bq_bytes_billed": flush.get("bq_bytes_billed", 0),
+                "bq_jobs": MetadataValue.json(flush["bq_jobs"]),
+                **{f"flush_{k}": v for k, v in stage_metadata(flush.get("stages", {})).items()},
+            }
+        )
+
+    context.add_output_metadata(metadata)
+    return result
@@ -1,7 +1,7 @@
 from datetime import timedelta, timezone
 from dagster import schedule
 
-from .jobs import traffic_pipeline_job, cleanup_job
+from .jobs import traffic_pipeline_job, cleanup_job, bronze_compaction_job, dbt_full_build_job
 
 @schedule(
     job=traffic_pipeline_job,
@@ -33,9 +33,12 @@ def daily_pull_at_utc_midnight(context):
                     "since": since,
                     "out": f"data/raw/incremental/dagster_pull_{out_date}.jsonl",
                     "page_size": 1000,
-                    "max_pages": 10,
+                    "exhaustive": True,
+                    "max_seconds": 1800,
+                    "plan": True,
                     "load_to_bq": True,
                     "run_silver_merge": True,
+                    "record_run_stats": True,
                 }
             }
         }
@@ -63,9 +66,12 @@ def monthly_backfill_previous_month(context):
                     "month": month_str,
                     "out": f"data/raw/backfill/dagster_backfill_{month_str}.jsonl",
                     "page_size": 1000,
-                    "max_pages": 10,
+                    "exhaustive": True,
+                    "max_seconds": 1800,
+                    "plan": True,
                     "load_to_bq": True,
                     "run_silver_merge": True,
+                    "record_run_stats": True,
                 }
             }
         }
@@ -79,13 +85,53 @@ def monthly_backfill_previous_month(context):
 def cleanup_schedule(context):
     return {
         "ops": {
-            "cleanup_raw_files": {
+            "manage_raw_files": {
                 "config": {
                     "paths": ["data/raw/incremental", "data/raw/backfill"],
-                    "older_than_days": 14,
-                    "include_patterns": ["*.jsonl", "*.ndjson"],
+                    "archive_root": "data/raw/archive",
+                    "compress_after_days": 2,
+                    "archive_after_days": 14,
+                    "delete_after_days": 180,
                     "dry_run": False,
                 }
             }
         }
+    }
+
+@schedule(
+    job=bronze_compaction_job,
+    cron_schedule="0 2 * * 0",      # 02:00 UTC every Sunday
+    execution_timezone="UTC",
+)
+def bronze_compaction_schedule(context):
+    return {
+        "ops": {
+            "compact_bronze_partitions": {
+                "config": {
+                    "older_than_days": 30,
+                    "since_days": 120,
+                    "dry_run": False,
+                }
+            }
+        }
+    }
+
+@schedule(
+    job=dbt_full_build_job,
+    cron_schedule="0 3 * * 0",      # 03:00 UTC every Sunday, after compaction
+    execution_timezone="UTC",
+)
+def dbt_full_build_schedule(context):
+    # Daily runs only build what their snapshot touched; this builds/tests everything
+    # and rebuilds the last two weeks of every incremental model.
+    return {
+        "ops": {
+            "run_dbt_full_build": {
+                "config": {
+                    "full_refresh": False,
+                    "full_scan_tests": True,
+                    "lookback_days": 14,
+                }
+            }
+        }
     }
\ No newline at end of file
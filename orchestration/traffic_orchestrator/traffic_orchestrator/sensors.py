@@ -0,0 +1,50 @@
+from dagster import (
+    DagsterRunStatus,
+    DefaultSensorStatus,
+    RunRequest,
+    RunsFilter,
+    SensorEvaluationContext,
+    SkipReason,
+    sensor,
+)
+
+from .jobs import microbatch_job
+
+ACTIVE_STATUSES = [
+    DagsterRunStatus.QUEUED,
+    DagsterRunStatus.NOT_STARTED,
+    DagsterRunStatus.STARTING,
+    DagsterRunStatus.STARTED,
+]
+
+
+@sensor(
+    job=microbatch_job,
+    minimum_interval_seconds=300,
+    default_status=DefaultSensorStatus.STOPPED,
+)
+def microbatch_sensor(context: SensorEvaluationContext):
+    # Every 5 minutes, unless the previous micro-batch is still queued/running:
+    # ticks coalesce instead of stacking up behind a slow pull or flush.
+    active = context.instance.get_run_records(
+        filters=RunsFilter(job_name=microbatch_job.name, statuses=ACTIVE_STATUSES),
+        limit=1,
+    )
+    if active:
+        return SkipReason(f"previous micro-batch run {active[0].dagster_run.run_id} still active")
+
+    return RunRequest(
+        run_config={
+            "ops": {
+                "run_microbatch": {
+                    "config": {
+                        "page_size": 1000,
+                        "max_pages": 2,
+                        "flush_max_rows": 5000,
+                        "flush_max_age_minutes": 30,
+                        "record_run_stats": True,
+                    }
+                }
+            }
+        }
+    )
@@ -17,6 +17,7 @@ CREATE TABLE IF NOT EXISTS `PROJECT_ID.traffic_bronze.traffic_incidents_raw` (
     quadrant            STRING,
     longitude           FLOAT64,
     latitude            FLOAT64,
+    location_key        STRING,     -- location bucket, computed at ingestion
     count               INT64,
 
     source_row_id       STRING,
@@ -0,0 +1,29 @@
+-- BIGQUERY JOB STATS (one row per load/merge job, written by the ingestion runner)
+
+CREATE TABLE IF NOT EXISTS `PROJECT_ID.traffic_control.job_stats` (
+  job_id            STRING NOT NULL,
+  kind              STRING,         -- "load" | "merge"
+  job_type          STRING,
+  statement_type    STRING,
+  state             STRING,
+  error             STRING,
+
+  snapshot_id       STRING,         -- ingestion snapshot the job belongs to
+  command           STRING,         -- runner command (pull/backfill/...)
+
+  created_at        TIMESTAMP,
+  queue_ms          INT64,
+  run_ms            INT64,
+  total_ms          INT64,
+
+  bytes_processed   INT64,
+  bytes_billed      INT64,
+  input_bytes       INT64,
+  slot_ms           INT64,
+  rows_affected     INT64,
+  cache_hit         BOOL,
+
+  recorded_at       TIMESTAMP NOT NULL
+)
+PARTITION BY DATE(recorded_at)
+CLUSTER BY kind;
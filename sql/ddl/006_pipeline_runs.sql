@@ -0,0 +1,20 @@
+-- PIPELINE RUN STATS (one row per loaded snapshot, written by the ingestion runner)
+-- Source for the dbt model marts/ops/pipeline_run_log.
+
+CREATE TABLE IF NOT EXISTS `PROJECT_ID.traffic_control.pipeline_runs` (
+  snapshot_id             STRING NOT NULL,
+  snapshot_ts             TIMESTAMP NOT NULL,
+  run_type                STRING NOT NULL,
+  query_name              STRING NOT NULL,
+  command                 STRING,
+
+  pages                   INT64,
+  rows_written            INT64,
+  rows_loaded             INT64,
+  distinct_incidents      INT64,
+  min_source_updated_at   TIMESTAMP,
+  max_source_updated_at   TIMESTAMP,
+
+  recorded_at             TIMESTAMP NOT NULL
+)
+PARTITION BY DATE(snapshot_ts);
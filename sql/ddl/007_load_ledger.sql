@@ -0,0 +1,18 @@
+-- LOAD LEDGER (one row per raw file loaded into bronze, written by the ingestion runner)
+-- Keyed by (content_hash, target): a file whose rows are already in that bronze
+-- table is not loaded again.
+
+CREATE TABLE IF NOT EXISTS `PROJECT_ID.traffic_control.load_ledger` (
+  content_hash      STRING NOT NULL,  -- sha256 of the rows without snapshot metadata
+  backend           STRING NOT NULL,
+  target            STRING,           -- bronze table loaded into (project.dataset.table)
+  path              STRING,
+  rows              INT64,
+  snapshot_ids      ARRAY<STRING>,    -- snapshots the rows were loaded under
+  snapshot_ts       TIMESTAMP,        -- earliest snapshot_ts of those rows
+  load_job_id       STRING,
+
+  loaded_at         TIMESTAMP NOT NULL
+)
+PARTITION BY DATE(loaded_at)
+CLUSTER BY content_hash;
@@ -10,6 +10,7 @@ USING (
       quadrant,
       longitude,
       latitude,
+      location_key,
       count,
       source_row_id,
       source_version,
@@ -51,6 +52,7 @@ WHEN MATCHED AND (
     quadrant           = S.quadrant,
     longitude          = S.longitude,
     latitude           = S.latitude,
+    location_key       = S.location_key,
     count              = S.count,
     source_row_id      = S.source_row_id,
     source_version     = S.source_version,
@@ -72,6 +74,7 @@ WHEN NOT MATCHED THEN
     quadrant,
     longitude,
     latitude,
+    location_key,
     count,
     source_row_id,
     source_version,
@@ -92,6 +95,7 @@ WHEN NOT MATCHED THEN
     S.quadrant,
     S.longitude,
     S.latitude,
+    S.location_key,
     S.count,
     S.source_row_id,
     S.source_version,
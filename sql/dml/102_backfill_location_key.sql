@@ -0,0 +1,27 @@
+-- One-off: add location_key to existing bronze/silver tables and key the rows
+-- loaded before ingestion computed it. The expression must match the
+-- ingestion settings (LOCATION_KEY_SCHEME / LOCATION_KEY_PRECISION):
+--   round, 3 (default):  CONCAT(quadrant, '_', CAST(ROUND(latitude, 3) AS STRING), '_', CAST(ROUND(longitude, 3) AS STRING))
+--   geohash, 7:          CONCAT(quadrant, '_', ST_GEOHASH(ST_GEOGPOINT(longitude, latitude), 7))
+-- Then rebuild the location-keyed marts:
+--   dbt build --full-refresh -s dim_location+ fact_incident_snapshot+
+
+ALTER TABLE `PROJECT_ID.traffic_bronze.traffic_incidents_raw`
+  ADD COLUMN IF NOT EXISTS location_key STRING;
+
+ALTER TABLE `PROJECT_ID.traffic_silver.incident_current`
+  ADD COLUMN IF NOT EXISTS location_key STRING;
+
+UPDATE `PROJECT_ID.traffic_bronze.traffic_incidents_raw`
+SET location_key = CONCAT(quadrant, '_', CAST(ROUND(latitude, 3) AS STRING), '_', CAST(ROUND(longitude, 3) AS STRING))
+WHERE location_key IS NULL
+  AND quadrant IS NOT NULL
+  AND latitude IS NOT NULL
+  AND longitude IS NOT NULL;
+
+UPDATE `PROJECT_ID.traffic_silver.incident_current`
+SET location_key = CONCAT(quadrant, '_', CAST(ROUND(latitude, 3) AS STRING), '_', CAST(ROUND(longitude, 3) AS STRING))
+WHERE location_key IS NULL
+  AND quadrant IS NOT NULL
+  AND latitude IS NOT NULL
+  AND longitude IS NOT NULL;
@@ -0,0 +1,15 @@
+-- One-off: move an existing incident_current to the layout in sql/ddl/002_silver.sql
+-- (CREATE TABLE IF NOT EXISTS leaves an existing table's layout alone).
+-- LIKE keeps the column modes (NOT NULL); run between pipeline runs.
+
+CREATE TABLE `PROJECT_ID.traffic_silver.incident_current__relayout`
+LIKE `PROJECT_ID.traffic_silver.incident_current`
+PARTITION BY TIMESTAMP_TRUNC(start_ts, MONTH)
+CLUSTER BY quadrant, incident_id
+AS
+SELECT * FROM `PROJECT_ID.traffic_silver.incident_current`;
+
+DROP TABLE `PROJECT_ID.traffic_silver.incident_current`;
+
+ALTER TABLE `PROJECT_ID.traffic_silver.incident_current__relayout`
+  RENAME TO incident_current;
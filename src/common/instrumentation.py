@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+
+# Stage timers and counters for a pipeline run.
+#
+#   with collect_stages() as stages:        # one per run, nesting is fine
+#       with stage("validate", rows=len(rows)):
+#           ...
+#       with stage("http") as s:
+#           response = ...
+#           if s.active:                      # only pay for counts someone collects
+#               s.add(bytes=len(response.content))
+#
+# Like bq_telemetry's job collectors, collectors are scoped by contextvars: a
+# stage reaches the collectors opened in its own context, so two runs in one
+# process (a sensor tick during a pipeline run) never see each other's stages.
+# Work handed to a pool thread runs in a copy of the submitter's context
+# (contextvars.copy_context().run) to keep reporting to it. With no collector
+# active (or PIPELINE_TIMINGS=0) stage() returns a shared no-op, so
+# instrumented code costs one context lookup.
+#
+# Stages are wall time summed per name: stages run by parallel workers can add
+# up to more than the run took, and a dotted name ("load.upload") is a part of
+# its parent stage ("load"), not in addition to it.
+ENABLED = os.getenv("PIPELINE_TIMINGS", "1").lower() not in ("0", "false", "off")
+
+_ACTIVE_COLLECTORS: contextvars.ContextVar[tuple[dict[str, "StageStats"], ...]] = contextvars.ContextVar(
+    "stage_collectors", default=()
+)
+# collectors are shared by the threads of one run
+_LOCK = threading.Lock()
+
+# Objects with enter(name)/exit(name), told about every live stage in their context (see profiling.py).
+_STAGE_HOOKS: contextvars.ContextVar[tuple] = contextvars.ContextVar("stage_hooks", default=())
+
+
+@dataclass
+class StageStats:
+    seconds: float = 0.0
+    calls: int = 0
+    rows: int = 0
+    bytes: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "seconds": round(self.seconds, 6),
+            "calls": self.calls,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "rows_per_sec": round(self.rows / self.seconds, 1) if self.rows and self.seconds > 0 else None,
+        }
+
+
+class _Span:
+    """One timed stage; add() counts rows/bytes known only inside the block."""
+    __slots__ = ("name", "rows", "bytes", "started")
+    active = True  # False on the no-op: skip counting work nobody collects
+
+    def __init__(self, name: str, rows: int, bytes: int) -> None:
+        self.name = name
+        self.rows = rows
+        self.bytes = bytes
+        self.started = 0.0
+
+    def add(self, *, rows: int = 0, bytes: int = 0) -> None:
+        self.rows += rows
+        self.bytes += bytes
+
+    def __enter__(self) -> "_Span":
+        for hook in _STAGE_HOOKS.get():
+            hook.enter(self.name)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _record(self.name, time.perf_counter() - self.started, self.rows, self.bytes)
+        for hook in _STAGE_HOOKS.get():
+            hook.exit(self.name)
+
+
+class _NoopSpan:
+    __slots__ = ()
+    active = False
+
+    def add(self, *, rows: int = 0, bytes: int = 0) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def _record(name: str, seconds: float, rows: int, bytes: int) -> None:
+    with _LOCK:
+        for collector in _ACTIVE_COLLECTORS.get():
+            stats = collector.get(name)
+            if stats is None:
+                stats = collector[name] = StageStats()
+            stats.seconds += seconds
+            stats.calls += 1
+            stats.rows += rows
+            stats.bytes += bytes
+
+
+# --------- API ---------
+
+def stage(name: str, *, rows: int = 0, bytes: int = 0) -> _Span | _NoopSpan:
+    """Time the block as stage name (context manager)."""
+    if not _ACTIVE_COLLECTORS.get():
+        return _NOOP
+    return _Span(name, rows, bytes)
+
+
+def count(name: str, *, rows: int = 0, bytes: int = 0) -> None:
+    """Add rows/bytes to a stage without timing anything."""
+    if _ACTIVE_COLLECTORS.get():
+        _record(name, 0.0, rows, bytes)
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of stage(name)."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _ACTIVE_COLLECTORS.get():
+                return fn(*args, **kwargs)
+            with _Span(name, 0, 0):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_stage_hook(hook) -> None:
+    _STAGE_HOOKS.set(_STAGE_HOOKS.get() + (hook,))
+
+
+def remove_stage_hook(hook) -> None:
+    _STAGE_HOOKS.set(tuple(h for h in _STAGE_HOOKS.get() if h is not hook))
+
+
+@contextmanager
+def collect_stages() -> Iterator[dict[str, StageStats]]:
+    """Collect every stage that finishes inside the block (in this context), by name."""
+    collected: dict[str, StageStats] = {}
+    if not ENABLED:
+        yield collected
+        return
+    token = _ACTIVE_COLLECTORS.set(_ACTIVE_COLLECTORS.get() + (collected,))
+    try:
+        yield collected
+    finally:
+        _ACTIVE_COLLECTORS.reset(token)
+
+
+def summarize_stages(stages: dict[str, StageStats]) -> dict:
+    """{"stages": {name: {seconds, calls, rows, bytes, rows_per_sec}}}, slowest first."""
+    ordered = sorted(stages.items(), key=lambda kv: kv[1].seconds, reverse=True)
+    return {"stages": {name: stats.as_dict() for name, stats in ordered}}
+
+
+def with_stages(fn: Callable[..., dict]) -> Callable[..., dict]:
+    """Decorator for dict-returning runs: adds the run's stage breakdown as "stages"."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs) -> dict:
+        with collect_stages() as stages:
+            result = fn(*args, **kwargs)
+        return {**result, **summarize_stages(stages)}
+    return wrapper
+
+
+def format_stages(stages: dict) -> str:
+    """One line per stage for logs, from summarize_stages()["stages"]."""
+    lines = []
+    for name, s in stages.items():
+        rate = f" {s['rows_per_sec']:.0f} rows/s" if s.get("rows_per_sec") else ""
+        lines.append(
+            f"  {name:<16} {s['seconds']:>9.3f}s  calls={s['calls']} rows={s['rows']} bytes={s['bytes']}{rate}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from src.common import instrumentation
+from src.common.instrumentation import collect_stages
+
+
+# cProfile for a whole run, or only for the time spent inside one
+# instrumentation stage (e.g. "validate"), in whatever thread it runs.
+#
+# Writes, next to the run's output:
+#   <prefix>.prof       pstats file (python -m pstats, snakeviz, ...)
+#   <prefix>.collapsed  "a;b;c <microseconds>" lines for flamegraph.pl / speedscope
+#
+# cProfile keeps caller/callee pairs, not whole stacks, so the collapsed stacks
+# are rebuilt from the call graph and split a function's time across its
+# callers in proportion to each caller's share; good for finding hot paths,
+# not exact for functions reached through several paths.
+#
+# Without a stage only the calling thread is profiled (before 3.12); sliced pulls
+# do their work on pool threads, so profile those with a stage (--profile-stage validate).
+TOP_N = 20
+MAX_STACK_DEPTH = 64
+MIN_STACK_US = 100
+
+# From 3.12 cProfile sits on sys.monitoring: one enabled profiler sees every
+# thread and a second one cannot be enabled, so stages share a single profile.
+_ONE_PROFILER_PER_PROCESS = sys.version_info >= (3, 12)
+
+
+class _StageProfiler:
+    """Enables a per-thread cProfile.Profile (one shared from 3.12) while the named stage is open."""
+
+    def __init__(self, stage_name: str) -> None:
+        self.stage_name = stage_name
+        self.profiles: list[cProfile.Profile] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shared_depth = 0
+
+    def _profile(self) -> cProfile.Profile:
+        prof = getattr(self._local, "profile", None)
+        if prof is None:
+            prof = self._local.profile = cProfile.Profile()
+            self._local.depth = 0
+            with self._lock:
+                self.profiles.append(prof)
+        return prof
+
+    def enter(self, name: str) -> None:
+        if name != self.stage_name:
+            return
+        if _ONE_PROFILER_PER_PROCESS:
+            with self._lock:
+                if not self.profiles:
+                    self.profiles.append(cProfile.Profile())
+                if self._shared_depth == 0:
+                    self.profiles[0].enable()
+                self._shared_depth += 1
+            return
+        prof = self._profile()
+        if self._local.depth == 0:
+            prof.enable()
+        self._local.depth += 1
+
+    def exit(self, name: str) -> None:
+        if name != self.stage_name:
+            return
+        if _ONE_PROFILER_PER_PROCESS:
+            with self._lock:
+                self._shared_depth -= 1
+                if self._shared_depth == 0:
+                    self.profiles[0].disable()
+            return
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            self._local.profile.disable()
+
+
+class ProfileRun:
+    """Filled in when the profile_run() block exits; result is None when profiling was off."""
+
+    def __init__(self) -> None:
+        self.result: dict | None = None
+
+
+# --------- Reports ---------
+
+def _func_name(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # builtins, e.g. <method 'write' of '_io.TextIOWrapper' objects>
+    return f"{Path(filename).name}:{line}({name})"
+
+
+def top_functions(stats: pstats.Stats, n: int = TOP_N) -> list[dict]:
+    """The n functions with the most own time."""
+    rows = [
+        {
+            "function": _func_name(func),
+            "calls": nc,
+            "tottime_s": round(tt, 6),
+            "cumtime_s": round(ct, 6),
+        }
+        for func, (cc, nc, tt, ct, callers) in stats.stats.items()
+    ]
+    return sorted(rows, key=lambda r: r["tottime_s"], reverse=True)[:n]
+
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, int]:
+    """Approximate folded stacks ("a;b;c" -> microseconds) from the call graph."""
+    callees: dict[tuple, list[tuple[tuple, float]]] = defaultdict(list)
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge[3]))
+
+    folded: dict[str, int] = defaultdict(int)
+
+    def walk(func: tuple, stack: list[str], seen: set, share_s: float) -> None:
+        cc, nc, tt, ct, callers = stats.stats[func]
+        fraction = min(1.0, share_s / ct) if ct > 0 else 0.0
+        own_us = int(tt * fraction * 1_000_000)
+        if own_us >= MIN_STACK_US:
+            folded[";".join(stack)] += own_us
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_ct in callees.get(func, ()):
+            child_share = edge_ct * fraction
+            if callee in seen or child_share * 1_000_000 < MIN_STACK_US:
+                continue
+            walk(callee, stack + [_func_name(callee)], seen | {callee}, child_share)
+
+    roots = [func for func, (cc, nc, tt, ct, callers) in stats.stats.items() if not callers]
+    for root in roots:
+        walk(root, [_func_name(root)], {root}, stats.stats[root][3])
+    return dict(folded)
+
+
+def write_reports(stats: pstats.Stats, prefix: str | Path) -> dict:
+    prefix = Path(prefix)
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+
+    stats_path = prefix.with_name(prefix.name + ".prof")
+    stats.dump_stats(str(stats_path))
+
+    collapsed_path = prefix.with_name(prefix.name + ".collapsed")
+    with open(collapsed_path, "w", encoding="utf-8") as f:
+        for stack, us in sorted(collapsed_stacks(stats).items()):
+            f.write(f"{stack} {us}\n")
+
+    return {"stats_path": str(stats_path), "collapsed_path": str(collapsed_path)}
+
+
+def profile_prefix(output: str | Path) -> Path:
+    """data/raw/x.jsonl -> data/raw/x (reports become x.prof, x.collapsed)."""
+    output = Path(output)
+    return output.with_suffix("") if output.suffix else output / "profile"
+
+
+# --------- API ---------
+
+@contextmanager
+def profile_run(prefix: str | Path, *, stage: str | None = None, enabled: bool = True) -> Iterator[ProfileRun]:
+    """
+    Profile the block with cProfile and write reports under prefix.
+
+    stage limits the profile to time inside that instrumentation stage. The
+    summary (paths, profiled seconds, top functions) lands in .result.
+    """
+    run = ProfileRun()
+    if not enabled:
+        yield run
+        return
+    if stage is not None and not instrumentation.ENABLED:
+        raise ValueError("profiling a stage needs stage instrumentation (PIPELINE_TIMINGS is off)")
+
+    if stage is None:
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            yield run
+        finally:
+            prof.disable()
+        profiles = [prof]
+    else:
+        hook = _StageProfiler(stage)
+        instrumentation.add_stage_hook(hook)
+        try:
+            # stages only run (and reach the hook) while something collects them
+            with collect_stages():
+                yield run
+        finally:
+            instrumentation.remove_stage_hook(hook)
+        profiles = hook.profiles
+
+    if not profiles:
+        print(f"[profile] stage {stage!r} never ran; no profile written")
+        run.result = {"stage": stage, "stats_path": None, "collapsed_path": None, "profiled_s": 0.0, "top_functions": []}
+        return
+
+    stats = pstats.Stats(profiles[0])
+    for extra in profiles[1:]:
+        stats.add(extra)
+
+    paths = write_reports(stats, prefix)
+    run.result = {
+        "stage": stage,
+        **paths,
+        "threads": len(profiles),
+        "profiled_s": round(stats.total_tt, 6),
+        "top_functions": top_functions(stats),
+    }
+    print(
+        f"[profile] stage={stage or 'all'} profiled_s={run.result['profiled_s']} "
+        f"stats={paths['stats_path']} collapsed={paths['collapsed_path']}"
+    )
+    for row in run.result["top_functions"][:5]:
+        print(f"[profile]   {row['tottime_s']:>9.3f}s own  {row['cumtime_s']:>9.3f}s cum  {row['function']}")
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict
 
+from src.utils.geo_utils import location_key
+
 from .socrata_models import TrafficIncidentRow
 
+# Location bucket stored as location_key (drives dbt dim_location).
+# Changing the scheme/precision only affects new rows: re-key older rows with
+# sql/dml/102_backfill_location_key.sql using the same settings.
+LOCATION_KEY_SCHEME = os.getenv("LOCATION_KEY_SCHEME", "round")     # "round" | "geohash"
+LOCATION_KEY_PRECISION = int(os.getenv("LOCATION_KEY_PRECISION")) if os.getenv("LOCATION_KEY_PRECISION") else None
+
 @dataclass(frozen=True)
 class IngestionMeta:
     snapshot_id: str
@@ -59,6 +68,11 @@ def to_bronze_row(row, r: TrafficIncidentRow) -> Dict[str, Any]:
         # geo (canonical numeric)
         "longitude": lon,
         "latitude": lat,
+        "location_key": location_key(
+            r.quadrant, lat, lon,
+            scheme=LOCATION_KEY_SCHEME,
+            precision=LOCATION_KEY_PRECISION,
+        ),
 
         # metrics / misc
         "count": r.count,
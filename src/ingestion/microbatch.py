@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.ingestion.runner import (
+    WATERMARK_OVERLAP_MINUTES,
+    _iso_z,
+    _run_info,
+    advance_watermark,
+    incremental,
+    read_watermark,
+)
+from src.common.instrumentation import stage, with_stages
+from src.storage.backend import BACKENDS, get_backend
+from src.storage.bq_telemetry import collect_job_stats, summarize_job_stats
+from src.storage.bq_control import record_best_effort, record_pipeline_run
+from src.storage.load_ledger import load_once
+
+
+# Small watermark-driven pulls land in the spool; a flush loads everything
+# spooled with one load job and one batched silver MERGE, so pulling every few
+# minutes does not mean two BigQuery jobs every few minutes.
+SPOOL_DIR = "data/raw/microbatch/spool"
+BATCH_DIR = "data/raw/microbatch"
+
+# A flush first freezes the spool: its pulls move to spool/pending/batch_<ts>/
+# and are stitched into spool/pending/batch_<ts>.jsonl. Until that batch is in
+# silver, every flush retries exactly it (same rows, so the load ledger skips a
+# load that already went through); pulls spooled meanwhile wait for the next batch.
+PENDING_SUBDIR = "pending"
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# --------- Pull ---------
+
+def pull_to_spool(*, page_size: int, max_pages: int, spool_dir: str = SPOOL_DIR) -> dict:
+    """
+    Pull everything updated since the watermark into a spool file (no load).
+
+    The watermark advances as soon as the file is written: spooled rows are on
+    disk and will be loaded by the next flush, so the next pull starts after them.
+    """
+    stored = read_watermark()
+    if stored is None:
+        raise ValueError("Micro-batch pulls need an existing state/watermark.json (run a pull first).")
+    since = stored - timedelta(minutes=WATERMARK_OVERLAP_MINUTES)
+
+    spool = Path(spool_dir)
+    spool.mkdir(parents=True, exist_ok=True)
+    pulled_at = datetime.now(timezone.utc)
+    out_path = spool / f"pull_{pulled_at.strftime('%Y%m%dT%H%M%S%fZ')}.jsonl"
+
+    meta, stats = incremental(since=since, page_size=page_size, max_pages=max_pages, out_path=str(out_path))
+
+    if stats.rows_written == 0:
+        out_path.unlink(missing_ok=True)
+        return {"snapshot_id": meta.snapshot_id, "rows_written": 0, "spool_path": None, "watermark_after": None}
+
+    # Sidecar with the run-stats record, written to traffic_control at flush time.
+    run_info = {**_run_info(meta, stats), "snapshot_id": meta.snapshot_id, "command": "microbatch"}
+    out_path.with_suffix(".meta.json").write_text(
+        json.dumps({**run_info, "rows_written": stats.rows_written}, indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+    watermark_after = None
+    if stats.max_source_updated_at is not None and advance_watermark(stats.max_source_updated_at):
+        watermark_after = _iso_z(stats.max_source_updated_at)
+
+    return {
+        "snapshot_id": meta.snapshot_id,
+        "rows_written": stats.rows_written,
+        "spool_path": str(out_path),
+        "watermark_after": watermark_after,
+    }
+
+
+# --------- Flush ---------
+
+def _pending_batches(spool_dir: str) -> list[Path]:
+    pending = Path(spool_dir) / PENDING_SUBDIR
+    if not pending.exists():
+        return []
+    return sorted(d for d in pending.iterdir() if d.is_dir())
+
+
+def spool_status(spool_dir: str = SPOOL_DIR) -> dict:
+    """Spooled files, rows, the age of the oldest file, and frozen batches still to load."""
+    files = sorted(Path(spool_dir).glob("pull_*.jsonl"))
+    rows = 0
+    for f in files:
+        sidecar = f.with_suffix(".meta.json")
+        if sidecar.exists():
+            rows += json.loads(sidecar.read_text(encoding="utf-8"))["rows_written"]
+    oldest_age_s = time.time() - min(f.stat().st_mtime for f in files) if files else 0.0
+    return {
+        "files": len(files),
+        "rows": rows,
+        "oldest_age_s": round(oldest_age_s, 1),
+        "pending_batches": len(_pending_batches(spool_dir)),
+    }
+
+
+def should_flush(status: dict, *, max_rows: int, max_age_minutes: float) -> bool:
+    if status.get("pending_batches"):
+        return True  # a failed flush is retried on the next tick
+    return status["files"] > 0 and (status["rows"] >= max_rows or status["oldest_age_s"] >= max_age_minutes * 60)
+
+
+def freeze_batch(spool_dir: str = SPOOL_DIR) -> Path | None:
+    """
+    The frozen batch directory to flush: the pending one left by a failed
+    flush, else a new one holding everything spooled now. None if both are empty.
+    """
+    pending = _pending_batches(spool_dir)
+    if pending:
+        print(f"[microbatch] retrying pending batch {pending[0].name}")
+        return pending[0]
+
+    files = sorted(Path(spool_dir).glob("pull_*.jsonl"))
+    if not files:
+        return None
+
+    batch = Path(spool_dir) / PENDING_SUBDIR / f"batch_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')}"
+    batch.mkdir(parents=True)
+    for f in files:
+        sidecar = f.with_suffix(".meta.json")
+        if sidecar.exists():
+            os.replace(sidecar, batch / sidecar.name)
+        os.replace(f, batch / f.name)
+    return batch
+
+
+@with_stages
+def flush_spool(
+    *,
+    spool_dir: str = SPOOL_DIR,
+    batch_dir: str = BATCH_DIR,
+    backend: str | None = None,
+    record_run_stats_flag: bool = False,
+) -> dict:
+    """
+    Load the spooled files as one batch and merge all of its snapshots at once.
+
+    The batch is frozen first (see freeze_batch), so a flush that fails after
+    its load is retried with the same file. Reports latency from source update
+    to silver: for each row, the time between its source_updated_at and the
+    end of the silver MERGE.
+    """
+    batch = freeze_batch(spool_dir)
+    if batch is None:
+        return {"flushed": False, "files": 0, "rows_loaded": 0, "snapshot_ids": []}
+
+    files = sorted(batch.glob("pull_*.jsonl"))
+    batch_path = batch.with_suffix(".jsonl")
+
+    snapshot_ids: set[str] = set()
+    run_records: list[dict] = []
+    source_updated: list[datetime] = []
+
+    # Re-stitched on a retry: the frozen pulls give the same bytes, so the same content hash.
+    tmp_path = batch_path.with_suffix(".jsonl.tmp")
+    with stage("stitch") as s, open(tmp_path, "w", encoding="utf-8") as out:
+        for f in files:
+            with open(f, "r", encoding="utf-8") as src:
+                for line in src:
+                    if not line.strip():
+                        continue
+                    out.write(line if line.endswith("\n") else line + "\n")
+                    row = json.loads(line)
+                    snapshot_ids.add(row["snapshot_id"])
+                    if row.get("source_updated_at"):
+                        source_updated.append(_parse_ts(row["source_updated_at"]))
+
+            sidecar = f.with_suffix(".meta.json")
+            if sidecar.exists():
+                run_records.append(json.loads(sidecar.read_text(encoding="utf-8")))
+        s.add(bytes=out.tell())
+    os.replace(tmp_path, batch_path)
+
+    warehouse = get_backend(backend)
+    with collect_job_stats() as bq_jobs:
+        # A retried batch whose load already went through is found in the ledger.
+        with stage("load") as s:
+            load = load_once(warehouse, batch_path)
+            s.add(rows=load["rows_loaded"], bytes=batch_path.stat().st_size)
+        rows_loaded = load["rows_loaded"]
+        with stage("merge"):
+            silver_job_id = warehouse.merge_silver(snapshot_ids=sorted(snapshot_ids | set(load["snapshot_ids"])))
+    merged_at = datetime.now(timezone.utc)
+
+    # The batch is in silver: keep its file for replay, drop the frozen pulls.
+    Path(batch_dir).mkdir(parents=True, exist_ok=True)
+    done_path = Path(batch_dir) / batch_path.name
+    os.replace(batch_path, done_path)
+    shutil.rmtree(batch)
+    if not any(batch.parent.iterdir()):
+        batch.parent.rmdir()
+
+    # Once per batch: a frozen batch only gets here once, even when its load was retried.
+    if record_run_stats_flag:
+        for record in run_records:
+            record_best_effort(record_pipeline_run, {**record, "rows_loaded": record["rows_written"]})
+
+    latencies = [(merged_at - ts).total_seconds() for ts in source_updated]
+
+    return {
+        "flushed": True,
+        "files": len(files),
+        "batch_path": str(done_path),
+        "snapshot_ids": sorted(snapshot_ids),
+        "rows_loaded": rows_loaded,
+        "load_skipped": load["skipped"],
+        "silver_merge_job_id": silver_job_id,
+        "backend": warehouse.name,
+        "latency_p50_s": _percentile(latencies, 50),
+        "latency_p95_s": _percentile(latencies, 95),
+        "latency_max_s": max(latencies) if latencies else None,
+        "bq_jobs": bq_jobs,
+        **summarize_job_stats(bq_jobs),
+    }
+
+
+def run_micro_batch(
+    *,
+    page_size: int,
+    max_pages: int,
+    flush_max_rows: int,
+    flush_max_age_minutes: float,
+    backend: str | None = None,
+    record_run_stats_flag: bool = False,
+) -> dict:
+    """One micro-batch tick: pull into the spool, flush if the spool is big or old enough."""
+    pulled = pull_to_spool(page_size=page_size, max_pages=max_pages)
+    status = spool_status()
+
+    flush = {"flushed": False}
+    if should_flush(status, max_rows=flush_max_rows, max_age_minutes=flush_max_age_minutes):
+        flush = flush_spool(backend=backend, record_run_stats_flag=record_run_stats_flag)
+
+    print(
+        f"[microbatch] pulled={pulled['rows_written']} spool_files={status['files']} "
+        f"spool_rows={status['rows']} flushed={flush['flushed']} "
+        f"latency_p50_s={flush.get('latency_p50_s')} latency_max_s={flush.get('latency_max_s')}"
+    )
+
+    return {"pull": pulled, "spool": status, "flush": flush}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-batch ingestion: spool small pulls, flush in batches")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--max-pages", type=int, default=2)
+    parser.add_argument("--flush-max-rows", type=int, default=5000)
+    parser.add_argument("--flush-max-age-minutes", type=float, default=30)
+    parser.add_argument("--flush-only", action="store_true", help="flush the spool without pulling")
+    parser.add_argument("--record-run-stats", action="store_true", help="write run-stats records to traffic_control")
+    parser.add_argument("--backend", choices=BACKENDS, default=None)
+    args = parser.parse_args()
+
+    if args.flush_only:
+        result = flush_spool(backend=args.backend, record_run_stats_flag=args.record_run_stats)
+    else:
+        result = run_micro_batch(
+            page_size=args.page_size,
+            max_pages=args.max_pages,
+            flush_max_rows=args.flush_max_rows,
+            flush_max_age_minutes=args.flush_max_age_minutes,
+            backend=args.backend,
+            record_run_stats_flag=args.record_run_stats,
+        )
+
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
+
+# micro-batch tick -> python -m src.ingestion.microbatch --page-size 1000 --max-pages 2 --flush-max-rows 5000 --flush-max-age-minutes 30
+# flush now -> python -m src.ingestion.microbatch --flush-only
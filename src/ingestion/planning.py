@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+
+
+# Rows per slice a single worker pulls; bigger windows are split by day.
+DEFAULT_ROWS_PER_SLICE = int(os.getenv("PLAN_ROWS_PER_SLICE", "20000"))
+DEFAULT_MAX_WORKERS = int(os.getenv("PLAN_MAX_WORKERS", "4"))
+MIN_PAGE_SIZE = 100
+
+# One request returns the per-day counts of any window we would pull.
+_COUNT_PAGE_SIZE = 50_000
+
+
+@dataclass
+class PullPlan:
+    """How to pull one window, sized from the source's row counts."""
+    expected_rows: int
+    page_size: int
+    expected_pages: int
+    slices: list[tuple[datetime, datetime | None]] = field(default_factory=list)
+    workers: int = 1
+    rows_by_day: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        d = asdict(self)
+        d["slices"] = [
+            [_iso_z(lo), _iso_z(hi) if hi is not None else None]
+            for lo, hi in self.slices
+        ]
+        return d
+
+
+def _iso_z(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+# --------- Counts ---------
+
+def count_by_day(field_name: str, where: str) -> dict[str, int]:
+    """Rows per UTC day of field_name ("YYYY-MM-DD" -> count) for a WHERE clause."""
+    from src.ingestion.runner import post_query
+
+    rows = post_query(
+        f"SELECT date_trunc_ymd({field_name}) AS day, count(*) AS n {where}"
+        f"GROUP BY day ORDER BY day ASC",
+        page_number=1,
+        page_size=_COUNT_PAGE_SIZE,
+    )
+    return {str(row["day"])[:10]: int(row["n"]) for row in rows}
+
+
+# --------- Plan ---------
+
+def slice_days(
+    rows_by_day: dict[str, int],
+    *,
+    start: datetime,
+    end: datetime | None,
+    rows_per_slice: int,
+) -> list[tuple[datetime, datetime | None]]:
+    """
+    Split [start, end) into contiguous day-aligned slices of about rows_per_slice
+    rows each. The first slice starts at start and the last one ends at end
+    (None = open-ended), so the slices cover the window exactly.
+    """
+    bounds: list[datetime] = [start]
+    acc = 0
+    for day, n in sorted(rows_by_day.items()):
+        if acc >= rows_per_slice:
+            cut = datetime.fromisoformat(day).replace(tzinfo=timezone.utc)
+            if cut > bounds[-1] and (end is None or cut < end):
+                bounds.append(cut)
+                acc = 0
+        acc += n
+    return [(lo, hi) for lo, hi in zip(bounds, bounds[1:] + [end])]
+
+
+def plan_window(
+    *,
+    field_name: str,
+    where: str,
+    start: datetime,
+    end: datetime | None,
+    max_page_size: int,
+    rows_per_slice: int = DEFAULT_ROWS_PER_SLICE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> PullPlan:
+    """
+    Count the window by day and size the pull from it.
+
+    - slices: day-aligned sub-windows of ~rows_per_slice rows, pulled in parallel
+    - workers: one per slice, at most max_workers
+    - page_size: just big enough for the largest slice, capped at max_page_size,
+      so small windows finish on their first (short) page
+    """
+    rows_by_day = count_by_day(field_name, where)
+    expected_rows = sum(rows_by_day.values())
+
+    slices = slice_days(rows_by_day, start=start, end=end, rows_per_slice=rows_per_slice)
+
+    largest = expected_rows
+    if len(slices) > 1:
+        largest = max(
+            sum(n for day, n in rows_by_day.items() if _in_slice(day, lo, hi))
+            for lo, hi in slices
+        )
+    page_size = min(max_page_size, max(MIN_PAGE_SIZE, math.ceil((largest + 1) / MIN_PAGE_SIZE) * MIN_PAGE_SIZE))
+
+    plan = PullPlan(
+        expected_rows=expected_rows,
+        page_size=page_size,
+        expected_pages=sum(
+            math.ceil(sum(n for day, n in rows_by_day.items() if _in_slice(day, lo, hi)) / page_size) or 1
+            for lo, hi in slices
+        ),
+        slices=slices,
+        workers=max(1, min(max_workers, len(slices))),
+        rows_by_day=rows_by_day,
+    )
+
+    print(
+        f"[plan] expected_rows={plan.expected_rows} days={len(rows_by_day)} "
+        f"slices={len(plan.slices)} workers={plan.workers} page_size={plan.page_size} "
+        f"expected_pages={plan.expected_pages}"
+    )
+    return plan
+
+
+def _in_slice(day: str, lo: datetime, hi: datetime | None) -> bool:
+    day_start = datetime.fromisoformat(day).replace(tzinfo=timezone.utc)
+    # Only the first slice can start mid-day; its partial first day belongs to it.
+    return day_start + timedelta(days=1) > lo and (hi is None or day_start < hi)
@@ -1,3 +1,8 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Sequence
+
 MERGE_SQL_TEMPLATE = """
 MERGE `{gcp_project_id}.{silver_dataset_id}.{silver_table_id}` T
 USING (
@@ -11,6 +16,7 @@ USING (
       quadrant,
       longitude,
       latitude,
+      location_key,
       count,
       source_row_id,
       source_version,
@@ -21,7 +27,7 @@ USING (
       run_type AS last_run_type,
       query_name AS last_query_name
     FROM `{gcp_project_id}.{bronze_dataset_id}.{bronze_table_id}`
-    WHERE snapshot_id = @snapshot_id
+    WHERE {snapshot_filter}
   ),
   dedup AS (
     SELECT * EXCEPT(rn)
@@ -52,6 +58,7 @@ WHEN MATCHED AND (
     quadrant           = S.quadrant,
     longitude          = S.longitude,
     latitude           = S.latitude,
+    location_key       = S.location_key,
     count              = S.count,
     source_row_id      = S.source_row_id,
     source_version     = S.source_version,
@@ -73,6 +80,7 @@ WHEN NOT MATCHED THEN
     quadrant,
     longitude,
     latitude,
+    location_key,
     count,
     source_row_id,
     source_version,
@@ -93,6 +101,7 @@ WHEN NOT MATCHED THEN
     S.quadrant,
     S.longitude,
     S.latitude,
+    S.location_key,
     S.count,
     S.source_row_id,
     S.source_version,
@@ -106,6 +115,187 @@ WHEN NOT MATCHED THEN
   );
 """
 
+# Same MERGE for the local DuckDB warehouse (src/storage/duckdb_backend.py).
+# Kept column-for-column in sync with MERGE_SQL_TEMPLATE; needs duckdb >= 1.4.
+DUCKDB_MERGE_SQL_TEMPLATE = """
+MERGE INTO {silver_table} AS T
+USING (
+  WITH candidates AS (
+    SELECT
+      incident_id,
+      incident_info,
+      description,
+      start_ts,
+      modified_ts,
+      quadrant,
+      longitude,
+      latitude,
+      location_key,
+      count,
+      source_row_id,
+      source_version,
+      source_created_at,
+      source_updated_at,
+      snapshot_id AS last_snapshot_id,
+      snapshot_ts AS last_snapshot_ts,
+      run_type AS last_run_type,
+      query_name AS last_query_name
+    FROM {bronze_table}
+    WHERE {snapshot_filter}
+  ),
+  dedup AS (
+    SELECT * EXCLUDE (rn)
+    FROM (
+      SELECT
+        c.*,
+        ROW_NUMBER() OVER (
+          PARTITION BY incident_id
+          ORDER BY source_updated_at DESC NULLS LAST, last_snapshot_ts DESC, source_version DESC NULLS LAST
+        ) AS rn
+      FROM candidates c
+    )
+    WHERE rn = 1
+  )
+  SELECT * FROM dedup
+) AS S
+ON T.incident_id = S.incident_id
+
+WHEN MATCHED AND (
+  T.source_updated_at IS NULL OR S.source_updated_at > T.source_updated_at
+  OR (S.source_updated_at = T.source_updated_at AND S.last_snapshot_ts > T.last_snapshot_ts)
+) THEN
+  UPDATE SET
+    incident_info      = S.incident_info,
+    description        = S.description,
+    start_ts           = S.start_ts,
+    modified_ts        = S.modified_ts,
+    quadrant           = S.quadrant,
+    longitude          = S.longitude,
+    latitude           = S.latitude,
+    location_key       = S.location_key,
+    count              = S.count,
+    source_row_id      = S.source_row_id,
+    source_version     = S.source_version,
+    source_created_at  = S.source_created_at,
+    source_updated_at  = S.source_updated_at,
+    last_snapshot_id   = S.last_snapshot_id,
+    last_snapshot_ts   = S.last_snapshot_ts,
+    last_run_type      = S.last_run_type,
+    last_query_name    = S.last_query_name,
+    loaded_at          = CURRENT_TIMESTAMP
+
+WHEN NOT MATCHED THEN
+  INSERT (
+    incident_id,
+    incident_info,
+    description,
+    start_ts,
+    modified_ts,
+    quadrant,
+    longitude,
+    latitude,
+    location_key,
+    count,
+    source_row_id,
+    source_version,
+    source_created_at,
+    source_updated_at,
+    last_snapshot_id,
+    last_snapshot_ts,
+    last_run_type,
+    last_query_name,
+    loaded_at
+  )
+  VALUES (
+    S.incident_id,
+    S.incident_info,
+    S.description,
+    S.start_ts,
+    S.modified_ts,
+    S.quadrant,
+    S.longitude,
+    S.latitude,
+    S.location_key,
+    S.count,
+    S.source_row_id,
+    S.source_version,
+    S.source_created_at,
+    S.source_updated_at,
+    S.last_snapshot_id,
+    S.last_snapshot_ts,
+    S.last_run_type,
+    S.last_query_name,
+    CURRENT_TIMESTAMP
+  );
+"""
+
+# Candidate filters for the MERGE source. The dedup ordering is applied across
+# every candidate row, so folding several snapshots into one MERGE picks the same
+# winner per incident as merging them one at a time in snapshot_ts order.
+SNAPSHOT_ID_FILTER = "snapshot_id = @snapshot_id"
+SNAPSHOT_IDS_FILTER = "snapshot_id IN UNNEST(@snapshot_ids)"
+SNAPSHOT_TS_RANGE_FILTER = "snapshot_ts >= @snapshot_ts_start AND snapshot_ts < @snapshot_ts_end"
+
+# The same filters per selection kind, for BigQuery and for the DuckDB backend.
+SNAPSHOT_FILTERS = {
+    "snapshot_id": SNAPSHOT_ID_FILTER,
+    "snapshot_ids": SNAPSHOT_IDS_FILTER,
+    "snapshot_ts_range": SNAPSHOT_TS_RANGE_FILTER,
+}
+DUCKDB_SNAPSHOT_FILTERS = {
+    "snapshot_id": "snapshot_id = $snapshot_id",
+    "snapshot_ids": "list_contains($snapshot_ids, snapshot_id)",
+    "snapshot_ts_range": "snapshot_ts >= $snapshot_ts_start AND snapshot_ts < $snapshot_ts_end",
+}
+
+
+def _parse_ts(value: str | datetime) -> datetime:
+    """Parse an ISO timestamp (accepts trailing 'Z'); naive values are treated as UTC."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def resolve_snapshot_selection(
+    *,
+    snapshot_id: str | None,
+    snapshot_ids: Sequence[str] | None,
+    snapshot_ts_start: str | datetime | None,
+    snapshot_ts_end: str | datetime | None,
+) -> tuple[str, dict]:
+    """
+    Resolve which bronze snapshots the MERGE reads, for either backend.
+
+    Returns (kind, params): kind keys SNAPSHOT_FILTERS / DUCKDB_SNAPSHOT_FILTERS
+    and params holds its parameter values. Exactly one of snapshot_id,
+    snapshot_ids or a snapshot_ts range may be given; with none, kind is
+    "snapshot_id" with a None id for the backend to resolve to the latest.
+    """
+    has_range = snapshot_ts_start is not None or snapshot_ts_end is not None
+    selected = sum([snapshot_id is not None, snapshot_ids is not None, has_range])
+    if selected > 1:
+        raise ValueError("Pass only one of snapshot_id, snapshot_ids or a snapshot_ts range")
+
+    if snapshot_ids is not None:
+        ids = sorted(set(snapshot_ids))
+        if not ids:
+            raise ValueError("snapshot_ids is empty")
+        return "snapshot_ids", {"snapshot_ids": ids}
+
+    if has_range:
+        if snapshot_ts_start is None or snapshot_ts_end is None:
+            raise ValueError("snapshot_ts range requires both start and end")
+        start = _parse_ts(snapshot_ts_start)
+        end = _parse_ts(snapshot_ts_end)
+        if end <= start:
+            raise ValueError(f"snapshot_ts_end must be after snapshot_ts_start: {start} >= {end}")
+        return "snapshot_ts_range", {"snapshot_ts_start": start, "snapshot_ts_end": end}
+
+    return "snapshot_id", {"snapshot_id": snapshot_id}
+
+
 def build_merge_sql(
     *,
     gcp_project_id: str,
@@ -113,6 +303,7 @@ def build_merge_sql(
     bronze_table_id: str,
     silver_dataset_id: str,
     silver_table_id: str,
+    snapshot_filter: str = SNAPSHOT_ID_FILTER,
 ) -> str:
     return MERGE_SQL_TEMPLATE.format(
         gcp_project_id=gcp_project_id,
@@ -120,4 +311,13 @@ def build_merge_sql(
         bronze_table_id=bronze_table_id,
         silver_dataset_id=silver_dataset_id,
         silver_table_id=silver_table_id,
+        snapshot_filter=snapshot_filter,
+    )
+
+
+def build_duckdb_merge_sql(*, bronze_table: str, silver_table: str, snapshot_filter: str) -> str:
+    return DUCKDB_MERGE_SQL_TEMPLATE.format(
+        bronze_table=bronze_table,
+        silver_table=silver_table,
+        snapshot_filter=snapshot_filter,
     )
@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.storage.load_ledger import content_hash
+
+
+# Raw files age through three tiers so replay stays possible long after a pull:
+#   compress_after_days  gzip in place (same directory, mtime kept)
+#   archive_after_days   move into archive/<snapshot day>/<source dir>/<name>.gz
+#   delete_after_days    delete, keep the manifest entry (state "deleted")
+#
+# The manifest (one JSON object per file, keyed by a generated id) records where
+# each file lives now, its rows, content hash and date range, so replay and
+# debugging can find archived files without walking directories. Pulls reuse
+# output names (dagster_pull_<date>.jsonl, resumed backfills), so neither the
+# source path nor a destination is unique over time: a file whose destination
+# is taken is stored under a name carrying its mtime instead.
+#
+# The Dagster op passes absolute roots and the CLI relative ones, so paths are
+# compared resolved (same_path_key); the manifest keeps them as given.
+RAW_ROOTS = ("data/raw/incremental", "data/raw/backfill")
+ARCHIVE_ROOT = "data/raw/archive"
+MANIFEST_NAME = "manifest.jsonl"
+RAW_SUFFIXES = (".jsonl", ".ndjson", ".jsonl.gz", ".ndjson.gz")
+# spool/replay belong to micro-batch and replay; archive is managed via the manifest
+SKIP_DIRS = frozenset({"spool", "replay", "archive"})
+
+DEFAULT_COMPRESS_AFTER_DAYS = 2
+DEFAULT_ARCHIVE_AFTER_DAYS = 14
+DEFAULT_DELETE_AFTER_DAYS = 180
+
+
+def _iso_z(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def same_path_key(path: str | Path) -> str:
+    """Key under which a relative and an absolute spelling of one file compare equal."""
+    return str(Path(path).resolve())
+
+
+def manifest_path(archive_root: str | Path = ARCHIVE_ROOT) -> Path:
+    return Path(archive_root) / MANIFEST_NAME
+
+
+# --------- Scan ---------
+
+@dataclass
+class RawFile:
+    path: str
+    bytes: int
+    mtime: datetime
+
+
+def scan_raw_files(root: str | Path, suffixes: tuple[str, ...] = RAW_SUFFIXES) -> list[RawFile]:
+    """
+    Every raw file under root in one os.scandir pass (one stat per file).
+
+    Empty files and SKIP_DIRS are left out.
+    """
+    found: list[RawFile] = []
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                    continue
+                if not entry.name.endswith(suffixes):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+                if st.st_size == 0:
+                    continue
+                found.append(RawFile(
+                    path=entry.path,
+                    bytes=st.st_size,
+                    mtime=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc),
+                ))
+    return sorted(found, key=lambda f: f.path)
+
+
+# --------- Manifest ---------
+
+def read_manifest(archive_root: str | Path = ARCHIVE_ROOT) -> dict[str, dict]:
+    path = manifest_path(archive_root)
+    if not path.exists():
+        return {}
+    entries: dict[str, dict] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                entry.setdefault("id", entry["source_path"])  # written before ids
+                entries[entry["id"]] = entry
+    return entries
+
+
+def write_manifest(entries: dict[str, dict], archive_root: str | Path = ARCHIVE_ROOT) -> Path:
+    path = manifest_path(archive_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".jsonl.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for entry in sorted(entries.values(), key=lambda e: (e["source_path"], e.get("mtime") or "", e["id"])):
+            f.write(json.dumps(entry) + "\n")
+    os.replace(tmp_path, path)
+    return path
+
+
+def describe_raw_file(path: str | Path) -> dict:
+    """Rows, content hash and snapshot/source-update date ranges, in one read."""
+    snapshot_ts: list[str] = []
+    updated_at: list[str] = []
+
+    def on_row(row: dict) -> None:
+        if row.get("snapshot_ts"):
+            snapshot_ts.append(row["snapshot_ts"])
+        if row.get("source_updated_at"):
+            updated_at.append(row["source_updated_at"])
+
+    file_hash = content_hash(path, on_row=on_row)
+    return {
+        "rows": file_hash["rows"],
+        "content_hash": file_hash["content_hash"],
+        "snapshot_ids": file_hash["snapshot_ids"],
+        # all ISO-8601 UTC "Z" strings, so min/max order by time
+        "snapshot_from": min(snapshot_ts, default=None),
+        "snapshot_to": max(snapshot_ts, default=None),
+        "updated_from": min(updated_at, default=None),
+        "updated_to": max(updated_at, default=None),
+    }
+
+
+def archived_files(
+    archive_root: str | Path = ARCHIVE_ROOT,
+    *,
+    from_date=None,
+    to_date=None,
+) -> list[dict]:
+    """
+    Manifest entries whose file still exists (compressed or archived), optionally
+    only those whose snapshot range overlaps [from_date, to_date].
+    """
+    found = []
+    for entry in read_manifest(archive_root).values():
+        if entry["state"] == "deleted" or not entry.get("snapshot_from"):
+            continue
+        if from_date and entry["snapshot_to"][:10] < from_date.isoformat():
+            continue
+        if to_date and entry["snapshot_from"][:10] > to_date.isoformat():
+            continue
+        found.append(entry)
+    return sorted(found, key=lambda e: (e["snapshot_from"], e["path"]))
+
+
+# --------- Tiers ---------
+
+def _gzip_to(src: str, dest: Path, mtime: datetime) -> int:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dest = dest.with_name(dest.name + ".tmp")
+    with open(src, "rb") as f_in, gzip.open(tmp_dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    # keep the original mtime so the file keeps aging from when it was pulled
+    os.utime(tmp_dest, (mtime.timestamp(), mtime.timestamp()))
+    os.replace(tmp_dest, dest)
+    os.unlink(src)
+    return dest.stat().st_size
+
+
+def _free_dest(dest: Path, mtime: datetime, taken: set[str]) -> Path:
+    """
+    dest, or (when a file is already there or the manifest points there) dest
+    with the source file's mtime, and a counter if needed, before its suffix.
+    """
+    if same_path_key(dest) not in taken and not dest.exists():
+        return dest
+    suffix = next(sfx for sfx in sorted(RAW_SUFFIXES, key=len, reverse=True) if dest.name.endswith(sfx))
+    base = dest.name[: -len(suffix)] + "." + mtime.strftime("%Y%m%dT%H%M%SZ")
+    candidate = dest.with_name(base + suffix)
+    n = 1
+    while same_path_key(candidate) in taken or candidate.exists():
+        candidate = dest.with_name(f"{base}-{n}{suffix}")
+        n += 1
+    return candidate
+
+
+def _archive_dest(raw: RawFile, root: str, day: str, archive_root: str | Path) -> Path:
+    name = os.path.basename(raw.path)
+    if not name.endswith(".gz"):
+        name += ".gz"
+    # keep which pull produced the file: archive/<day>/<incremental|backfill>/...
+    source_dir = os.path.relpath(os.path.dirname(raw.path), os.path.dirname(root))
+    return Path(archive_root) / day / source_dir / name
+
+
+def run_lifecycle(
+    *,
+    roots: list[str] | tuple[str, ...] = RAW_ROOTS,
+    archive_root: str | Path = ARCHIVE_ROOT,
+    compress_after_days: int = DEFAULT_COMPRESS_AFTER_DAYS,
+    archive_after_days: int = DEFAULT_ARCHIVE_AFTER_DAYS,
+    delete_after_days: int = DEFAULT_DELETE_AFTER_DAYS,
+    dry_run: bool = False,
+    now: datetime | None = None,
+) -> dict:
+    """
+    Compress, archive and delete raw files by age (mtime) and update the manifest.
+
+    Each file moves at most one tier per run, to the oldest tier its age
+    allows. Archived files are found (and deleted) through the manifest, not by
+    walking the archive. Failures on one file are reported and skipped.
+    """
+    if not compress_after_days <= archive_after_days <= delete_after_days:
+        raise ValueError(
+            "expected compress_after_days <= archive_after_days <= delete_after_days, got "
+            f"{compress_after_days}/{archive_after_days}/{delete_after_days}"
+        )
+
+    now = now or datetime.now(timezone.utc)
+    compress_cutoff = now - timedelta(days=compress_after_days)
+    archive_cutoff = now - timedelta(days=archive_after_days)
+    delete_cutoff = now - timedelta(days=delete_after_days)
+
+    manifest = read_manifest(archive_root)
+    by_path = {same_path_key(e["path"]): e for e in manifest.values() if e["state"] != "deleted"}
+    # destinations already used by this run (dry runs move nothing) or the manifest
+    taken = set(by_path)
+
+    counts = {"scanned": 0, "kept": 0, "compressed": 0, "archived": 0, "deleted": 0}
+    bytes_before = 0
+    bytes_after = 0
+    actions: list[dict] = []
+    errors: list[str] = []
+
+    def act(action: str, raw: RawFile, dest: str | None = None) -> None:
+        counts[action] += 1
+        actions.append({"action": action, "path": raw.path, "dest": dest})
+        prefix = "[lifecycle][dry-run] would" if dry_run else "[lifecycle]"
+        print(f"{prefix} {action} {raw.path}" + (f" -> {dest}" if dest else ""))
+
+    # --------- Live files (one scandir pass per root) ---------
+    for root in roots:
+        for raw in scan_raw_files(root):
+            counts["scanned"] += 1
+            bytes_before += raw.bytes
+            if raw.mtime >= compress_cutoff or (raw.mtime >= archive_cutoff and raw.path.endswith(".gz")):
+                counts["kept"] += 1
+                bytes_after += raw.bytes
+                continue
+
+            try:
+                entry = by_path.get(same_path_key(raw.path))
+                if entry is None:
+                    entry = {
+                        "id": uuid.uuid4().hex,
+                        "source_path": raw.path,
+                        "bytes": raw.bytes,
+                        **describe_raw_file(raw.path),
+                    }
+                entry["mtime"] = _iso_z(raw.mtime)
+
+                if raw.mtime < delete_cutoff:
+                    act("deleted", raw)
+                    if not dry_run:
+                        os.unlink(raw.path)
+                        entry.update(state="deleted", path=None, stored_bytes=0)
+                elif raw.mtime < archive_cutoff:
+                    day = (entry.get("snapshot_from") or _iso_z(raw.mtime))[:10]
+                    dest = _free_dest(_archive_dest(raw, root, day, archive_root), raw.mtime, taken)
+                    taken.add(same_path_key(dest))
+                    act("archived", raw, str(dest))
+                    if dry_run:
+                        bytes_after += raw.bytes
+                    elif raw.path.endswith(".gz"):
+                        dest.parent.mkdir(parents=True, exist_ok=True)
+                        os.replace(raw.path, dest)
+                        entry.update(state="archived", path=str(dest), stored_bytes=raw.bytes)
+                        bytes_after += raw.bytes
+                    else:
+                        stored = _gzip_to(raw.path, dest, raw.mtime)
+                        entry.update(state="archived", path=str(dest), stored_bytes=stored)
+                        bytes_after += stored
+                else:
+                    dest = _free_dest(Path(raw.path + ".gz"), raw.mtime, taken)
+                    taken.add(same_path_key(dest))
+                    act("compressed", raw, str(dest))
+                    if dry_run:
+                        bytes_after += raw.bytes
+                    else:
+                        stored = _gzip_to(raw.path, dest, raw.mtime)
+                        entry.update(state="compressed", path=str(dest), stored_bytes=stored)
+                        bytes_after += stored
+
+                if not dry_run:
+                    entry["updated_at"] = _iso_z(now)
+                    manifest[entry["id"]] = entry
+            except Exception as e:
+                errors.append(f"{raw.path}: {e}")
+                print(f"[lifecycle] failed on {raw.path}: {e}")
+
+    # --------- Archive (via the manifest) ---------
+    for entry in list(manifest.values()):
+        if entry["state"] != "archived" or not entry.get("mtime"):
+            continue
+        mtime = datetime.fromisoformat(entry["mtime"].replace("Z", "+00:00"))
+        if mtime >= delete_cutoff:
+            continue
+        raw = RawFile(path=entry["path"], bytes=entry.get("stored_bytes") or 0, mtime=mtime)
+        act("deleted", raw)
+        if dry_run:
+            continue
+        try:
+            os.unlink(raw.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            errors.append(f"{raw.path}: {e}")
+            print(f"[lifecycle] failed on {raw.path}: {e}")
+            continue
+        entry.update(state="deleted", path=None, stored_bytes=0, updated_at=_iso_z(now))
+
+    written = None
+    if not dry_run and any(counts[k] for k in ("compressed", "archived", "deleted")):
+        written = str(write_manifest(manifest, archive_root))
+
+    result = {
+        "dry_run": dry_run,
+        **counts,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "bytes_reclaimed": bytes_before - bytes_after,
+        "manifest_path": written or str(manifest_path(archive_root)),
+        "manifest_entries": len(manifest),
+        "errors": errors,
+        "actions": actions,
+    }
+    print(
+        f"[lifecycle] done: scanned={counts['scanned']} kept={counts['kept']} "
+        f"compressed={counts['compressed']} archived={counts['archived']} deleted={counts['deleted']} "
+        f"bytes_reclaimed={result['bytes_reclaimed']} errors={len(errors)}"
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compress, archive and delete raw files by age")
+
+    parser.add_argument("--root", action="append", default=None, help=f"Raw root (repeatable, default {list(RAW_ROOTS)})")
+    parser.add_argument("--archive-root", default=ARCHIVE_ROOT)
+    parser.add_argument("--compress-after-days", type=int, default=DEFAULT_COMPRESS_AFTER_DAYS)
+    parser.add_argument("--archive-after-days", type=int, default=DEFAULT_ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--delete-after-days", type=int, default=DEFAULT_DELETE_AFTER_DAYS)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    run_lifecycle(
+        roots=args.root or RAW_ROOTS,
+        archive_root=args.archive_root,
+        compress_after_days=args.compress_after_days,
+        archive_after_days=args.archive_after_days,
+        delete_after_days=args.delete_after_days,
+        dry_run=args.dry_run,
+    )
+
+
+if __name__ == "__main__":
+    main()
+
+# Usage:
+#   python -m src.ingestion.raw_lifecycle --dry-run
+#   python -m src.ingestion.raw_lifecycle --compress-after-days 2 --archive-after-days 14 --delete-after-days 180
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from src.common.instrumentation import stage, with_stages
+from src.ingestion.raw_lifecycle import ARCHIVE_ROOT, archived_files, same_path_key
+from src.storage import load_ledger
+from src.storage.backend import get_backend
+from src.storage.bq_loader import BRONZE_SCHEMA, submit_jsonl_load
+from src.storage.bq_silver import submit_silver_merge
+from src.storage.bq_telemetry import collect_job_stats, summarize_job_stats
+from src.utils.file_utils import open_text
+
+
+# Raw JSONL under data/raw already holds validated bronze rows, so bronze can be
+# rebuilt from disk without calling the API. Spooled micro-batch pulls are left
+# out (the next flush loads them), and so are replay's own concatenated batches.
+# Archived files are found through the lifecycle manifest instead of the walk.
+RAW_ROOT = "data/raw"
+DEFAULT_PATTERNS = ("**/*.jsonl", "**/*.jsonl.gz")
+EXCLUDED_DIRS = ("spool", "replay", "archive")
+REPLAY_BATCH_DIR = "data/raw/replay"
+
+MAX_ERRORS_PER_FILE = 10
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+# --------- Discovery ---------
+
+def _first_row(path: Path) -> dict | None:
+    with open_text(path) as f:
+        for line in f:
+            if line.strip():
+                return json.loads(line)
+    return None
+
+
+def discover_raw_files(
+    *,
+    roots: list[str] | tuple[str, ...] = (RAW_ROOT,),
+    patterns: list[str] | tuple[str, ...] = DEFAULT_PATTERNS,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    archive_root: str | None = ARCHIVE_ROOT,
+) -> list[Path]:
+    """
+    Raw files matching any glob pattern under roots, oldest snapshot first.
+
+    from_date/to_date (inclusive) filter on the snapshot_ts of each file's first
+    row, i.e. the day the rows were pulled. Archived files listed in the
+    manifest under archive_root are included (None leaves them out); a file
+    both listed and found under a root is returned once, however its path is
+    spelled (the manifest may hold absolute paths).
+    """
+    found: dict[Path, datetime | None] = {}
+    seen: set[str] = set()
+    if archive_root is not None:
+        for entry in archived_files(archive_root, from_date=from_date, to_date=to_date):
+            if os.path.exists(entry["path"]):
+                found[Path(entry["path"])] = _parse_ts(entry["snapshot_from"])
+                seen.add(same_path_key(entry["path"]))
+
+    for root in roots:
+        for pattern in patterns:
+            for path in Path(root).glob(pattern):
+                if not path.is_file() or path.stat().st_size == 0:
+                    continue
+                if any(part in EXCLUDED_DIRS for part in path.parts) or same_path_key(path) in seen:
+                    continue
+                seen.add(same_path_key(path))
+
+                first = _first_row(path)
+                snapshot_ts = _parse_ts(first["snapshot_ts"]) if first and first.get("snapshot_ts") else None
+                if from_date or to_date:
+                    if snapshot_ts is None:
+                        continue
+                    if from_date and snapshot_ts.date() < from_date:
+                        continue
+                    if to_date and snapshot_ts.date() > to_date:
+                        continue
+                found[path] = snapshot_ts
+
+    epoch = datetime.min.replace(tzinfo=timezone.utc)
+    return sorted(found, key=lambda p: (found[p] or epoch, str(p)))
+
+
+# --------- Validation ---------
+
+def _type_ok(field_type: str, value) -> bool:
+    if field_type == "STRING":
+        return isinstance(value, str)
+    if field_type == "TIMESTAMP":
+        if not isinstance(value, str):
+            return False
+        try:
+            _parse_ts(value)
+        except ValueError:
+            return False
+        return True
+    if field_type == "FLOAT64":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if field_type == "INT64":
+        return isinstance(value, int) and not isinstance(value, bool)
+    return True
+
+
+def validate_raw_file(path: str | Path) -> dict:
+    """
+    Check every row of a raw file against the bronze load schema.
+
+    Catches what the load job would reject (unknown columns, missing REQUIRED
+    values, wrong types) before anything is submitted.
+    """
+    fields = {f.name: f for f in BRONZE_SCHEMA}
+    required = [f.name for f in BRONZE_SCHEMA if f.mode == "REQUIRED"]
+
+    rows = 0
+    snapshot_ids: set[str] = set()
+    errors: list[str] = []
+
+    with open_text(path) as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            rows += 1
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                errors.append(f"line {line_no}: invalid JSON ({e.msg})")
+                continue
+
+            unknown = sorted(set(row) - set(fields))
+            if unknown:
+                errors.append(f"line {line_no}: unknown columns {unknown}")
+            for name in required:
+                if row.get(name) is None:
+                    errors.append(f"line {line_no}: missing required {name}")
+            for name, value in row.items():
+                if value is not None and name in fields and not _type_ok(fields[name].field_type, value):
+                    errors.append(f"line {line_no}: {name}={value!r} is not {fields[name].field_type}")
+
+            if row.get("snapshot_id"):
+                snapshot_ids.add(row["snapshot_id"])
+            if len(errors) >= MAX_ERRORS_PER_FILE:
+                break
+
+    return {
+        "path": str(path),
+        "rows": rows,
+        "snapshot_ids": sorted(snapshot_ids),
+        "valid": not errors,
+        "errors": errors,
+    }
+
+
+# --------- Replay ---------
+
+def _concat(paths: list[Path], batch_dir: str) -> Path:
+    Path(batch_dir).mkdir(parents=True, exist_ok=True)
+    batch_path = Path(batch_dir) / f"replay_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.jsonl"
+    with open(batch_path, "w", encoding="utf-8") as out:
+        for path in paths:
+            with open_text(path) as src:
+                for line in src:
+                    if line.strip():
+                        out.write(line if line.endswith("\n") else line + "\n")
+    return batch_path
+
+
+@with_stages
+def replay_files(
+    files: list[Path],
+    *,
+    backend: str | None = None,
+    single_load: bool = False,
+    run_silver_merge_flag: bool = True,
+    skip_invalid: bool = False,
+    dry_run: bool = False,
+    force: bool = False,
+    batch_dir: str = REPLAY_BATCH_DIR,
+) -> dict:
+    """
+    Validate raw files, load them into bronze and merge their snapshots.
+
+    On BigQuery every file is its own load job, all submitted at once and run
+    in parallel; single_load concatenates them into one file and one load job
+    instead. Either way one batched silver MERGE over every replayed snapshot
+    follows the loads. Files the load ledger has already seen, and files with
+    the same rows as one before them, are skipped; force reloads the former
+    (bronze was lost or rebuilt). Each load is recorded in the ledger as soon
+    as it succeeds, before the merge.
+    """
+    with stage("validate") as s:
+        checks = [validate_raw_file(path) for path in files]
+        s.add(rows=sum(c["rows"] for c in checks))
+    invalid = [c for c in checks if not c["valid"]]
+    for check in invalid:
+        print(f"[replay] INVALID {check['path']}: {check['errors'][:3]}")
+    if invalid and not skip_invalid:
+        raise RuntimeError(f"{len(invalid)} raw file(s) do not match the bronze schema; pass skip_invalid to load the rest")
+
+    valid = [c for c in checks if c["valid"]]
+    snapshot_ids = sorted({sid for c in valid for sid in c["snapshot_ids"]})
+    result = {
+        "command": "replay",
+        "files": [c["path"] for c in valid],
+        "invalid_files": invalid,
+        "rows_in_files": sum(c["rows"] for c in valid),
+        "snapshot_ids": snapshot_ids,
+        "rows_loaded": 0,
+        "loaded_to_bq": False,
+        "silver_merge_ran": False,
+        "silver_merge_job_id": None,
+        "bq_jobs": [],
+    }
+    if dry_run or not valid:
+        return {**result, "message": "[replay] validated only" if dry_run else "[replay] nothing to load"}
+
+    warehouse = get_backend(backend)
+    silver_job_id = None
+
+    # Files whose rows are already in bronze are skipped unless force (e.g. the
+    # table was lost); their rows live under the snapshots the ledger recorded.
+    # A file with the same rows as one earlier in this replay is skipped too.
+    pending: list[tuple[Path, dict]] = []
+    skipped: list[str] = []
+    seen: set[str] = set()
+    bronze_snapshots: set[str] = set()
+    for check in valid:
+        file_hash = load_ledger.content_hash(check["path"])
+        prior = None if force else load_ledger.lookup(file_hash, warehouse)
+        if prior is not None or file_hash["content_hash"] in seen:
+            skipped.append(check["path"])
+            bronze_snapshots |= set(prior["snapshot_ids"]) if prior is not None else set()
+            continue
+        seen.add(file_hash["content_hash"])
+        bronze_snapshots |= set(file_hash["snapshot_ids"])
+        pending.append((Path(check["path"]), file_hash))
+    snapshot_ids = sorted(bronze_snapshots)
+    run_merge = run_silver_merge_flag and bool(snapshot_ids)
+
+    # (file to load, the raw files it holds): one per file, or one concatenated batch
+    loads = [(path, [(path, file_hash)]) for path, file_hash in pending]
+    if single_load and len(pending) > 1:
+        loads = [(_concat([path for path, _ in pending], batch_dir), pending)]
+    paths = [path for path, _ in loads]
+
+    def record(covered: list[tuple[Path, dict]], load_job_id: str | None) -> None:
+        # right after the load, so a failed merge cannot make a retry load the rows again
+        for path, file_hash in covered:
+            load_ledger.record(file_hash, warehouse, path=path, load_job_id=load_job_id)
+
+    rows_loaded = 0
+    if warehouse.name == "bigquery":
+        load_handles = [submit_jsonl_load(path) for path in paths]
+        merge_handle = None
+        if run_merge:
+            merge_handle = submit_silver_merge(snapshot_ids=snapshot_ids, depends_on=load_handles)
+
+        with stage("load") as s:
+            first_error: BaseException | None = None
+            for (_, covered), handle in zip(loads, load_handles):
+                try:
+                    job = handle.wait()
+                except Exception as e:
+                    first_error = first_error or e
+                    continue
+                record(covered, job.job_id)
+                rows_loaded += job.output_rows or 0
+            s.add(rows=rows_loaded)
+        if first_error is not None:
+            raise first_error
+        if merge_handle is not None:
+            with stage("merge"):
+                silver_job_id = merge_handle.wait().job_id
+
+        handles = load_handles + ([merge_handle] if merge_handle is not None else [])
+        bq_jobs = [h.stats() for h in handles]
+    else:
+        with collect_job_stats() as bq_jobs:
+            with stage("load") as s:
+                for path, covered in loads:
+                    with collect_job_stats() as load_jobs:
+                        rows_loaded += warehouse.load_jsonl(path) or 0
+                    record(covered, next((j["job_id"] for j in load_jobs if j["kind"] == "load"), None))
+                s.add(rows=rows_loaded)
+            if run_merge:
+                with stage("merge"):
+                    silver_job_id = warehouse.merge_silver(snapshot_ids=snapshot_ids)
+
+    print(
+        f"[replay] files={len(valid)} skipped={len(skipped)} load_jobs={len(paths)} rows_loaded={rows_loaded} "
+        f"snapshots={len(snapshot_ids)} silver_merge_job_id={silver_job_id}"
+    )
+
+    return {
+        **result,
+        "rows_loaded": rows_loaded,
+        "skipped_files": skipped,
+        "snapshot_ids": snapshot_ids,
+        "loaded_to_bq": bool(paths),
+        "silver_merge_ran": run_merge,
+        "silver_merge_job_id": silver_job_id,
+        "backend": warehouse.name,
+        "bq_jobs": bq_jobs,
+        **summarize_job_stats(bq_jobs),
+        "message": "Replay completed successfully",
+    }
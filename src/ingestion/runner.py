@@ -1,17 +1,33 @@
+import contextvars
 import os
+import time
 import argparse
 from pathlib import Path
 import json
 import requests
-from datetime import datetime, timezone, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timezone, timedelta
 
 from dotenv import load_dotenv
 
 from src.ingestion.socrata_models import TrafficIncidentRow
 from src.ingestion.mappers import IngestionMeta, to_bronze_row
-from src.utils.time_utils import month_bounds
-from src.storage.bq_loader import load_jsonl_to_bq
-from src.storage.bq_silver import run_silver_merge
+from src.ingestion.planning import PullPlan, plan_window
+from src.ingestion.raw_lifecycle import ARCHIVE_ROOT
+from src.ingestion.replay import RAW_ROOT, DEFAULT_PATTERNS, discover_raw_files, replay_files
+from src.utils.file_utils import file_lock
+from src.utils.time_utils import month_bounds, month_range
+from src.common.instrumentation import stage, with_stages
+from src.common.profiling import profile_prefix, profile_run
+from src.storage.bq_loader import submit_jsonl_load
+from src.storage.bq_silver import submit_silver_merge
+from src.storage.backend import BACKENDS, get_backend
+from src.storage.bq_jobs import wait_all
+from src.storage.bq_telemetry import collect_job_stats, summarize_job_stats
+from src.storage.bq_control import record_best_effort, record_job_stats, record_pipeline_run
+from src.storage import load_ledger
+from src.storage.load_ledger import load_once
 from src.utils.make_snapshot_id import make_snapshot_id
 from src.common.exceptions import require_env
 
@@ -22,6 +38,7 @@ APP_TOKEN = require_env("APP_TOKEN")
 
 STATE_DIR = 'state'
 WATERMARK_PATH = os.path.join(STATE_DIR, "watermark.json")
+CHECKPOINT_SUBDIR = "checkpoints"
 
 # Overlap window for incremental pulls when using >= since
 WATERMARK_OVERLAP_MINUTES = 5
@@ -40,11 +57,24 @@ def parse_args() -> argparse.Namespace:
     incremental = sub.add_parser('pull')
 
     incremental.add_argument('--since', required=False, help='ISO datetime... (optional if watermark exists)')
+    incremental.add_argument('--until', required=False, help='ISO datetime, exclusive upper bound on :updated_at (optional)')
+    incremental.add_argument('--no-update-watermark', dest='update_watermark', action='store_false',
+                             help='do not advance state/watermark.json after the run')
     incremental.add_argument('--page-size', type=int, required=True)
-    incremental.add_argument('--max-pages', type=int, required=True)
+    incremental.add_argument('--max-pages', type=int, default=None, help='hard page cap (required unless --exhaustive)')
+    incremental.add_argument('--exhaustive', action='store_true', help='page until the source is exhausted, within the budget flags')
+    incremental.add_argument('--max-seconds', type=float, default=None, help='pull budget: wall-clock seconds')
+    incremental.add_argument('--max-rows', type=int, default=None, help='pull budget: rows written')
+    incremental.add_argument('--max-bytes', type=int, default=None, help='pull budget: bytes written')
+    incremental.add_argument('--plan', action='store_true', help='count the window by day first and size the pull from it (page size, parallel day slices)')
     incremental.add_argument('--out', required=True)
+    incremental.add_argument('--profile', action='store_true', help='cProfile the run; writes .prof and .collapsed next to the output')
+    incremental.add_argument('--profile-stage', default=None, help='profile only this stage, e.g. validate, map, serialize, http (implies --profile)')
     incremental.add_argument('--load-to-bq', action="store_true")
     incremental.add_argument('--run-silver-merge', action='store_true')
+    incremental.add_argument('--record-job-stats', action='store_true', help='write BigQuery job stats to traffic_control')
+    incremental.add_argument('--record-run-stats', action='store_true', help='write the run-stats record to traffic_control')
+    incremental.add_argument('--backend', choices=BACKENDS, default=None, help='warehouse backend (default: WAREHOUSE_BACKEND or bigquery)')
 
     
     # Backfill pulls
@@ -52,12 +82,63 @@ def parse_args() -> argparse.Namespace:
 
     backfill.add_argument('--month', required=True, help='YYYY-MM, e.g. 2025-12')
     backfill.add_argument('--page-size', type=int, required=True)
-    backfill.add_argument('--max-pages', type=int, required=True)
+    backfill.add_argument('--max-pages', type=int, default=None, help='hard page cap (required unless --exhaustive)')
+    backfill.add_argument('--exhaustive', action='store_true', help='page until the source is exhausted, within the budget flags')
+    backfill.add_argument('--max-seconds', type=float, default=None, help='pull budget: wall-clock seconds')
+    backfill.add_argument('--max-rows', type=int, default=None, help='pull budget: rows written')
+    backfill.add_argument('--max-bytes', type=int, default=None, help='pull budget: bytes written')
+    backfill.add_argument('--plan', action='store_true', help='count the window by day first and size the pull from it (page size, parallel day slices)')
     backfill.add_argument('--out', required=True)
+    backfill.add_argument('--profile', action='store_true', help='cProfile the run; writes .prof and .collapsed next to the output')
+    backfill.add_argument('--profile-stage', default=None, help='profile only this stage, e.g. validate, map, serialize, http (implies --profile)')
     backfill.add_argument('--load-to-bq', action="store_true")
     backfill.add_argument('--run-silver-merge', action='store_true')
-
-    return parser.parse_args()
+    backfill.add_argument('--record-job-stats', action='store_true', help='write BigQuery job stats to traffic_control')
+    backfill.add_argument('--record-run-stats', action='store_true', help='write the run-stats record to traffic_control')
+    backfill.add_argument('--backend', choices=BACKENDS, default=None, help='warehouse backend (default: WAREHOUSE_BACKEND or bigquery)')
+
+    # Multi-month backfill: keeps pulling while earlier months load
+    backfill_range = sub.add_parser('backfill-range')
+
+    backfill_range.add_argument('--from-month', required=True, help='YYYY-MM (inclusive)')
+    backfill_range.add_argument('--to-month', required=True, help='YYYY-MM (inclusive)')
+    backfill_range.add_argument('--page-size', type=int, required=True)
+    backfill_range.add_argument('--max-pages', type=int, default=None, help='hard page cap (required unless --exhaustive)')
+    backfill_range.add_argument('--exhaustive', action='store_true', help='page until the source is exhausted, within the budget flags')
+    backfill_range.add_argument('--max-seconds', type=float, default=None, help='pull budget: wall-clock seconds')
+    backfill_range.add_argument('--max-rows', type=int, default=None, help='pull budget: rows written')
+    backfill_range.add_argument('--max-bytes', type=int, default=None, help='pull budget: bytes written')
+    backfill_range.add_argument('--plan', action='store_true', help='count the window by day first and size the pull from it (page size, parallel day slices)')
+    backfill_range.add_argument('--out-dir', required=True)
+    backfill_range.add_argument('--profile', action='store_true', help='cProfile the run; writes .prof and .collapsed next to the output')
+    backfill_range.add_argument('--profile-stage', default=None, help='profile only this stage, e.g. validate, map, serialize, http (implies --profile)')
+    backfill_range.add_argument('--load-to-bq', action="store_true")
+    backfill_range.add_argument('--run-silver-merge', action='store_true')
+    backfill_range.add_argument('--record-job-stats', action='store_true', help='write BigQuery job stats to traffic_control')
+    backfill_range.add_argument('--record-run-stats', action='store_true', help='write the run-stats record to traffic_control')
+
+    # Replay: reload raw files into bronze without calling the API
+    replay = sub.add_parser('replay')
+
+    replay.add_argument('--root', dest='roots', action='append', help='directory to search (repeatable, default data/raw)')
+    replay.add_argument('--glob', dest='patterns', action='append', help='glob under each root (repeatable, default **/*.jsonl and **/*.jsonl.gz)')
+    replay.add_argument('--archive-root', default=ARCHIVE_ROOT, help='also replay archived files listed in this manifest')
+    replay.add_argument('--no-archive', dest='archive_root', action='store_const', const=None, help='skip archived files')
+    replay.add_argument('--from-date', type=date.fromisoformat, default=None, help='YYYY-MM-DD, first snapshot day (inclusive)')
+    replay.add_argument('--to-date', type=date.fromisoformat, default=None, help='YYYY-MM-DD, last snapshot day (inclusive)')
+    replay.add_argument('--single-load', action='store_true', help='concatenate the files into one load job')
+    replay.add_argument('--run-silver-merge', action='store_true')
+    replay.add_argument('--skip-invalid', action='store_true', help='load the valid files even if some fail schema checks')
+    replay.add_argument('--dry-run', action='store_true', help='discover and validate only')
+    replay.add_argument('--force', action='store_true', help='reload files the load ledger has already seen (bronze was lost)')
+    replay.add_argument('--backend', choices=BACKENDS, default=None, help='warehouse backend (default: WAREHOUSE_BACKEND or bigquery)')
+
+    args = parser.parse_args()
+    if args.command == 'replay':
+        return args
+    if args.max_pages is None and not args.exhaustive:
+        parser.error("--max-pages is required unless --exhaustive is set")
+    return args
 
 
 # -----------------------------------------------------
@@ -104,69 +185,222 @@ def read_watermark() -> datetime | None:
     except FileNotFoundError:
         return None
     
-def write_watermark(dt: datetime) -> None:
-    """Persist last_source_updated_at in UTC ISO 'Z' format."""
+def advance_watermark(dt: datetime) -> bool:
+    """
+    Write dt only if it is newer than the stored watermark (never moves it back).
+
+    Partitioned runs for older windows can finish after newer ones, in other
+    processes: the read, compare and write happen under an exclusive lock on
+    watermark.json.lock, and the write goes through a temp file + os.replace
+    so readers never see a half-written file.
+    """
     _ensure_state_dir()
-    payload = {"last_source_updated_at": _iso_z(dt)}
-    with open(WATERMARK_PATH, 'w', encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+    with file_lock(f"{WATERMARK_PATH}.lock"):
+        stored = read_watermark()
+        if stored is not None and dt <= stored:
+            return False
+
+        tmp_path = f"{WATERMARK_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding="utf-8") as f:
+            json.dump({"last_source_updated_at": _iso_z(dt)}, f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, WATERMARK_PATH)
+    return True
+
+
+# Checkpoints record where a truncated run stopped, keyed by its window
+# (backfill month, pull until-bound, or "pull_open" for open-ended pulls). The
+# next run over the same window resumes from there; a run that exhausts the
+# window clears it. Pulls (ordered by :updated_at) and backfills (ordered by
+# start_dt) both resume from the window field of the last row seen.
+
+def _checkpoint_path(key: str) -> str:
+    return os.path.join(STATE_DIR, CHECKPOINT_SUBDIR, f"{key}.json")
+
+
+def read_checkpoint(key: str) -> dict | None:
+    path = _checkpoint_path(key)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_checkpoint(key: str, data: dict) -> None:
+    path = _checkpoint_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
         f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def clear_checkpoint(key: str) -> None:
+    try:
+        os.remove(_checkpoint_path(key))
+    except FileNotFoundError:
+        pass
+
+
+def _resume_out_path(out: str | Path) -> str:
+    """
+    <out>.resume<N>.jsonl for a run resuming from a checkpoint, N the first
+    number not taken (also as .gz): the stopped run's file holds loaded rows
+    that replay needs, so the resumed run must not overwrite it.
+    """
+    out = str(out)
+    base = out[: -len(".jsonl")] if out.endswith(".jsonl") else out
+    n = 1
+    while os.path.exists(f"{base}.resume{n}.jsonl") or os.path.exists(f"{base}.resume{n}.jsonl.gz"):
+        n += 1
+    return f"{base}.resume{n}.jsonl"
+
+
+def _pull_checkpoint_key(until: datetime | None) -> str:
+    if until is None:
+        return "pull_open"
+    return f"pull_until_{until.strftime('%Y%m%dT%H%M%SZ')}"
+
+
+def _backfill_checkpoint_key(month: str) -> str:
+    return f"backfill_{month}"
+
+@dataclass
+class PullStats:
+    """What a pull wrote; also the run-stats record loaded into traffic_control."""
+    pages: int = 0
+    rows_written: int = 0
+    distinct_incidents: int = 0
+    min_source_updated_at: datetime | None = None
+    max_source_updated_at: datetime | None = None
+    bytes_written: int = 0
+    stop_reason: str = "exhausted"  # exhausted | max_pages | time_budget | row_budget | byte_budget
+    resume_from: datetime | None = None  # when the run stopped early: earliest window point not fully pulled
+
+    @property
+    def truncated(self) -> bool:
+        return self.stop_reason != "exhausted"
+
+
+@dataclass(frozen=True)
+class PullBudget:
+    """Limits for an exhaustive pull, checked between pages; None means unlimited."""
+    max_seconds: float | None = None
+    max_rows: int | None = None
+    max_bytes: int | None = None
+
+    def exceeded(self, *, elapsed_s: float, rows: int, bytes_written: int) -> str | None:
+        if self.max_seconds is not None and elapsed_s >= self.max_seconds:
+            return "time_budget"
+        if self.max_rows is not None and rows >= self.max_rows:
+            return "row_budget"
+        if self.max_bytes is not None and bytes_written >= self.max_bytes:
+            return "byte_budget"
+        return None
+
+
+def post_query(soql: str, *, page_number: int, page_size: int, headers: dict | None = None) -> list[dict]:
+    """POST one page of a SoQL query and return its rows."""
+    body = {
+        "query": soql,
+        "page": {"pageNumber": page_number, "pageSize": page_size},
+    }
+
+    with stage("http") as s:
+        response = requests.post(API_BASE_URL, headers=headers or _build_headers(), json=body, timeout=30)
+        if s.active:
+            s.add(bytes=len(response.content))
+    if response.status_code >= 400:
+        print("STATUS:", response.status_code)
+        print("RESPONSE:", response.text)
+        print("SOQL:", soql)
+        print("BODY:", json.dumps(body, indent=2))
+
+    response.raise_for_status()
+
+    with stage("json_decode") as s:
+        payload = response.json()
+        s.add(rows=len(payload.get("data", ())) if isinstance(payload, dict) else len(payload))
+
+    if isinstance(payload, dict) and "data" in payload:
+        return payload['data']
+    if isinstance(payload, list):
+        return payload
+    raise ValueError(
+        f"Unexpected response shape: {type(payload)} keys={getattr(payload, 'keys', lambda: [])()}"
+    )
+
 
 def _pull_pages_to_ndjson(
         *,
         soql: str,
         page_size: int,
-        max_pages: int,
+        max_pages: int | None,
         meta: IngestionMeta,
         out_path: str,
-) -> tuple[datetime | None, int]:
-    
+        budget: PullBudget | None = None,
+        started_at: float | None = None,
+        resume_column: str | None = None,
+) -> PullStats:
+    """
+    Page through soql into out_path.
+
+    max_pages=None pages until the source is exhausted, bounded by budget
+    (its clock starts at started_at, a time.monotonic() value, if given).
+    stop_reason says why the pull ended; anything but "exhausted" means the
+    window has more rows. soql must be ordered by the window field first;
+    resume_column is that field's bronze column, and resume_from is its value
+    on the last row written, where a resumed window restarts (inclusive).
+    """
     headers = _build_headers()
 
     page_count = 0
 
     total_rows = 0
     distinct_incidents: set[str] = set()
+    min_source_updated_at: datetime | None = None
     max_source_updated_at: datetime | None = None
 
 
     out_dir = os.path.dirname(out_path) or "."
     os.makedirs(out_dir, exist_ok=True)
 
+    started = time.monotonic() if started_at is None else started_at
+    stop_reason = "exhausted"
+    page_number = 1
+    last_resume_value = None
+    # Rows in a full page. The API may cap pageSize below ours, so a short
+    # first page only tells us the cap; the next page shows whether it was the end.
+    full_page: int | None = None
+
     with open(out_path, 'w', encoding='utf-8') as f:
-        while page_count < max_pages:
-            body = {
-                "query": soql,
-                "page": {"pageNumber": page_count + 1, "pageSize": page_size},
-            }
-
-            response = requests.post(API_BASE_URL, headers=headers, json=body, timeout=30)
-            if response.status_code >= 400:
-                print("STATUS:", response.status_code)
-                print("RESPONSE:", response.text)
-                print("SOQL:", soql)
-                print("BODY:", json.dumps(body, indent=2))
-
-            response.raise_for_status()
-
-            payload = response.json()
-
-            if isinstance(payload, dict) and "data" in payload:
-                rows = payload['data']
-            elif isinstance(payload, list):
-                rows = payload
-            else:
-                raise ValueError(
-                    f"Unexpected response shape: {type(payload)} keys={getattr(payload, 'keys', lambda: [])()}"
+        while True:
+            if max_pages is not None and page_count >= max_pages:
+                stop_reason = "max_pages"
+                break
+            if budget is not None:
+                over = budget.exceeded(
+                    elapsed_s=time.monotonic() - started,
+                    rows=total_rows,
+                    bytes_written=f.tell(),
                 )
-            
+                if over:
+                    stop_reason = over
+                    break
+
+            rows = post_query(soql, page_number=page_number, page_size=page_size, headers=headers)
+
             if not rows:
                 break
 
-            for raw_row in rows:
-                validated = TrafficIncidentRow.model_validate(raw_row)
-                bronze = to_bronze_row(meta, validated)
+            with stage("validate", rows=len(rows)):
+                validated_rows = [TrafficIncidentRow.model_validate(raw_row) for raw_row in rows]
 
+            with stage("map", rows=len(rows)):
+                bronze_rows = [to_bronze_row(meta, validated) for validated in validated_rows]
+
+            for bronze in bronze_rows:
                 total_rows += 1
 
                 incident_id = bronze.get("incident_id")
@@ -190,41 +424,218 @@ def _pull_pages_to_ndjson(
 
                     if max_source_updated_at is None or upd_dt > max_source_updated_at:
                         max_source_updated_at = upd_dt
+                    if min_source_updated_at is None or upd_dt < min_source_updated_at:
+                        min_source_updated_at = upd_dt
+
+            if resume_column is not None:
+                last_resume_value = bronze_rows[-1].get(resume_column) or last_resume_value
 
+            with stage("serialize", rows=len(rows)):
+                chunk = "".join(json.dumps(bronze, ensure_ascii=False) + "\n" for bronze in bronze_rows)
 
-                json.dump(bronze, f, ensure_ascii=False)
-                f.write('\n')
+            with stage("file_io", rows=len(rows)) as s:
+                before = f.tell()
+                f.write(chunk)
+                s.add(bytes=f.tell() - before)
             
             page_count += 1
+            page_number += 1
+
+            # A page shorter than a full one is the last; no need to ask for an empty page.
+            if full_page is not None and len(rows) < full_page:
+                break
+            if full_page is None:
+                full_page = len(rows)
+
+        bytes_written = f.tell()
     
     print("\n=== Pull Summary ===")
     print(f"Pages pulled:                       {page_count}")
     print(f"Rows written:                       {total_rows}")
     print(f"Distinct incident_id:               {len(distinct_incidents)}")
-
-    return max_source_updated_at, total_rows
+    resume_from = _to_utc(last_resume_value) if stop_reason != "exhausted" and last_resume_value else None
+    print(f"Stop reason:                        {stop_reason}")
+    if stop_reason != "exhausted":
+        print(f"WARNING: pull truncated ({stop_reason}); the window has more rows from {resume_from or 'its start'}")
+
+    return PullStats(
+        pages=page_count,
+        rows_written=total_rows,
+        distinct_incidents=len(distinct_incidents),
+        min_source_updated_at=min_source_updated_at,
+        max_source_updated_at=max_source_updated_at,
+        bytes_written=bytes_written,
+        stop_reason=stop_reason,
+        resume_from=resume_from,
+    )
 
 # -----------------------------------------------------
 # Entry Functions
 # -----------------------------------------------------
 
+# Window fields: pulls page by :updated_at (a system timestamp), backfills by
+# start_dt (a floating timestamp, no zone suffix). Both order by (field, :id),
+# so a stopped run has pulled every row before the field value of its last
+# row; it resumes from that value (>=), like the watermark overlap, and the
+# silver MERGE absorbs the re-pulled ties. The third entry is the bronze column
+# holding the field.
+WINDOW_FIELDS = {
+    ":updated_at": (_iso_z, "ORDER BY :updated_at ASC, :id ASC", "source_updated_at"),
+    "start_dt": (_iso_floating, "ORDER BY start_dt ASC, :id ASC", "start_ts"),
+}
+
+
+def window_where(field: str, start: datetime, end: datetime | None = None) -> str:
+    fmt, _, _ = WINDOW_FIELDS[field]
+    where = f"WHERE {field} >= '{fmt(start)}' "
+    if end is not None:
+        where += f"AND {field} < '{fmt(end)}' "
+    return where
+
+
+def incremental_where(since: datetime, until: datetime | None = None) -> str:
+    return window_where(":updated_at", since, until)
+
+
+def backfill_where(month: str, start: datetime | None = None) -> str:
+    # Backfill by EVENT TIME (start_dt) for that month
+    start_dt, end_dt = month_bounds(month)
+    return window_where("start_dt", max(start_dt, start) if start else start_dt, end_dt)
+
+
+def _pull_slices(
+        *,
+        field: str,
+        slices: list[tuple[datetime, datetime | None]],
+        page_size: int,
+        meta: IngestionMeta,
+        out_path: str,
+        workers: int,
+        budget: PullBudget | None = None,
+) -> PullStats:
+    """
+    Pull contiguous sub-windows of one window in parallel, then stitch the part
+    files into out_path in window order (one snapshot, one file).
+
+    The time budget is shared wall-clock; row/byte budgets are split evenly
+    across slices. If any slice is truncated, resume_from is the earliest point
+    not fully pulled, so a resumed run (or the watermark) never skips rows.
+    """
+    _, order_by, resume_column = WINDOW_FIELDS[field]
+    started_at = time.monotonic()
+    if budget is not None and len(slices) > 1:
+        n = len(slices)
+        budget = PullBudget(
+            max_seconds=budget.max_seconds,
+            max_rows=-(-budget.max_rows // n) if budget.max_rows is not None else None,
+            max_bytes=-(-budget.max_bytes // n) if budget.max_bytes is not None else None,
+        )
+
+    part_paths = [f"{out_path}.part{i:03d}" for i in range(len(slices))]
+
+    def pull_one(i: int) -> PullStats:
+        lo, hi = slices[i]
+        return _pull_pages_to_ndjson(
+            soql=_base_select() + window_where(field, lo, hi) + order_by,
+            page_size=page_size,
+            max_pages=None,
+            meta=meta,
+            out_path=part_paths[i],
+            budget=budget,
+            started_at=started_at,
+            resume_column=resume_column,
+        )
+
+    # each slice runs in a copy of this context, so its stages reach the run's collectors
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, pull_one, i) for i in range(len(slices))]
+        slice_stats = [f.result() for f in futures]
+
+    distinct_incidents: set[str] = set()
+    with stage("stitch") as stitch, open(out_path, 'w', encoding='utf-8') as out:
+        for part in part_paths:
+            with open(part, 'r', encoding='utf-8') as f:
+                for line in f:
+                    out.write(line)
+                    incident_id = json.loads(line).get("incident_id")
+                    if incident_id:
+                        distinct_incidents.add(str(incident_id))
+            os.remove(part)
+        bytes_written = out.tell()
+        stitch.add(rows=sum(st.rows_written for st in slice_stats), bytes=bytes_written)
+
+    mins = [st.min_source_updated_at for st in slice_stats if st.min_source_updated_at]
+    maxs = [st.max_source_updated_at for st in slice_stats if st.max_source_updated_at]
+    truncated = [(lo, st) for (lo, _), st in zip(slices, slice_stats) if st.truncated]
+
+    resume_from = None
+    if truncated:
+        lo, st = truncated[0]
+        resume_from = st.resume_from or lo
+
+    return PullStats(
+        pages=sum(st.pages for st in slice_stats),
+        rows_written=sum(st.rows_written for st in slice_stats),
+        distinct_incidents=len(distinct_incidents),
+        min_source_updated_at=min(mins) if mins else None,
+        max_source_updated_at=max(maxs) if maxs else None,
+        bytes_written=bytes_written,
+        stop_reason=truncated[0][1].stop_reason if truncated else "exhausted",
+        resume_from=resume_from,
+    )
+
+
+def _pull_window(
+        *,
+        field: str,
+        soql: str,
+        page_size: int,
+        max_pages: int | None,
+        meta: IngestionMeta,
+        out_path: str,
+        budget: PullBudget | None,
+        plan: PullPlan | None = None,
+) -> PullStats:
+    if plan is not None and len(plan.slices) > 1 and max_pages is None:
+        return _pull_slices(
+            field=field,
+            slices=plan.slices,
+            page_size=plan.page_size,
+            meta=meta,
+            out_path=out_path,
+            workers=plan.workers,
+            budget=budget,
+        )
+
+    return _pull_pages_to_ndjson(
+        soql=soql,
+        page_size=plan.page_size if plan is not None else page_size,
+        max_pages=max_pages,
+        meta=meta,
+        out_path=out_path,
+        budget=budget,
+        resume_column=WINDOW_FIELDS[field][2],
+    )
+
+
 def incremental(
         *,
         since: datetime,
+        until: datetime | None = None,
         page_size: int,
-        max_pages: int,
+        max_pages: int | None,
         out_path: str,
-) -> tuple[str, datetime | None, int]:
+        budget: PullBudget | None = None,
+        plan: PullPlan | None = None,
+) -> tuple[IngestionMeta, PullStats]:
     run_type = "daily"
     query_name = "incremental"
     snapshot_id = make_snapshot_id(run_type, query_name)
 
-    since_str = _iso_z(since)
-
     soql = (
         _base_select()
-        + f"WHERE :updated_at >= '{since_str}' "
-        + "ORDER BY :updated_at ASC, :id ASC"
+        + incremental_where(since, until)
+        + WINDOW_FIELDS[":updated_at"][1]
     )
 
     meta = IngestionMeta(
@@ -234,40 +645,39 @@ def incremental(
         query_name=query_name,
     )
 
-    new_max, rows_written = _pull_pages_to_ndjson(
+    stats = _pull_window(
+        field=":updated_at",
         soql=soql,
         page_size=page_size,
         max_pages=max_pages,
         meta=meta,
         out_path=out_path,
+        budget=budget,
+        plan=plan,
     )
     
-    return snapshot_id, new_max, rows_written
+    return meta, stats
 
 
 def backfill(
         *,
         month: str,
         page_size: int,
-        max_pages: int,
+        max_pages: int | None,
         out_path: str,
-) -> tuple[str, int]:
-    
+        budget: PullBudget | None = None,
+        start: datetime | None = None,
+        plan: PullPlan | None = None,
+) -> tuple[IngestionMeta, PullStats]:
+    """start narrows the month (resuming a stopped backfill)."""
     run_type = "monthly"
     query_name = "backfill"
     snapshot_id = make_snapshot_id(run_type, query_name)
 
-
-    start_dt, end_dt = month_bounds(month)
-    start_date = _iso_floating(start_dt)
-    end_date = _iso_floating(end_dt)
-
-
-    # Backfill by EVENT TIME (start_dt) for that month
     soql = (
         _base_select()
-        + f"WHERE start_dt >= '{start_date}' AND start_dt < '{end_date}' "
-        + "ORDER BY start_dt ASC, :id ASC"
+        + backfill_where(month, start)
+        + WINDOW_FIELDS["start_dt"][1]
     )
     meta = IngestionMeta(
         snapshot_id=snapshot_id,
@@ -276,28 +686,137 @@ def backfill(
         query_name=query_name,
     )
 
-    _, rows_written = _pull_pages_to_ndjson(
+    stats = _pull_window(
+        field="start_dt",
         soql=soql,
         page_size=page_size,
         max_pages=max_pages,
         meta=meta,
         out_path=out_path,
+        budget=budget,
+        plan=plan,
+    )
+
+    return meta, stats
+
+
+def _to_utc(value: str | datetime) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _run_info(meta: IngestionMeta, stats: PullStats) -> dict:
+    """Snapshot metadata + pull stats shared by every run result."""
+    return {
+        "snapshot_ts": _iso_z(meta.snapshot_ts),
+        "run_type": meta.run_type,
+        "query_name": meta.query_name,
+        "pages": stats.pages,
+        "distinct_incidents": stats.distinct_incidents,
+        "min_source_updated_at": _iso_z(stats.min_source_updated_at) if stats.min_source_updated_at else None,
+        "max_source_updated_at": _iso_z(stats.max_source_updated_at) if stats.max_source_updated_at else None,
+        "bytes_written": stats.bytes_written,
+        "stop_reason": stats.stop_reason,
+        "truncated": stats.truncated,
+        "resume_since": _iso_z(stats.resume_from) if stats.resume_from else None,
+    }
+
+
+def _update_checkpoint(key: str, snapshot_id: str, stats: PullStats) -> None:
+    """
+    Record where a truncated (and loaded) run stopped, or clear the window's checkpoint.
+
+    The next run over the window restarts at resume_since, the window field
+    value of the last row pulled (see WINDOW_FIELDS), never at a page number:
+    rows added or changed since would shift offset pages.
+    """
+    if not stats.truncated:
+        clear_checkpoint(key)
+        return
+    write_checkpoint(key, {
+        "snapshot_id": snapshot_id,
+        "stop_reason": stats.stop_reason,
+        "resume_since": _iso_z(stats.resume_from) if stats.resume_from else None,
+        "written_at": _iso_z(datetime.now(timezone.utc)),
+    })
+    print(f"[checkpoint] {key}: {stats.stop_reason}, resume since={stats.resume_from}")
+
+
+def _backfill_resume(checkpoint: dict | None) -> datetime | None:
+    """start_dt to resume a backfill month from, or None for the whole month."""
+    # older page-number checkpoints have no resume_since: redo the month
+    if checkpoint is None or not checkpoint.get("resume_since"):
+        return None
+    return _to_utc(checkpoint["resume_since"])
+
+
+def _plan_backfill(month: str, start_dt: datetime | None, page_size: int) -> PullPlan:
+    month_start, month_end = month_bounds(month)
+    return plan_window(
+        field_name="start_dt",
+        where=backfill_where(month, start_dt),
+        start=max(month_start, start_dt) if start_dt else month_start,
+        end=month_end,
+        max_page_size=page_size,
     )
 
-    return snapshot_id, rows_written
+
+def _plan_info(pull_plan: PullPlan | None, stats: PullStats) -> dict:
+    """Expected (planned) vs actual rows for the run result."""
+    if pull_plan is None:
+        return {"expected_rows": None, "rows_vs_expected": None, "plan": None}
+    return {
+        "expected_rows": pull_plan.expected_rows,
+        "rows_vs_expected": stats.rows_written - pull_plan.expected_rows,
+        "plan": pull_plan.as_dict(),
+    }
 
 
+@with_stages
 def run_pipeline(
     *,
     command: str,
     since: str | datetime | None = None,
+    until: str | datetime | None = None,
     month: str | None = None,
     page_size: int,
-    max_pages: int,
+    max_pages: int | None,
     out: str,
     load_to_bq: bool,
     run_silver_merge_flag: bool,
+    record_job_stats_flag: bool = False,
+    record_run_stats_flag: bool = False,
+    backend: str | None = None,
+    update_watermark: bool = True,
+    budget: PullBudget | None = None,
+    plan: bool = False,
 ) -> dict:
+    """
+    Pull one window to JSONL, then optionally load bronze and merge silver.
+
+    backend selects the warehouse ("bigquery" or the local "duckdb"); load_to_bq
+    and the loaded_to_bq result key refer to whichever backend is used.
+
+    pull windows are [since, until) on :updated_at (until optional). After a
+    loaded pull the watermark is advanced, never moved back, unless
+    update_watermark is False. A file whose rows are already in bronze (load
+    ledger) is not loaded again; load_skipped and load_job_id report the prior load.
+    snapshot_ids (and snapshot_ts, the earliest of them) name the bronze
+    snapshots holding the run's rows: this run's, or the prior load's when
+    skipped. Empty when nothing was loaded.
+
+    max_pages=None pulls until the window is exhausted, within budget. A
+    truncated run says so (truncated / stop_reason) and, once loaded, leaves a
+    checkpoint so the next run over the same window resumes where it stopped.
+    A resumed run writes <out>.resume<N>.jsonl, keeping the stopped run's file.
+
+    plan=True counts the window by day first (planning.plan_window) and lets
+    that size the pull: page size, and for exhaustive runs day slices pulled
+    in parallel. The result reports expected_rows next to rows_written.
+    """
     if not API_BASE_URL:
         raise RuntimeError("API_BASE_URL is empty. Set it in environment/.env")
 
@@ -310,18 +829,13 @@ def run_pipeline(
     rows_loaded: int = 0
     watermark_before: str | None = None
     watermark_after: str | None = None
+    pull_plan: PullPlan | None = None
+    checkpoint_key: str | None = None
+    resumed_from: dict | None = None
 
     if command == "pull":
         if since:
-            if isinstance(since, str):
-                since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
-            else:
-                since_dt = since
-
-            if since_dt.tzinfo is None:
-                since_dt = since_dt.replace(tzinfo=timezone.utc)
-            else:
-                since_dt = since_dt.astimezone(timezone.utc)
+            since_dt = _to_utc(since)
         else:
             stored_watermark = read_watermark()
             if stored_watermark is None:
@@ -329,35 +843,84 @@ def run_pipeline(
             
             since_dt = stored_watermark - timedelta(minutes=WATERMARK_OVERLAP_MINUTES)
         
+        until_dt = _to_utc(until) if until else None
+        checkpoint_key = _pull_checkpoint_key(until_dt)
+        resumed_from = read_checkpoint(checkpoint_key)
+        if resumed_from is not None:
+            out = _resume_out_path(out)
+        if resumed_from is not None and resumed_from.get("resume_since"):
+            resume_since = _to_utc(resumed_from["resume_since"])
+            # Bounded window: skip what the stopped run already loaded. Open-ended:
+            # reach back so an explicit --since does not leave a gap behind it.
+            since_dt = max(since_dt, resume_since) if until_dt is not None else min(since_dt, resume_since)
+
         watermark_before = _iso_z(since_dt)
 
-        snapshot_id, new_max, rows_written = incremental(
+        if plan:
+            pull_plan = plan_window(
+                field_name=":updated_at",
+                where=incremental_where(since_dt, until_dt),
+                start=since_dt,
+                end=until_dt,
+                max_page_size=page_size,
+            )
+
+        meta, stats = incremental(
             since=since_dt,
+            until=until_dt,
             page_size=page_size,
             max_pages=max_pages,
             out_path=out,
+            budget=budget,
+            plan=pull_plan,
         )
 
     elif command == "backfill":
         if not month:
             raise ValueError("backfill requires month in YYYY-MM format")
 
-        snapshot_id, rows_written = backfill(
+        checkpoint_key = _backfill_checkpoint_key(month)
+        resumed_from = read_checkpoint(checkpoint_key)
+        if resumed_from is not None:
+            out = _resume_out_path(out)
+        start_dt = _backfill_resume(resumed_from)
+
+        if plan:
+            pull_plan = _plan_backfill(month, start_dt, page_size)
+
+        meta, stats = backfill(
             month=month,
             page_size=page_size,
             max_pages=max_pages,
             out_path=out,
+            budget=budget,
+            start=start_dt,
+            plan=pull_plan,
         )
     
     else:
         raise ValueError(f"Unsupported command: {command}")
+
+    snapshot_id = meta.snapshot_id
+    rows_written = stats.rows_written
+    if command == "pull":
+        # a truncated sliced pull must not move the watermark past its gap
+        new_max = stats.resume_from or stats.max_source_updated_at
+    run_info = {
+        **_run_info(meta, stats),
+        **_plan_info(pull_plan, stats),
+        "resumed_from": resumed_from,
+    }
     
     out_path = Path(out)
     size = out_path.stat().st_size if out_path.exists() else 0
 
-    if command == "backfill" and size == 0:
+    if command == "backfill" and size == 0 and resumed_from is None:
         raise RuntimeError(f"Backfill returned no data: {out_path}")
     elif size == 0:
+        # A resumed window with nothing left is complete.
+        if checkpoint_key is not None:
+            clear_checkpoint(checkpoint_key)
         return {
             "command": command,
             "snapshot_id": snapshot_id,
@@ -369,6 +932,9 @@ def run_pipeline(
             "silver_merge_job_id": None,
             "loaded_to_bq": False,
             "silver_merge_ran": False,
+            "bq_jobs": [],
+            **run_info,
+            "snapshot_ids": [],
             "message": f"[bq] skipped load (no data): {out_path}"
         }
 
@@ -386,23 +952,54 @@ def run_pipeline(
             "silver_merge_job_id": None,
             "loaded_to_bq": False,
             "silver_merge_ran": False,
+            "bq_jobs": [],
+            **run_info,
+            "snapshot_ids": [],
             "message": f"[bq] skipped load (pull only): command={command} out={out_path}"
         }
     
-    rows = load_jsonl_to_bq(out_path)
-    rows_loaded = rows or 0
-
-    if run_silver_merge_flag:
-        if snapshot_id is None:
-            raise RuntimeError("snapshot_id was not set; cannot run silver merge")
-        
-        silver_job_id = run_silver_merge(snapshot_id)
-    
-    if command == "pull":
-        if new_max is not None:
-            write_watermark(new_max)
+    warehouse = get_backend(backend)
+
+    with collect_job_stats() as bq_jobs:
+        with stage("load") as s:
+            load = load_once(warehouse, out_path)
+            s.add(rows=load["rows_loaded"], bytes=size)
+        rows_loaded = load["rows_loaded"]
+
+        # Rows already in bronze are stored under the earlier snapshot(s); merge
+        # and report those (the earlier run may have stopped before its merge).
+        snapshot_ids = [snapshot_id]
+        snapshot_ts = run_info["snapshot_ts"]
+        if load["skipped"] and load["snapshot_ids"]:
+            snapshot_ids = load["snapshot_ids"]
+            snapshot_ts = load["snapshot_ts"] or snapshot_ts
+            snapshot_id = snapshot_ids[0] if len(snapshot_ids) == 1 else None
+
+        if run_silver_merge_flag:
+            with stage("merge"):
+                if len(snapshot_ids) > 1:
+                    silver_job_id = warehouse.merge_silver(snapshot_ids=snapshot_ids)
+                else:
+                    silver_job_id = warehouse.merge_silver(snapshot_ids[0])
+
+    # Data is in silver: move state on before any telemetry, so a failed control
+    # insert cannot make a retry re-pull (and re-load) an already loaded window.
+    if command == "pull" and update_watermark:
+        if new_max is not None and advance_watermark(new_max):
             watermark_after = _iso_z(new_max)
-    
+
+    if checkpoint_key is not None:
+        _update_checkpoint(checkpoint_key, meta.snapshot_id, stats)
+
+    if record_job_stats_flag:
+        record_best_effort(record_job_stats, bq_jobs, snapshot_id=snapshot_id, command=command)
+
+    if record_run_stats_flag and not load["skipped"]:
+        record_best_effort(
+            record_pipeline_run,
+            {**run_info, "snapshot_id": snapshot_id, "command": command, "rows_loaded": rows_loaded},
+        )
+
     return {
         "command": command,
         "snapshot_id": snapshot_id,
@@ -414,31 +1011,245 @@ def run_pipeline(
         "silver_merge_job_id": silver_job_id,
         "loaded_to_bq": True,
         "silver_merge_ran": bool(run_silver_merge_flag),
+        "backend": warehouse.name,
+        "load_skipped": load["skipped"],
+        "load_job_id": load["load_job_id"],
+        "content_hash": load["content_hash"],
+        "bq_jobs": bq_jobs,
+        **summarize_job_stats(bq_jobs),
+        **run_info,
+        "snapshot_ids": snapshot_ids,
+        "snapshot_ts": snapshot_ts,
         "message": "Pipeline completed successfully"
     }
 
+@with_stages
+def run_backfill_range(
+    *,
+    from_month: str,
+    to_month: str,
+    page_size: int,
+    max_pages: int | None,
+    out_dir: str,
+    load_to_bq: bool,
+    run_silver_merge_flag: bool,
+    record_job_stats_flag: bool = False,
+    record_run_stats_flag: bool = False,
+    budget: PullBudget | None = None,
+    plan: bool = False,
+) -> dict:
+    """
+    Backfill several months without blocking on BigQuery between them.
+
+    Each month's load is submitted as soon as its file is written and the next
+    month is fetched while it runs. One batched silver MERGE over all loaded
+    snapshots is submitted last and only waits for the loads.
+
+    max_pages, budget (per month), plan and checkpoints work as in run_pipeline.
+    """
+    if not API_BASE_URL:
+        raise RuntimeError("API_BASE_URL is empty. Set it in environment/.env")
+
+    if run_silver_merge_flag and not load_to_bq:
+        raise ValueError("--run-silver-merge requires --load-to-bq")
+
+    months = month_range(from_month, to_month)
+    month_results: list[dict] = []
+    month_stats: list[PullStats] = []
+    load_handles = []
+    pending_loads = []
+    snapshot_ids: list[str] = []
+    warehouse = get_backend("bigquery")
+
+    for month in months:
+        out_path = Path(out_dir) / f"backfill_{month}.jsonl"
+        resumed_from = read_checkpoint(_backfill_checkpoint_key(month))
+        if resumed_from is not None:
+            out_path = Path(_resume_out_path(out_path))
+        start_dt = _backfill_resume(resumed_from)
+        pull_plan = _plan_backfill(month, start_dt, page_size) if plan else None
+
+        meta, stats = backfill(
+            month=month,
+            page_size=page_size,
+            max_pages=max_pages,
+            out_path=str(out_path),
+            budget=budget,
+            start=start_dt,
+            plan=pull_plan,
+        )
+        snapshot_id = meta.snapshot_id
+        month_stats.append(stats)
+
+        entry = {
+            "month": month,
+            "snapshot_id": snapshot_id,
+            "rows_written": stats.rows_written,
+            "output_path": str(out_path),
+            "load_job_id": None,
+            "load_skipped": False,
+            "rows_loaded": 0,
+            **_run_info(meta, stats),
+            **_plan_info(pull_plan, stats),
+            "resumed_from": resumed_from,
+        }
+        month_results.append(entry)
+
+        if stats.rows_written == 0:
+            print(f"[bq] skipped load (no data): {out_path}")
+            continue
+
+        if not load_to_bq:
+            snapshot_ids.append(snapshot_id)
+            continue
+
+        file_hash = load_ledger.content_hash(out_path)
+        prior = load_ledger.lookup(file_hash, warehouse)
+        if prior is not None:
+            print(f"[ledger] skipped load, content already loaded: {out_path} job_id={prior['load_job_id']}")
+            entry.update(load_skipped=True, load_job_id=prior["load_job_id"])
+            snapshot_ids.extend(prior["snapshot_ids"])
+            continue
+
+        snapshot_ids.append(snapshot_id)
+        handle = submit_jsonl_load(out_path)
+        load_handles.append(handle)
+        pending_loads.append((entry, handle, file_hash))
+
+    merge_handle = None
+    if run_silver_merge_flag and snapshot_ids:
+        merge_handle = submit_silver_merge(snapshot_ids=snapshot_ids, depends_on=load_handles)
+
+    load_jobs = wait_all(load_handles)
+    for entry, handle, file_hash in pending_loads:
+        entry["load_job_id"] = handle.job_id
+        entry["rows_loaded"] = handle.job.output_rows or 0
+        load_ledger.record(file_hash, warehouse, path=entry["output_path"], load_job_id=handle.job_id)
+
+    silver_job_id = merge_handle.wait().job_id if merge_handle is not None else None
+
+    if load_to_bq:
+        for entry, stats in zip(month_results, month_stats):
+            _update_checkpoint(_backfill_checkpoint_key(entry["month"]), entry["snapshot_id"], stats)
+
+    if record_run_stats_flag:
+        for entry in month_results:
+            if entry["load_job_id"] is not None and not entry.get("load_skipped"):
+                record_best_effort(record_pipeline_run, {**entry, "command": "backfill-range"})
+
+    handles = load_handles + ([merge_handle] if merge_handle is not None else [])
+    bq_jobs = [h.stats() for h in handles]
+    if record_job_stats_flag:
+        record_best_effort(record_job_stats, bq_jobs, command="backfill-range")
+
+    return {
+        "command": "backfill-range",
+        "months": month_results,
+        "snapshot_ids": snapshot_ids,
+        "rows_written": sum(m["rows_written"] for m in month_results),
+        "rows_loaded": sum(job.output_rows or 0 for job in load_jobs),
+        "silver_merge_job_id": silver_job_id,
+        "loaded_to_bq": bool(load_jobs),
+        "silver_merge_ran": merge_handle is not None,
+        "truncated_months": [m["month"] for m in month_results if m["truncated"]],
+        "expected_rows": sum(m["expected_rows"] for m in month_results) if plan else None,
+        "bq_jobs": bq_jobs,
+        **summarize_job_stats(bq_jobs),
+        "message": "Backfill range completed successfully",
+    }
+
 # -----------------------------------------------------
 # main
 # -----------------------------------------------------
 
+def _budget_from_args(args: argparse.Namespace) -> PullBudget | None:
+    if args.max_seconds is None and args.max_rows is None and args.max_bytes is None:
+        return None
+    return PullBudget(max_seconds=args.max_seconds, max_rows=args.max_rows, max_bytes=args.max_bytes)
+
+
 def main() -> None:
     args = parse_args()
 
-    result = run_pipeline(
-        command=args.command,
-        since=getattr(args, "since", None),
-        month=getattr(args, "month", None),
-        page_size=args.page_size,
-        max_pages=args.max_pages,
-        out=args.out,
-        load_to_bq=args.load_to_bq,
-        run_silver_merge_flag=args.run_silver_merge,
+    if args.command == "replay":
+        files = discover_raw_files(
+            roots=args.roots or (RAW_ROOT,),
+            patterns=args.patterns or DEFAULT_PATTERNS,
+            from_date=args.from_date,
+            to_date=args.to_date,
+            archive_root=args.archive_root,
+        )
+        print(f"[replay] discovered {len(files)} file(s)")
+        result = replay_files(
+            files,
+            backend=args.backend,
+            single_load=args.single_load,
+            run_silver_merge_flag=args.run_silver_merge,
+            skip_invalid=args.skip_invalid,
+            dry_run=args.dry_run,
+            force=args.force,
+        )
+        print(json.dumps(result, indent=2, default=str))
+        return
+
+    max_pages = None if args.exhaustive else args.max_pages
+    budget = _budget_from_args(args)
+    profiler = profile_run(
+        profile_prefix(args.out_dir if args.command == "backfill-range" else args.out),
+        stage=args.profile_stage,
+        enabled=args.profile or args.profile_stage is not None,
     )
 
+    if args.command == "backfill-range":
+        with profiler as prof:
+            result = run_backfill_range(
+                from_month=args.from_month,
+                to_month=args.to_month,
+                page_size=args.page_size,
+                max_pages=max_pages,
+                out_dir=args.out_dir,
+                load_to_bq=args.load_to_bq,
+                run_silver_merge_flag=args.run_silver_merge,
+                record_job_stats_flag=args.record_job_stats,
+                record_run_stats_flag=args.record_run_stats,
+                budget=budget,
+                plan=args.plan,
+            )
+        if prof.result:
+            result["profile"] = prof.result
+        print(json.dumps(result, indent=2))
+        return
+
+    with profiler as prof:
+        result = run_pipeline(
+            command=args.command,
+            since=getattr(args, "since", None),
+            until=getattr(args, "until", None),
+            month=getattr(args, "month", None),
+            page_size=args.page_size,
+            max_pages=max_pages,
+            out=args.out,
+            load_to_bq=args.load_to_bq,
+            run_silver_merge_flag=args.run_silver_merge,
+            record_job_stats_flag=args.record_job_stats,
+            record_run_stats_flag=args.record_run_stats,
+            backend=args.backend,
+            update_watermark=getattr(args, "update_watermark", True),
+            budget=budget,
+            plan=args.plan,
+        )
+    if prof.result:
+        result["profile"] = prof.result
+
     print(json.dumps(result, indent=2))
 
 if __name__ == "__main__":
     main()
 
 # pull command -> python -m src.ingestion.runner pull --since YYYY-MM-DDT00:00:00Z --page-size 1000 --max-pages 10 --out data/raw/incremental/(filename).jsonl --load-to-bq --run-silver-merge
-# backfill command -> python -m src.ingestion.runner backfill --month YYYY-MM --page-size 1000 --max-pages 10 --out data/raw/backfill/(filename).jsonl --load-to-bq --run-silver-merge
\ No newline at end of file
+# backfill command -> python -m src.ingestion.runner backfill --month YYYY-MM --page-size 1000 --max-pages 10 --out data/raw/backfill/(filename).jsonl --load-to-bq --run-silver-merge
+# exhaustive pull -> python -m src.ingestion.runner pull --page-size 1000 --exhaustive --max-seconds 1800 --plan --out data/raw/incremental/(filename).jsonl --load-to-bq --run-silver-merge
+# exhaustive backfill -> python -m src.ingestion.runner backfill --month YYYY-MM --page-size 1000 --exhaustive --max-rows 500000 --out data/raw/backfill/(filename).jsonl --load-to-bq --run-silver-merge
+# backfill range -> python -m src.ingestion.runner backfill-range --from-month YYYY-MM --to-month YYYY-MM --page-size 1000 --max-pages 10 --out-dir data/raw/backfill --load-to-bq --run-silver-merge
+# profile -> python -m src.ingestion.runner backfill --month YYYY-MM --page-size 1000 --exhaustive --out data/raw/backfill/(filename).jsonl --profile-stage validate
+# replay -> python -m src.ingestion.runner replay --glob 'backfill/*.jsonl' --from-date YYYY-MM-DD --to-date YYYY-MM-DD --single-load --run-silver-merge [--dry-run]
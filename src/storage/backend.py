@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Protocol, Sequence
+
+
+class WarehouseBackend(Protocol):
+    """Where bronze rows are loaded and silver incident_current is merged."""
+
+    name: str
+
+    @property
+    def bronze_target(self) -> str:
+        """Identifies the bronze table load_jsonl appends to (the load ledger is scoped to it)."""
+        ...
+
+    def load_jsonl(self, jsonl_path: str | Path) -> int | None:
+        """Append a bronze JSONL file; returns rows loaded."""
+        ...
+
+    def merge_silver(
+        self,
+        snapshot_id: str | None = None,
+        *,
+        snapshot_ids: Sequence[str] | None = None,
+        snapshot_ts_start: str | datetime | None = None,
+        snapshot_ts_end: str | datetime | None = None,
+    ) -> str | None:
+        """MERGE bronze snapshots into silver; returns a job/statement id."""
+        ...
+
+
+class BigQueryBackend:
+    name = "bigquery"
+
+    @property
+    def bronze_target(self) -> str:
+        from src.common.exceptions import require_env
+
+        return f"{require_env('GCP_PROJECT_ID')}.{require_env('BRONZE_DATASET_ID')}.{require_env('BRONZE_TABLE_ID')}"
+
+    def load_jsonl(self, jsonl_path: str | Path) -> int | None:
+        from src.storage.bq_loader import load_jsonl_to_bq
+
+        return load_jsonl_to_bq(jsonl_path)
+
+    def merge_silver(
+        self,
+        snapshot_id: str | None = None,
+        *,
+        snapshot_ids: Sequence[str] | None = None,
+        snapshot_ts_start: str | datetime | None = None,
+        snapshot_ts_end: str | datetime | None = None,
+    ) -> str | None:
+        from src.storage.bq_silver import run_silver_merge
+
+        return run_silver_merge(
+            snapshot_id,
+            snapshot_ids=snapshot_ids,
+            snapshot_ts_start=snapshot_ts_start,
+            snapshot_ts_end=snapshot_ts_end,
+        )
+
+
+BACKENDS = ("bigquery", "duckdb")
+
+
+def get_backend(name: str | None = None) -> WarehouseBackend:
+    """
+    Resolve a warehouse backend by name (default: WAREHOUSE_BACKEND env, else bigquery).
+
+    duckdb uses the file at DUCKDB_PATH (default data/warehouse/traffic.duckdb).
+    """
+    name = name or os.getenv("WAREHOUSE_BACKEND") or "bigquery"
+
+    if name == "bigquery":
+        return BigQueryBackend()
+    if name == "duckdb":
+        from src.storage.duckdb_backend import DuckDBBackend
+
+        return DuckDBBackend(os.getenv("DUCKDB_PATH", "data/warehouse/traffic.duckdb"))
+
+    raise ValueError(f"Unsupported warehouse backend: {name} (expected one of {BACKENDS})")
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date, datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+from google.cloud import bigquery
+from google.api_core.exceptions import GoogleAPIError
+
+from src.storage.exceptions import (
+    make_bq_client,
+    assert_dataset_access,
+    assert_table_access
+)
+from src.storage.bq_jobs import BqJobHandle
+from src.storage.bq_loader import BRONZE_SCHEMA
+from src.common.exceptions import require_env
+
+
+load_dotenv()
+
+
+# Only exact duplicates inside one snapshot are collapsed (the same file loaded
+# twice, a retried append). A row repeated across snapshots is not redundant:
+# fact_incident_snapshot and volume_yesterday_snapshot_nonzero read every
+# snapshot in full, so deleting an incident from earlier snapshots would change
+# them on the next full refresh. snapshot_id is part of every row, so
+# partitioning by all bronze columns never crosses snapshots.
+KEEP_ROW_PREDICATE = f"""
+  ROW_NUMBER() OVER (
+    PARTITION BY {", ".join(field.name for field in BRONZE_SCHEMA)}
+  ) = 1
+"""
+
+WINDOW_FILTER = "DATE(snapshot_ts) < @cutoff_date AND (@since_date IS NULL OR DATE(snapshot_ts) >= @since_date)"
+
+COMPACTION_STATS_SQL_TEMPLATE = """
+SELECT
+  COUNT(*) AS rows_scanned,
+  COUNTIF(keep) AS rows_kept
+FROM (
+  SELECT {keep_row_predicate} AS keep
+  FROM `{bronze_table}`
+  WHERE {window_filter}
+)
+"""
+
+# Rewrites the old partitions in one transaction: stage survivors, drop the
+# window (whole-partition delete) and re-insert the survivors.
+COMPACTION_SQL_TEMPLATE = """
+BEGIN TRANSACTION;
+
+CREATE TEMP TABLE compacted AS
+SELECT *
+FROM `{bronze_table}`
+WHERE {window_filter}
+QUALIFY {keep_row_predicate};
+
+DELETE FROM `{bronze_table}`
+WHERE {window_filter};
+
+INSERT INTO `{bronze_table}`
+SELECT * FROM compacted;
+
+COMMIT TRANSACTION;
+"""
+
+PARTITION_BYTES_SQL_TEMPLATE = """
+SELECT COALESCE(SUM(total_logical_bytes), 0) AS logical_bytes
+FROM `{project}.{dataset}.INFORMATION_SCHEMA.PARTITIONS`
+WHERE table_name = @table_name
+  AND partition_id NOT IN ('__NULL__', '__UNPARTITIONED__', '__STREAMING_UNPARTITIONED__')
+  AND partition_id < @cutoff_partition
+  AND (@since_partition IS NULL OR partition_id >= @since_partition)
+"""
+
+
+def _partition_bytes(client, *, project: str, dataset: str, table: str, cutoff: date, since: date | None) -> int:
+    sql = PARTITION_BYTES_SQL_TEMPLATE.format(project=project, dataset=dataset)
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("table_name", "STRING", table),
+            bigquery.ScalarQueryParameter("cutoff_partition", "STRING", cutoff.strftime("%Y%m%d")),
+            bigquery.ScalarQueryParameter("since_partition", "STRING", since.strftime("%Y%m%d") if since else None),
+        ]
+    )
+    row = next(iter(client.query(sql, job_config=job_config).result()), None)
+    return int(row.logical_bytes) if row is not None else 0
+
+
+def compact_bronze(
+    *,
+    older_than_days: int = 30,
+    since_days: int | None = None,
+    dry_run: bool = True,
+) -> dict:
+    """
+    Drop exact duplicate rows (same snapshot, same values) from bronze partitions older than N days.
+
+    - older_than_days: only partitions with DATE(snapshot_ts) before today - N are rewritten
+    - since_days: optional lower bound (today - M) so already-compacted history is not rescanned
+    - dry_run: only count rows and estimate bytes; nothing is modified
+
+    Returns rows scanned/kept/removed and bytes before/after/reclaimed for the window.
+    """
+    if older_than_days < 1:
+        raise ValueError("older_than_days must be >= 1")
+    if since_days is not None and since_days <= older_than_days:
+        raise ValueError("since_days must be greater than older_than_days")
+
+    # --------- Config ---------
+    GCP_PROJECT_ID = require_env("GCP_PROJECT_ID")
+    BRONZE_DATASET_ID = require_env("BRONZE_DATASET_ID")
+    BRONZE_TABLE_ID = require_env("BRONZE_TABLE_ID")
+
+    bronze_table = f"{GCP_PROJECT_ID}.{BRONZE_DATASET_ID}.{BRONZE_TABLE_ID}"
+    dataset_id = f"{GCP_PROJECT_ID}.{BRONZE_DATASET_ID}"
+
+    today = datetime.now(timezone.utc).date()
+    cutoff = today - timedelta(days=older_than_days)
+    since = today - timedelta(days=since_days) if since_days is not None else None
+
+    params = [
+        bigquery.ScalarQueryParameter("cutoff_date", "DATE", cutoff),
+        bigquery.ScalarQueryParameter("since_date", "DATE", since),
+    ]
+    fmt = {
+        "bronze_table": bronze_table,
+        "window_filter": WINDOW_FILTER,
+        "keep_row_predicate": KEEP_ROW_PREDICATE,
+    }
+
+    # --------- Client ---------
+    client = make_bq_client()
+
+    assert_dataset_access(client, dataset_id)
+    assert_table_access(client, bronze_table)
+
+    def partition_bytes() -> int:
+        return _partition_bytes(
+            client,
+            project=GCP_PROJECT_ID,
+            dataset=BRONZE_DATASET_ID,
+            table=BRONZE_TABLE_ID,
+            cutoff=cutoff,
+            since=since,
+        )
+
+    # --------- Plan ---------
+    try:
+        stats_sql = COMPACTION_STATS_SQL_TEMPLATE.format(**fmt)
+        row = next(iter(client.query(stats_sql, job_config=bigquery.QueryJobConfig(query_parameters=params)).result()))
+        rows_scanned = int(row.rows_scanned)
+        rows_kept = int(row.rows_kept)
+        bytes_before = partition_bytes()
+    except GoogleAPIError as e:
+        raise RuntimeError(f"Bronze compaction planning failed for {bronze_table}") from e
+
+    result = {
+        "dry_run": dry_run,
+        "table": bronze_table,
+        "cutoff_date": cutoff.isoformat(),
+        "since_date": since.isoformat() if since else None,
+        "rows_scanned": rows_scanned,
+        "rows_kept": rows_kept,
+        "rows_removed": rows_scanned - rows_kept,
+        "bytes_before": bytes_before,
+        "bytes_after": None,
+        "bytes_reclaimed": None,
+        "job_id": None,
+    }
+
+    if dry_run or rows_scanned == rows_kept:
+        # estimate: bytes shrink roughly in proportion to rows removed
+        estimate = int(bytes_before * (1 - rows_kept / rows_scanned)) if rows_scanned else 0
+        result["bytes_reclaimed"] = estimate
+        result["bytes_after"] = bytes_before - estimate
+        print(f"[compaction] {'dry-run' if dry_run else 'nothing to do'}: {json.dumps(result)}")
+        return result
+
+    # --------- Rewrite ---------
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=params,
+        labels={"layer": "bronze", "job": "compact_bronze"},
+    )
+    handle = BqJobHandle(
+        lambda: client.query(COMPACTION_SQL_TEMPLATE.format(**fmt), job_config=job_config),
+        kind="compaction",
+        context={"layer": "bronze", "table": bronze_table, "cutoff_date": cutoff.isoformat()},
+    )
+    job = handle.wait()
+
+    try:
+        bytes_after = partition_bytes()
+    except GoogleAPIError as e:
+        raise RuntimeError(f"Bronze compaction succeeded but size lookup failed for {bronze_table}") from e
+
+    result.update(
+        job_id=job.job_id,
+        bytes_after=bytes_after,
+        bytes_reclaimed=bytes_before - bytes_after,
+    )
+    print(f"[compaction] done: {json.dumps(result)}")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drop exact duplicate rows from old bronze partitions")
+
+    parser.add_argument("--older-than-days", type=int, default=30)
+    parser.add_argument("--since-days", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    compact_bronze(
+        older_than_days=args.older_than_days,
+        since_days=args.since_days,
+        dry_run=args.dry_run,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from google.api_core.exceptions import GoogleAPIError
+
+from src.storage.exceptions import make_bq_client, assert_table_access
+from src.common.exceptions import require_env
+
+
+load_dotenv()
+
+
+JOB_STATS_COLUMNS = (
+    "job_id",
+    "kind",
+    "job_type",
+    "statement_type",
+    "state",
+    "error",
+    "created_at",
+    "queue_ms",
+    "run_ms",
+    "total_ms",
+    "bytes_processed",
+    "bytes_billed",
+    "input_bytes",
+    "slot_ms",
+    "rows_affected",
+    "cache_hit",
+)
+
+
+def _control_table(table_env: str) -> str:
+    GCP_PROJECT_ID = require_env("GCP_PROJECT_ID")
+    CONTROL_DATASET_ID = require_env("CONTROL_DATASET_ID")
+    TABLE_ID = require_env(table_env)
+    return f"{GCP_PROJECT_ID}.{CONTROL_DATASET_ID}.{TABLE_ID}"
+
+
+def _insert_rows(table_id: str, rows: list[dict]) -> None:
+    client = make_bq_client()
+    assert_table_access(client, table_id)
+
+    try:
+        errors = client.insert_rows_json(table_id, rows)
+    except GoogleAPIError as e:
+        raise RuntimeError(f"Failed to write control rows into {table_id}") from e
+
+    if errors:
+        raise RuntimeError(f"Control table insert returned errors for {table_id}: {errors}")
+
+
+def record_best_effort(write, *args, **kwargs) -> bool:
+    """
+    Call a record_* writer, logging a warning instead of raising on failure.
+
+    Run stats are telemetry: once the data is loaded, a failed control insert
+    must not fail (and retry) the run that produced it.
+    """
+    try:
+        write(*args, **kwargs)
+    except Exception as e:
+        print(f"WARNING: [control] {write.__name__} failed, run stats not recorded: {e}")
+        return False
+    return True
+
+
+def record_job_stats(
+    stats: list[dict],
+    *,
+    snapshot_id: str | None = None,
+    command: str | None = None,
+) -> int:
+    """
+    Append job stats (see bq_telemetry.job_stats) to traffic_control.job_stats.
+
+    Table: GCP_PROJECT_ID.CONTROL_DATASET_ID.JOB_STATS_TABLE_ID
+    """
+    if not stats:
+        return 0
+
+    table_id = _control_table("JOB_STATS_TABLE_ID")
+    recorded_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+    rows = [
+        {
+            **{col: s.get(col) for col in JOB_STATS_COLUMNS},
+            "snapshot_id": snapshot_id,
+            "command": command,
+            "recorded_at": recorded_at,
+        }
+        for s in stats
+    ]
+    _insert_rows(table_id, rows)
+
+    print(f"[control] recorded {len(rows)} job stats rows into {table_id}")
+    return len(rows)
+
+
+PIPELINE_RUN_COLUMNS = (
+    "snapshot_id",
+    "snapshot_ts",
+    "run_type",
+    "query_name",
+    "command",
+    "pages",
+    "rows_written",
+    "rows_loaded",
+    "distinct_incidents",
+    "min_source_updated_at",
+    "max_source_updated_at",
+)
+
+
+def record_pipeline_run(run: dict) -> None:
+    """
+    Append one run-stats record to traffic_control.pipeline_runs.
+
+    Table: GCP_PROJECT_ID.CONTROL_DATASET_ID.PIPELINE_RUNS_TABLE_ID. dbt's
+    pipeline_run_log reads these instead of re-aggregating bronze.
+    """
+    if not run.get("snapshot_id"):
+        raise ValueError("run stats need a snapshot_id")
+
+    table_id = _control_table("PIPELINE_RUNS_TABLE_ID")
+    row = {
+        **{col: run.get(col) for col in PIPELINE_RUN_COLUMNS},
+        "recorded_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+    _insert_rows(table_id, [row])
+
+    print(f"[control] recorded run stats for {row['snapshot_id']} into {table_id}")
+
+
+LOAD_LEDGER_COLUMNS = (
+    "content_hash",
+    "backend",
+    "target",
+    "path",
+    "rows",
+    "snapshot_ids",
+    "snapshot_ts",
+    "load_job_id",
+)
+
+
+def record_load_ledger(entry: dict) -> None:
+    """
+    Append one loaded file to traffic_control.load_ledger.
+
+    Table: GCP_PROJECT_ID.CONTROL_DATASET_ID.LOAD_LEDGER_TABLE_ID
+    """
+    table_id = _control_table("LOAD_LEDGER_TABLE_ID")
+    row = {
+        **{col: entry.get(col) for col in LOAD_LEDGER_COLUMNS},
+        "loaded_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+    _insert_rows(table_id, [row])
+
+    print(f"[control] recorded load ledger entry {row['content_hash'][:12]} into {table_id}")
+
+
+def lookup_load_ledger(content_hash: str, backend: str, target: str) -> dict | None:
+    """Latest traffic_control.load_ledger entry for a content hash loaded into target, or None."""
+    from google.cloud import bigquery
+
+    table_id = _control_table("LOAD_LEDGER_TABLE_ID")
+    client = make_bq_client()
+    assert_table_access(client, table_id)
+
+    sql = f"""
+    SELECT {", ".join(LOAD_LEDGER_COLUMNS)}, loaded_at
+    FROM `{table_id}`
+    WHERE content_hash = @content_hash AND backend = @backend AND target = @target
+    ORDER BY loaded_at DESC
+    LIMIT 1
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("content_hash", "STRING", content_hash),
+            bigquery.ScalarQueryParameter("backend", "STRING", backend),
+            bigquery.ScalarQueryParameter("target", "STRING", target),
+        ],
+        labels={"layer": "control", "job": "load_ledger_lookup"},
+    )
+    try:
+        row = next(iter(client.query(sql, job_config=job_config).result()), None)
+    except GoogleAPIError as e:
+        raise RuntimeError(f"Failed to read load ledger from {table_id}") from e
+
+    if row is None:
+        return None
+    entry = dict(row.items())
+    entry["snapshot_ids"] = list(entry["snapshot_ids"] or [])
+    entry["loaded_at"] = entry["loaded_at"].isoformat().replace("+00:00", "Z")
+    if entry["snapshot_ts"] is not None:
+        entry["snapshot_ts"] = entry["snapshot_ts"].isoformat().replace("+00:00", "Z")
+    return entry
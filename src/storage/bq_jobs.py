@@ -1,5 +1,25 @@
 from __future__ import annotations
 
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Sequence
+
+from google.api_core.exceptions import GoogleAPIError
+
+from src.storage import bq_telemetry
+
+
+# Background pollers for submitted jobs. A poller thread is taken only once a
+# job can be submitted: a handle with dependencies is started from the done
+# callback of its last dependency, so waiting handles never hold a thread that
+# the jobs they wait for would need.
+_POLLER = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bq-job")
+
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+
+
 def assert_job_succeeded(job, *, context: dict | None = None) -> None:
     context = context or {}
 
@@ -12,3 +32,145 @@ def assert_job_succeeded(job, *, context: dict | None = None) -> None:
         raise RuntimeError(
             f"BigQuery job completed with errors: {job.errors} | ctx={context}"
         )
+
+
+class BqJobHandle:
+    """
+    Non-blocking handle for a BigQuery job.
+
+    The job is submitted and polled on a background thread. If depends_on is
+    given, it is submitted once every dependency finished successfully (e.g. a
+    merge waits for its load), and fails without submitting if one failed.
+    Only wait() blocks the caller.
+    """
+
+    def __init__(
+        self,
+        submit: Callable[[], Any],
+        *,
+        kind: str,
+        context: dict | None = None,
+        depends_on: Sequence["BqJobHandle"] = (),
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    ) -> None:
+        self.kind = kind
+        self.context = context or {}
+        self.depends_on = list(depends_on)
+        self.poll_interval = poll_interval
+
+        self.job = None
+        self.created_at = time.monotonic()
+        self.submitted_at: float | None = None
+        self.done_at: float | None = None
+
+        self._submit = submit
+        # stats reach the collectors of the run that created the handle
+        self._context = contextvars.copy_context()
+        self._future: Future = Future()
+        self._lock = threading.Lock()
+        self._waiting_on = len(self.depends_on)
+
+        if not self.depends_on:
+            self._start()
+        for dep in self.depends_on:
+            dep._future.add_done_callback(self._dependency_done)
+
+    @property
+    def job_id(self) -> str | None:
+        return self.job.job_id if self.job is not None else None
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def wait(self, timeout: float | None = None):
+        """Block until the job is DONE; returns the job or raises its error."""
+        return self._future.result(timeout=timeout)
+
+    def timings(self) -> dict:
+        """Seconds spent waiting on dependencies and from submission to DONE."""
+        return {
+            "dependency_wait_s": _elapsed(self.created_at, self.submitted_at),
+            "submit_to_done_s": _elapsed(self.submitted_at, self.done_at),
+        }
+
+    def stats(self) -> dict | None:
+        """Cost/performance stats of the job (None until it was submitted)."""
+        if self.job is None:
+            return None
+        return bq_telemetry.job_stats(self.job, kind=self.kind, timings=self.timings())
+
+    def _log(self, message: str) -> None:
+        print(f"[bq][{self.kind}] {message} (+{time.monotonic() - self.created_at:.2f}s)")
+
+    def _dependency_done(self, dep_future: Future) -> None:
+        error = dep_future.exception()
+        with self._lock:
+            if self._future.done():
+                return
+            self._waiting_on -= 1
+            if error is not None:
+                dep = next(d for d in self.depends_on if d._future is dep_future)
+                failed = RuntimeError(
+                    f"BigQuery {self.kind} not submitted: dependency {dep.kind} failed | ctx={self.context}"
+                )
+                failed.__cause__ = error
+                self.done_at = time.monotonic()
+                self._future.set_exception(failed)
+                return
+            if self._waiting_on > 0:
+                return
+        self._start()
+
+    def _start(self) -> None:
+        _POLLER.submit(self._context.run, self._settle)
+
+    def _settle(self) -> None:
+        try:
+            job = self._run()
+        except BaseException as e:
+            self._future.set_exception(e)
+        else:
+            self._future.set_result(job)
+
+    def _run(self):
+        try:
+            self.job = self._submit()
+            self.submitted_at = time.monotonic()
+            state = self.job.state
+            self._log(f"job={self.job_id} SUBMITTED -> {state}")
+
+            while state != "DONE":
+                time.sleep(self.poll_interval)
+                self.job.reload()
+                if self.job.state != state:
+                    self._log(f"job={self.job_id} {state} -> {self.job.state}")
+                    state = self.job.state
+        except GoogleAPIError as e:
+            raise RuntimeError(f"BigQuery {self.kind} failed | ctx={self.context}") from e
+        finally:
+            self.done_at = time.monotonic()
+            if self.job is not None and self.job.state == "DONE":
+                bq_telemetry.record(self.stats())
+
+        assert_job_succeeded(self.job, context=self.context)
+        return self.job
+
+
+def wait_all(handles: Sequence[BqJobHandle]) -> list:
+    """Wait for every handle; raises the first failure after all have settled."""
+    jobs = []
+    first_error: BaseException | None = None
+    for handle in handles:
+        try:
+            jobs.append(handle.wait())
+        except Exception as e:
+            first_error = first_error or e
+    if first_error is not None:
+        raise first_error
+    return jobs
+
+
+def _elapsed(start: float | None, end: float | None) -> float | None:
+    if start is None or end is None:
+        return None
+    return round(end - start, 3)
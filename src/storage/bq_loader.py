@@ -1,24 +1,60 @@
 import os
 from pathlib import Path
 import argparse
+from typing import Sequence
 
 from dotenv import load_dotenv
 from google.cloud import bigquery
-from google.api_core.exceptions import GoogleAPIError
 from src.storage.exceptions import (
     make_bq_client,
     assert_dataset_access,
     assert_table_access
 )
 
-from src.storage.bq_jobs import assert_job_succeeded
+from src.storage.bq_jobs import BqJobHandle
 from src.common.exceptions import require_env
+from src.common.instrumentation import stage
 
 
 load_dotenv()
 
+# Bronze load schema; also what replay validates raw files against.
+BRONZE_SCHEMA = [
+    bigquery.SchemaField("snapshot_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("snapshot_ts", "TIMESTAMP", mode="REQUIRED"),
+    bigquery.SchemaField("run_type", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("query_name", "STRING", mode="REQUIRED"),
 
-def load_jsonl_to_bq(jsonl_path: str | Path) -> int | None:
+    bigquery.SchemaField("incident_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("incident_info", "STRING"),
+    bigquery.SchemaField("description", "STRING"),
+
+    bigquery.SchemaField("start_ts", "TIMESTAMP"),
+    bigquery.SchemaField("modified_ts", "TIMESTAMP"),
+
+    bigquery.SchemaField("quadrant", "STRING"),
+    bigquery.SchemaField("longitude", "FLOAT64"),
+    bigquery.SchemaField("latitude", "FLOAT64"),
+    bigquery.SchemaField("location_key", "STRING"),
+    bigquery.SchemaField("count", "INT64"),
+
+    bigquery.SchemaField("source_row_id", "STRING"),
+    bigquery.SchemaField("source_version", "STRING"),
+    bigquery.SchemaField("source_created_at", "TIMESTAMP"),
+    bigquery.SchemaField("source_updated_at", "TIMESTAMP"),
+]
+
+
+def submit_jsonl_load(
+    jsonl_path: str | Path,
+    *,
+    depends_on: Sequence[BqJobHandle] = (),
+) -> BqJobHandle:
+    """
+    Validate config/access, then upload + load the file in the background.
+
+    Returns immediately with a job handle; call .wait() where the load is needed.
+    """
 
     jsonl_path = Path(jsonl_path)
 
@@ -42,29 +78,7 @@ def load_jsonl_to_bq(jsonl_path: str | Path) -> int | None:
         source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
         write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
         autodetect=False,
-        schema=[
-            bigquery.SchemaField("snapshot_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("snapshot_ts", "TIMESTAMP", mode="REQUIRED"),
-            bigquery.SchemaField("run_type", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("query_name", "STRING", mode="REQUIRED"),
-
-            bigquery.SchemaField("incident_id", "STRING", mode="REQUIRED"),
-            bigquery.SchemaField("incident_info", "STRING"),
-            bigquery.SchemaField("description", "STRING"),
-
-            bigquery.SchemaField("start_ts", "TIMESTAMP"),
-            bigquery.SchemaField("modified_ts", "TIMESTAMP"),
-
-            bigquery.SchemaField("quadrant", "STRING"),
-            bigquery.SchemaField("longitude", "FLOAT64"),
-            bigquery.SchemaField("latitude", "FLOAT64"),
-            bigquery.SchemaField("count", "INT64"),
-
-            bigquery.SchemaField("source_row_id", "STRING"),
-            bigquery.SchemaField("source_version", "STRING"),
-            bigquery.SchemaField("source_created_at", "TIMESTAMP"),
-            bigquery.SchemaField("source_updated_at", "TIMESTAMP"),
-        ],
+        schema=BRONZE_SCHEMA,
         ignore_unknown_values=False,
         max_bad_records=0,
     )
@@ -78,25 +92,31 @@ def load_jsonl_to_bq(jsonl_path: str | Path) -> int | None:
     assert_dataset_access(client, dataset_id)
     assert_table_access(client, table_id)
     
-    # --------- Submit + Wait ---------
-    try:
-        with open(jsonl_path, "rb") as f:
-            job = client.load_table_from_file(f, table_id, job_config=job_config)
-        job.result()
-    except GoogleAPIError as e:
-        raise RuntimeError(f"BigQuery load failed for {table_id}") from e
-
-
-    assert_job_succeeded(
-        job,
+    # --------- Submit (background) ---------
+    def submit():
+        with stage("load.upload", bytes=jsonl_path.stat().st_size), open(jsonl_path, "rb") as f:
+            return client.load_table_from_file(f, table_id, job_config=job_config)
+
+    return BqJobHandle(
+        submit,
+        kind="load",
         context={
             "layer": "raw",
             "table": table_id,
+            "path": str(jsonl_path),
         },
+        depends_on=depends_on,
     )
-    
+
+
+def load_jsonl_to_bq(jsonl_path: str | Path) -> int | None:
+    handle = submit_jsonl_load(jsonl_path)
+    with stage("load.wait") as s:
+        job = handle.wait()
+        s.add(rows=job.output_rows or 0)
+
     print(f"JobID {job.job_id}")
-    print(f"Loaded {job.output_rows} rows into {table_id}")
+    print(f"Loaded {job.output_rows} rows into {handle.context['table']}")
     return job.output_rows
 
 
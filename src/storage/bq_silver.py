@@ -1,17 +1,24 @@
 import os
+import argparse
+from datetime import datetime
+from typing import Sequence
 
 from dotenv import load_dotenv
 from google.cloud import bigquery
-from google.api_core.exceptions import GoogleAPIError
 
 from src.storage.exceptions import (
     make_bq_client,
     assert_dataset_access,
     assert_table_access
 )
-from src.storage.bq_jobs import assert_job_succeeded
+from src.storage.bq_jobs import BqJobHandle
 from src.common.exceptions import require_env
-from src.ingestion.queries import build_merge_sql
+from src.common.instrumentation import stage
+from src.ingestion.queries import (
+    build_merge_sql,
+    resolve_snapshot_selection,
+    SNAPSHOT_FILTERS,
+)
 
 
 load_dotenv()
@@ -31,8 +38,62 @@ def _latest_snapshot_id(client: bigquery.Client, bronze_table: str) -> str:
         raise RuntimeError(f"No snapshot_id found in {bronze_table}")
     return str(row.snapshot_id)
 
-def run_silver_merge(snapshot_id: str | None = None) -> str | None:
-    
+def _snapshot_selection(
+    *,
+    snapshot_id: str | None,
+    snapshot_ids: Sequence[str] | None,
+    snapshot_ts_start: str | datetime | None,
+    snapshot_ts_end: str | datetime | None,
+) -> tuple[str, list, dict]:
+    """
+    Resolve which bronze snapshots the MERGE reads (rules in resolve_snapshot_selection).
+
+    Returns (snapshot_filter, query_parameters, log_context).
+    """
+    kind, params = resolve_snapshot_selection(
+        snapshot_id=snapshot_id,
+        snapshot_ids=snapshot_ids,
+        snapshot_ts_start=snapshot_ts_start,
+        snapshot_ts_end=snapshot_ts_end,
+    )
+
+    if kind == "snapshot_ids":
+        query_parameters = [bigquery.ArrayQueryParameter("snapshot_ids", "STRING", params["snapshot_ids"])]
+        log_context = dict(params)
+    elif kind == "snapshot_ts_range":
+        query_parameters = [
+            bigquery.ScalarQueryParameter(name, "TIMESTAMP", value) for name, value in params.items()
+        ]
+        log_context = {name: value.isoformat() for name, value in params.items()}
+    else:
+        query_parameters = [bigquery.ScalarQueryParameter("snapshot_id", "STRING", params["snapshot_id"])]
+        log_context = dict(params)
+
+    return SNAPSHOT_FILTERS[kind], query_parameters, log_context
+
+
+def submit_silver_merge(
+    snapshot_id: str | None = None,
+    *,
+    snapshot_ids: Sequence[str] | None = None,
+    snapshot_ts_start: str | datetime | None = None,
+    snapshot_ts_end: str | datetime | None = None,
+    depends_on: Sequence[BqJobHandle] = (),
+) -> BqJobHandle:
+    """
+    Submit the silver MERGE in the background and return its job handle.
+
+    The MERGE is only sent to BigQuery once every handle in depends_on (usually
+    the bronze load it reads) has finished.
+
+    - snapshot_id: merge a single snapshot (default; resolves the latest if omitted)
+    - snapshot_ids: fold several snapshots into one MERGE
+    - snapshot_ts_start/snapshot_ts_end: fold every snapshot in [start, end) into one MERGE
+
+    Batched merges dedup across all selected snapshots with the same ordering as
+    the single-snapshot MERGE, so silver ends up identical to merging them one by one.
+    """
+
     # --------- Config ---------
     GCP_PROJECT_ID = require_env("GCP_PROJECT_ID")
     BRONZE_DATASET_ID = require_env("BRONZE_DATASET_ID")
@@ -40,14 +101,6 @@ def run_silver_merge(snapshot_id: str | None = None) -> str | None:
     SILVER_DATASET_ID = require_env("SILVER_DATASET_ID")
     SILVER_TABLE_ID = require_env("SILVER_TABLE_ID")
 
-    merge_sql = build_merge_sql(
-        gcp_project_id=GCP_PROJECT_ID,
-        bronze_dataset_id=BRONZE_DATASET_ID,
-        bronze_table_id=BRONZE_TABLE_ID,
-        silver_dataset_id=SILVER_DATASET_ID,
-        silver_table_id=SILVER_TABLE_ID
-    )
-
     table_id = f"{GCP_PROJECT_ID}.{SILVER_DATASET_ID}.{SILVER_TABLE_ID}"
     dataset_id = f"{GCP_PROJECT_ID}.{SILVER_DATASET_ID}"
 
@@ -57,16 +110,30 @@ def run_silver_merge(snapshot_id: str | None = None) -> str | None:
 
 
     # If no snapshot provided, resolve automatically (standalone usage)
-    if snapshot_id is None:
+    batched = snapshot_ids is not None or snapshot_ts_start is not None or snapshot_ts_end is not None
+    if snapshot_id is None and not batched:
         bronze_table = f"{GCP_PROJECT_ID}.{BRONZE_DATASET_ID}.{BRONZE_TABLE_ID}"
         snapshot_id = _latest_snapshot_id(client, bronze_table)
         print(f"[silver] auto snapshot_id = {snapshot_id}")
 
+    snapshot_filter, query_parameters, selection = _snapshot_selection(
+        snapshot_id=snapshot_id,
+        snapshot_ids=snapshot_ids,
+        snapshot_ts_start=snapshot_ts_start,
+        snapshot_ts_end=snapshot_ts_end,
+    )
+
+    merge_sql = build_merge_sql(
+        gcp_project_id=GCP_PROJECT_ID,
+        bronze_dataset_id=BRONZE_DATASET_ID,
+        bronze_table_id=BRONZE_TABLE_ID,
+        silver_dataset_id=SILVER_DATASET_ID,
+        silver_table_id=SILVER_TABLE_ID,
+        snapshot_filter=snapshot_filter,
+    )
 
     job_config = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ScalarQueryParameter("snapshot_id", "STRING", snapshot_id),
-        ],
+        query_parameters=query_parameters,
         labels={"layer": "silver", "job": "merge_incident_current"},
     )
 
@@ -75,25 +142,77 @@ def run_silver_merge(snapshot_id: str | None = None) -> str | None:
     assert_table_access(client, table_id)
 
 
-    # --------- Submit + Wait ---------
-    try:
-        job = client.query(merge_sql, job_config=job_config)
-        job.result()
-    except GoogleAPIError as e:
-        raise RuntimeError(f"BigQuery job failed for {table_id}") from e
-    
-    
-    assert_job_succeeded(
-        job,
+    # --------- Submit (background) ---------
+    return BqJobHandle(
+        lambda: client.query(merge_sql, job_config=job_config),
+        kind="merge",
         context={
             "layer": "silver",
             "table": table_id,
-            "snapshot_id": snapshot_id
-        }
+            **selection,
+        },
+        depends_on=depends_on,
     )
-    
+
+
+def run_silver_merge(
+    snapshot_id: str | None = None,
+    *,
+    snapshot_ids: Sequence[str] | None = None,
+    snapshot_ts_start: str | datetime | None = None,
+    snapshot_ts_end: str | datetime | None = None,
+) -> str | None:
+    """Blocking wrapper around submit_silver_merge; returns the MERGE job id."""
+    handle = submit_silver_merge(
+        snapshot_id,
+        snapshot_ids=snapshot_ids,
+        snapshot_ts_start=snapshot_ts_start,
+        snapshot_ts_end=snapshot_ts_end,
+    )
+    with stage("merge.wait"):
+        job = handle.wait()
+
     print(f"JobID {job.job_id}")
-    print(f"Successfully merged rows into {table_id}")
+    print(f"Successfully merged rows into {handle.context['table']}")
     return job.job_id
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Merge bronze snapshots into silver incident_current")
+
+    parser.add_argument(
+        "--snapshot-id",
+        dest="snapshot_ids",
+        action="append",
+        help="Snapshot to merge (repeatable; several ids are folded into one MERGE)",
+    )
+    parser.add_argument("--snapshot-ids-file", help="File with one snapshot_id per line (backlog)")
+    parser.add_argument("--from-ts", help="Merge every snapshot with snapshot_ts >= this ISO timestamp")
+    parser.add_argument("--to-ts", help="... and snapshot_ts < this ISO timestamp")
+    args = parser.parse_args()
+
+    snapshot_ids = list(args.snapshot_ids or [])
+    if args.snapshot_ids_file:
+        with open(args.snapshot_ids_file, "r", encoding="utf-8") as f:
+            snapshot_ids.extend(line.strip() for line in f if line.strip())
+
+    if (args.from_ts is None) != (args.to_ts is None):
+        parser.error("--from-ts and --to-ts must be given together")
+    if args.from_ts and snapshot_ids:
+        parser.error("use either snapshot ids or --from-ts/--to-ts, not both")
+
+    if args.from_ts:
+        run_silver_merge(snapshot_ts_start=args.from_ts, snapshot_ts_end=args.to_ts)
+    elif len(snapshot_ids) == 1:
+        run_silver_merge(snapshot_ids[0])
+    elif snapshot_ids:
+        run_silver_merge(snapshot_ids=snapshot_ids)
+    else:
+        run_silver_merge()
+
+
+if __name__ == "__main__":
+    main()
+
+# single snapshot -> python -m src.storage.bq_silver --snapshot-id <snapshot_id>
+# backlog (one MERGE) -> python -m src.storage.bq_silver --snapshot-id <a> --snapshot-id <b> ... | --snapshot-ids-file ids.txt | --from-ts 2026-01-01T00:00:00Z --to-ts 2026-02-01T00:00:00Z
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+
+# Every finished BqJobHandle reports its stats to the collectors active where
+# it was created (see collect_job_stats). Collectors live in a ContextVar, so
+# concurrent runs in one process (e.g. a sensor tick during a pipeline run)
+# only see their own jobs; handles poll on threads that run in a copy of the
+# submitter's context.
+_ACTIVE_COLLECTORS: contextvars.ContextVar[tuple[list[dict], ...]] = contextvars.ContextVar(
+    "bq_job_collectors", default=()
+)
+_LOCK = threading.Lock()
+
+
+def _ms_between(start: datetime | None, end: datetime | None) -> int | None:
+    if start is None or end is None:
+        return None
+    return int((end - start).total_seconds() * 1000)
+
+
+def _iso(dt: datetime | None) -> str | None:
+    return dt.isoformat().replace("+00:00", "Z") if dt is not None else None
+
+
+def _slot_ms(job) -> int | None:
+    # QueryJob exposes slot_millis; LoadJob only has it in the raw statistics.
+    value = getattr(job, "slot_millis", None)
+    if value is None:
+        stats = getattr(job, "_properties", {}).get("statistics", {})
+        value = stats.get("totalSlotMs")
+    return int(value) if value is not None else None
+
+
+def job_stats(job, *, kind: str | None = None, timings: dict | None = None) -> dict:
+    """
+    Cost/performance numbers for a finished BigQuery job.
+
+    queue_ms is created -> started (waiting for slots), run_ms is started -> ended.
+    rows_affected is DML affected rows for queries and output rows for loads.
+    """
+    created = getattr(job, "created", None)
+    started = getattr(job, "started", None)
+    ended = getattr(job, "ended", None)
+
+    rows_affected = getattr(job, "num_dml_affected_rows", None)
+    if rows_affected is None:
+        rows_affected = getattr(job, "output_rows", None)
+
+    return {
+        "job_id": job.job_id,
+        "kind": kind,
+        "job_type": getattr(job, "job_type", None),
+        "statement_type": getattr(job, "statement_type", None),
+        "state": getattr(job, "state", None),
+        "error": str(job.error_result) if getattr(job, "error_result", None) else None,
+        "created_at": _iso(created),
+        "queue_ms": _ms_between(created, started),
+        "run_ms": _ms_between(started, ended),
+        "total_ms": _ms_between(created, ended),
+        "bytes_processed": getattr(job, "total_bytes_processed", None),
+        "bytes_billed": getattr(job, "total_bytes_billed", None),
+        "input_bytes": getattr(job, "input_file_bytes", None),
+        "slot_ms": _slot_ms(job),
+        "rows_affected": rows_affected,
+        "cache_hit": getattr(job, "cache_hit", None),
+        **(timings or {}),
+    }
+
+
+def summarize_job_stats(stats: list[dict]) -> dict:
+    """Totals across jobs for quick metadata/log lines."""
+    def total(key: str) -> int:
+        return sum(s.get(key) or 0 for s in stats)
+
+    return {
+        "bq_job_count": len(stats),
+        "bq_bytes_processed": total("bytes_processed"),
+        "bq_bytes_billed": total("bytes_billed"),
+        "bq_slot_ms": total("slot_ms"),
+    }
+
+
+def record(stats: dict) -> None:
+    """Hand stats of a finished job to every collector active in this context."""
+    with _LOCK:
+        for collector in _ACTIVE_COLLECTORS.get():
+            collector.append(stats)
+
+
+@contextmanager
+def collect_job_stats() -> Iterator[list[dict]]:
+    """Collect stats of every BigQuery job started inside the block (in this context)."""
+    collected: list[dict] = []
+    token = _ACTIVE_COLLECTORS.set(_ACTIVE_COLLECTORS.get() + (collected,))
+    try:
+        yield collected
+    finally:
+        _ACTIVE_COLLECTORS.reset(token)
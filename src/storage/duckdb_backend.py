@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import argparse
+import re
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Sequence
+
+from src.ingestion.queries import DUCKDB_SNAPSHOT_FILTERS, build_duckdb_merge_sql, resolve_snapshot_selection
+from src.storage import bq_telemetry
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DDL_DIR = REPO_ROOT / "sql" / "ddl"
+
+BRONZE_TABLE = "traffic_bronze.traffic_incidents_raw"
+SILVER_TABLE = "traffic_silver.incident_current"
+
+# BigQuery -> DuckDB column types used in sql/ddl
+_TYPE_MAP = {
+    "STRING": "VARCHAR",
+    "FLOAT64": "DOUBLE",
+    "INT64": "BIGINT",
+    "TIMESTAMP": "TIMESTAMPTZ",
+    "BOOL": "BOOLEAN",
+}
+
+
+def _import_duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise RuntimeError("The duckdb backend requires the 'duckdb' package (pip install duckdb).") from e
+    return duckdb
+
+
+def translate_ddl(sql: str) -> list[str]:
+    """
+    Turn a BigQuery DDL file from sql/ddl into DuckDB statements.
+
+    `project.dataset.table` becomes dataset.table (a DuckDB schema), column types
+    are mapped (ARRAY<T> -> T[]) and PARTITION BY / CLUSTER BY clauses are dropped.
+    """
+    sql = re.sub(r"--[^\n]*", "", sql)
+    sql = re.sub(r"`[^`.]+\.(\w+)\.(\w+)`", r"\1.\2", sql)
+    sql = re.sub(r"\bPARTITION BY\b[^\n;]*", "", sql)
+    sql = re.sub(r"\bCLUSTER BY\b[^\n;]*", "", sql)
+    for bq_type, duck_type in _TYPE_MAP.items():
+        sql = re.sub(rf"\b{bq_type}\b", duck_type, sql)
+    sql = re.sub(r"\bARRAY<(\w+)>", r"\1[]", sql)
+
+    statements = []
+    for stmt in sql.split(";"):
+        stmt = stmt.strip()
+        if not stmt:
+            continue
+        for schema in re.findall(r"CREATE TABLE IF NOT EXISTS (\w+)\.", stmt):
+            statements.append(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        statements.append(stmt)
+    return statements
+
+
+def _stats(kind: str, statement_id: str, started: float, rows: int | None) -> dict:
+    elapsed_ms = int((time.perf_counter() - started) * 1000)
+    return {
+        "job_id": statement_id,
+        "kind": kind,
+        "job_type": "duckdb",
+        "state": "DONE",
+        "error": None,
+        "queue_ms": 0,
+        "run_ms": elapsed_ms,
+        "total_ms": elapsed_ms,
+        "bytes_processed": None,
+        "bytes_billed": None,
+        "slot_ms": None,
+        "rows_affected": rows,
+    }
+
+
+class DuckDBBackend:
+    """
+    Embedded warehouse for offline runs and benchmarks.
+
+    Tables are created from sql/ddl on first use; the silver MERGE mirrors
+    MERGE_SQL_TEMPLATE, so load + merge behave like BigQuery without a project.
+    Job-style stats (rows, elapsed ms) are reported through bq_telemetry.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, database: str | Path = ":memory:") -> None:
+        duckdb = _import_duckdb()
+
+        if str(database) != ":memory:":
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+
+        self.database = str(database)
+        self.conn = duckdb.connect(self.database)
+        self.conn.execute("SET TimeZone = 'UTC'")
+        self.create_tables()
+
+    @property
+    def bronze_target(self) -> str:
+        # An in-memory database starts empty: never share ledger entries with another.
+        if self.database == ":memory:":
+            return f":memory:{id(self.conn)}:{BRONZE_TABLE}"
+        return f"{Path(self.database).resolve()}:{BRONZE_TABLE}"
+
+    def create_tables(self) -> None:
+        for ddl_path in sorted(DDL_DIR.glob("*.sql")):
+            for stmt in translate_ddl(ddl_path.read_text(encoding="utf-8")):
+                self.conn.execute(stmt)
+
+    def _columns(self, table: str) -> dict[str, str]:
+        rows = self.conn.execute(f"DESCRIBE {table}").fetchall()
+        return {name: col_type for name, col_type, *_ in rows}
+
+    def load_jsonl(self, jsonl_path: str | Path) -> int | None:
+        jsonl_path = Path(jsonl_path)
+
+        if not jsonl_path.exists():
+            raise FileNotFoundError(f"Input file not found: {jsonl_path}")
+        if jsonl_path.stat().st_size == 0:
+            raise RuntimeError(f"Input file is empty: {jsonl_path}")
+
+        columns = self._columns(BRONZE_TABLE)
+        column_spec = "{" + ", ".join(f"'{name}': '{col_type}'" for name, col_type in columns.items()) + "}"
+        column_list = ", ".join(columns)
+
+        started = time.perf_counter()
+        before = self.conn.execute(f"SELECT count(*) FROM {BRONZE_TABLE}").fetchone()[0]
+        self.conn.execute(
+            f"""
+            INSERT INTO {BRONZE_TABLE} ({column_list})
+            SELECT {column_list}
+            FROM read_json(?, format = 'newline_delimited', columns = {column_spec})
+            """,
+            [str(jsonl_path)],
+        )
+        after = self.conn.execute(f"SELECT count(*) FROM {BRONZE_TABLE}").fetchone()[0]
+        rows = after - before
+
+        bq_telemetry.record(_stats("load", f"duckdb_load_{uuid.uuid4().hex[:12]}", started, rows))
+        print(f"Loaded {rows} rows into {self.database}:{BRONZE_TABLE}")
+        return rows
+
+    def merge_silver(
+        self,
+        snapshot_id: str | None = None,
+        *,
+        snapshot_ids: Sequence[str] | None = None,
+        snapshot_ts_start: str | datetime | None = None,
+        snapshot_ts_end: str | datetime | None = None,
+    ) -> str | None:
+        kind, params = resolve_snapshot_selection(
+            snapshot_id=snapshot_id,
+            snapshot_ids=snapshot_ids,
+            snapshot_ts_start=snapshot_ts_start,
+            snapshot_ts_end=snapshot_ts_end,
+        )
+        if kind == "snapshot_id" and params["snapshot_id"] is None:
+            row = self.conn.execute(
+                f"SELECT snapshot_id FROM {BRONZE_TABLE} ORDER BY snapshot_ts DESC, snapshot_id DESC LIMIT 1"
+            ).fetchone()
+            if row is None:
+                raise RuntimeError(f"No snapshot_id found in {BRONZE_TABLE}")
+            params["snapshot_id"] = row[0]
+            print(f"[silver] auto snapshot_id = {params['snapshot_id']}")
+        snapshot_filter = DUCKDB_SNAPSHOT_FILTERS[kind]
+
+        merge_sql = build_duckdb_merge_sql(
+            bronze_table=BRONZE_TABLE,
+            silver_table=SILVER_TABLE,
+            snapshot_filter=snapshot_filter,
+        )
+
+        statement_id = f"duckdb_merge_{uuid.uuid4().hex[:12]}"
+        started = time.perf_counter()
+        row = self.conn.execute(merge_sql, params).fetchone()
+        rows_affected = int(row[0]) if row else None
+
+        bq_telemetry.record(_stats("merge", statement_id, started, rows_affected))
+        print(f"Successfully merged rows into {self.database}:{SILVER_TABLE}")
+        return statement_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load/merge into the local DuckDB warehouse")
+
+    parser.add_argument("--db", default="data/warehouse/traffic.duckdb", help="DuckDB database file")
+    parser.add_argument("--in", dest="in_path", help="Bronze .jsonl file to load")
+    parser.add_argument("--merge", action="store_true", help="Merge the latest (or --snapshot-id) snapshot into silver")
+    parser.add_argument("--snapshot-id", dest="snapshot_ids", action="append")
+    args = parser.parse_args()
+
+    backend = DuckDBBackend(args.db)
+    if args.in_path:
+        backend.load_jsonl(args.in_path)
+    if args.merge:
+        ids = args.snapshot_ids or []
+        if len(ids) > 1:
+            backend.merge_silver(snapshot_ids=ids)
+        else:
+            backend.merge_silver(ids[0] if ids else None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator
+
+from src.common.instrumentation import stage
+from src.storage.backend import WarehouseBackend
+from src.storage.bq_control import lookup_load_ledger, record_load_ledger
+from src.storage.bq_telemetry import collect_job_stats
+from src.utils.file_utils import file_lock, open_text
+
+
+# A file is identified by its rows, not by its name or snapshot: re-running a
+# pull gives the same rows under a new snapshot_id, so the snapshot metadata is
+# left out of the hash. A file whose hash is in the ledger for the same bronze
+# table (WarehouseBackend.bronze_target) is not loaded again; another DuckDB
+# file or BigQuery project/dataset has its own entries. A bronze table that was
+# dropped and recreated under the same name still needs force (replay --force).
+#
+# Lookup, load and record run under a lock per hash bucket, so concurrent
+# processes (e.g. partitioned backfills) cannot both miss the ledger and both
+# load the same rows, while loads of different files still run in parallel.
+#
+# LOAD_LEDGER selects where the ledger lives:
+#   local    state/load_ledger.jsonl (default)
+#   control  local + traffic_control.load_ledger (BigQuery backend only), so
+#            retries on another host are caught too
+#   off      no ledger, every load appends
+LEDGER_MODES = ("local", "control", "off")
+DEFAULT_LEDGER_PATH = os.path.join("state", "load_ledger.jsonl")     # LOAD_LEDGER_PATH overrides
+
+META_FIELDS = frozenset({"snapshot_id", "snapshot_ts", "run_type", "query_name"})
+
+_LOCK = threading.Lock()
+
+
+def ledger_mode() -> str:
+    mode = os.getenv("LOAD_LEDGER", "local")
+    if mode not in LEDGER_MODES:
+        raise ValueError(f"Unknown LOAD_LEDGER mode: {mode} (expected one of {LEDGER_MODES})")
+    return mode
+
+
+def ledger_path() -> str:
+    return os.getenv("LOAD_LEDGER_PATH", DEFAULT_LEDGER_PATH)
+
+
+def content_hash(path: str | Path, on_row: Callable[[dict], None] | None = None) -> dict:
+    """
+    sha256 over the file's rows without snapshot metadata, plus rows, snapshot
+    ids and the earliest snapshot_ts.
+
+    Gzipped files hash the same as their plain originals. on_row sees every
+    parsed row, for callers that need more than the hash from the same pass.
+    """
+    digest = hashlib.sha256()
+    rows = 0
+    snapshot_ids: set[str] = set()
+    snapshot_ts: str | None = None
+
+    with open_text(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if on_row is not None:
+                on_row(row)
+            if row.get("snapshot_id"):
+                snapshot_ids.add(row["snapshot_id"])
+            # ISO-8601 UTC "Z" strings order by time
+            if row.get("snapshot_ts") and (snapshot_ts is None or row["snapshot_ts"] < snapshot_ts):
+                snapshot_ts = row["snapshot_ts"]
+            content = {k: v for k, v in row.items() if k not in META_FIELDS}
+            digest.update(json.dumps(content, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+            digest.update(b"\n")
+            rows += 1
+
+    return {
+        "content_hash": digest.hexdigest(),
+        "rows": rows,
+        "snapshot_ids": sorted(snapshot_ids),
+        "snapshot_ts": snapshot_ts,
+    }
+
+
+# --------- Local ledger ---------
+
+def _lookup_local(file_content_hash: str, backend: str, target: str, path: str) -> dict | None:
+    if not os.path.exists(path):
+        return None
+    found = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            # entries without a target predate it and cannot tell which table they went into
+            if entry["content_hash"] == file_content_hash and entry["backend"] == backend and entry.get("target") == target:
+                found = entry
+    return found
+
+
+def _record_local(entry: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with _LOCK, open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def _lock_path(file_content_hash: str) -> str:
+    # 256 buckets: a bounded number of lock files, rarely shared by two different files
+    return os.path.join(f"{ledger_path()}.locks", f"{file_content_hash[:2]}.lock")
+
+
+# --------- API ---------
+
+def lookup(file_hash: dict, warehouse: WarehouseBackend) -> dict | None:
+    """Prior load of the same content into this backend's bronze table, or None."""
+    mode = ledger_mode()
+    if mode == "off":
+        return None
+
+    target = warehouse.bronze_target
+    entry = _lookup_local(file_hash["content_hash"], warehouse.name, target, ledger_path())
+    if entry is None and mode == "control" and warehouse.name == "bigquery":
+        entry = lookup_load_ledger(file_hash["content_hash"], warehouse.name, target)
+    return entry
+
+
+def record(file_hash: dict, warehouse: WarehouseBackend, *, path: str | Path, load_job_id: str | None) -> dict:
+    entry = {
+        **file_hash,
+        "backend": warehouse.name,
+        "target": warehouse.bronze_target,
+        "path": str(path),
+        "load_job_id": load_job_id,
+        "loaded_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+    mode = ledger_mode()
+    if mode == "off":
+        return entry
+
+    _record_local(entry, ledger_path())
+    if mode == "control" and warehouse.name == "bigquery":
+        record_load_ledger(entry)
+    return entry
+
+
+@contextmanager
+def claim(file_hash: dict) -> Iterator[None]:
+    """
+    Hold the hash's ledger lock from lookup until the load is recorded.
+
+    A second process loading the same rows waits here and then finds the
+    first one's entry. No lock when the ledger is off.
+    """
+    if ledger_mode() == "off":
+        yield
+        return
+    with file_lock(_lock_path(file_hash["content_hash"])):
+        yield
+
+
+def load_once(warehouse: WarehouseBackend, path: str | Path) -> dict:
+    """
+    Load a bronze JSONL file unless the same rows were already loaded.
+
+    Returns rows_loaded (0 when skipped), load_job_id (the prior job's id when
+    skipped), skipped, and snapshot_ids: the snapshots the rows are stored
+    under in bronze, which is what a silver MERGE must read. snapshot_ts is the
+    earliest of those snapshots' snapshot_ts.
+    """
+    with stage("load.hash") as s:
+        file_hash = content_hash(path)
+        s.add(rows=file_hash["rows"])
+
+    with claim(file_hash):
+        prior = lookup(file_hash, warehouse)
+        if prior is not None:
+            print(
+                f"[ledger] skipped load, content already loaded: {path} "
+                f"hash={file_hash['content_hash'][:12]} job_id={prior['load_job_id']} at={prior['loaded_at']}"
+            )
+            return {
+                "rows_loaded": 0,
+                "load_job_id": prior["load_job_id"],
+                "skipped": True,
+                "snapshot_ids": prior["snapshot_ids"],
+                "snapshot_ts": prior.get("snapshot_ts"),
+                "content_hash": file_hash["content_hash"],
+            }
+
+        with collect_job_stats() as jobs:
+            rows_loaded = warehouse.load_jsonl(path) or 0
+        load_job_id = next((j["job_id"] for j in jobs if j["kind"] == "load"), None)
+
+        record(file_hash, warehouse, path=path, load_job_id=load_job_id)
+
+    return {
+        "rows_loaded": rows_loaded,
+        "load_job_id": load_job_id,
+        "skipped": False,
+        "snapshot_ids": file_hash["snapshot_ids"],
+        "snapshot_ts": file_hash["snapshot_ts"],
+        "content_hash": file_hash["content_hash"],
+    }
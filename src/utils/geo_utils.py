@@ -0,0 +1,80 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+LOCATION_KEY_SCHEMES = ("round", "geohash")
+
+# Default precision per scheme: decimal places for "round", characters for "geohash".
+DEFAULT_PRECISION = {"round": 3, "geohash": 7}
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def _round_str(value: float, places: int) -> str:
+    # Round half away from zero and drop trailing zeros, same as
+    # CAST(ROUND(x, places) AS STRING) in BigQuery (51.0 -> "51").
+    d = Decimal(repr(value)).quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_UP)
+    return format(d.normalize(), "f")
+
+
+def geohash(lat: float, lon: float, precision: int) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+
+    chars = []
+    bits = 0
+    n_bits = 0
+    even = True     # geohash interleaves bits starting with longitude
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                bits = (bits << 1) | 1
+                lon_lo = mid
+            else:
+                bits <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+
+        n_bits += 1
+        if n_bits == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            n_bits = 0
+
+    return "".join(chars)
+
+
+def location_key(
+    quadrant: str | None,
+    lat: float | None,
+    lon: float | None,
+    *,
+    scheme: str = "round",
+    precision: int | None = None,
+) -> str | None:
+    """
+    Location bucket key used by dim_location.
+
+    - round:   "<quadrant>_<round(lat, p)>_<round(lon, p)>" (p=3 is the key dbt used to build)
+    - geohash: "<quadrant>_<geohash(lat, lon, p)>"
+
+    None if any input is missing, like the SQL concat it replaces.
+    """
+    if scheme not in LOCATION_KEY_SCHEMES:
+        raise ValueError(f"Unknown location key scheme: {scheme} (expected one of {LOCATION_KEY_SCHEMES})")
+    if quadrant is None or lat is None or lon is None:
+        return None
+
+    precision = DEFAULT_PRECISION[scheme] if precision is None else precision
+
+    if scheme == "geohash":
+        return f"{quadrant}_{geohash(lat, lon, precision)}"
+    return f"{quadrant}_{_round_str(lat, precision)}_{_round_str(lon, precision)}"
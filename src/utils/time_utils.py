@@ -9,4 +9,18 @@ def month_bounds(month: str) -> tuple[datetime, datetime]:
     else:
         end = datetime(start.year, start.month + 1, 1, tzinfo=timezone.utc)
 
-    return start, end
\ No newline at end of file
+    return start, end
+
+def month_range(start_month: str, end_month: str) -> list[str]:
+    # inclusive list of 'YYYY-MM' strings from start_month to end_month
+    start, _ = month_bounds(start_month)
+    end, _ = month_bounds(end_month)
+    if end < start:
+        raise ValueError(f"end month {end_month} is before start month {start_month}")
+
+    months = []
+    current = start
+    while current <= end:
+        months.append(current.strftime("%Y-%m"))
+        _, current = month_bounds(months[-1])
+    return months
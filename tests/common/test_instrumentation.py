@@ -0,0 +1,100 @@
+import contextvars
+import threading
+from datetime import datetime, timezone
+
+import src.common.instrumentation as instrumentation
+import src.ingestion.runner as runner
+from src.common.instrumentation import collect_stages, count, stage, summarize_stages, timed
+from src.ingestion.mappers import IngestionMeta
+
+
+def test_stage_is_a_shared_noop_without_a_collector():
+    assert stage("validate") is stage("map")
+    with stage("validate") as s:
+        s.add(rows=10)
+
+
+def test_stages_reach_every_active_collector_from_the_runs_threads():
+    @timed("decorated")
+    def work():
+        with stage("inner", rows=5) as s:
+            s.add(bytes=100)
+
+    with collect_stages() as outer:
+        with collect_stages() as inner:
+            work()
+        # a pool/worker thread reports to the run that handed it work in its context
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(work,))
+        thread.start()
+        thread.join()
+        count("counted", rows=3)
+
+    assert inner["inner"].calls == 1
+    assert outer["inner"].calls == 2
+    assert outer["inner"].rows == 10 and outer["inner"].bytes == 200
+    assert outer["decorated"].calls == 2
+    assert outer["counted"].rows == 3 and outer["counted"].seconds == 0.0
+    assert instrumentation._ACTIVE_COLLECTORS.get() == ()
+
+    summary = summarize_stages(outer)["stages"]
+    assert set(summary["inner"]) == {"seconds", "calls", "rows", "bytes", "rows_per_sec"}
+
+
+def test_concurrent_runs_only_collect_their_own_stages():
+    barrier = threading.Barrier(2)
+    collected = {}
+
+    def run(name):
+        with collect_stages() as stages:
+            barrier.wait()
+            with stage(name):
+                pass
+            barrier.wait()
+        collected[name] = set(stages)
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in ("pipeline", "sensor")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert collected == {"pipeline": {"pipeline"}, "sensor": {"sensor"}}
+
+
+def test_disabled_collects_nothing(monkeypatch):
+    monkeypatch.setattr(instrumentation, "ENABLED", False)
+
+    with collect_stages() as stages:
+        with stage("validate"):
+            pass
+
+    assert stages == {}
+
+
+def test_pull_reports_per_stage_rows_and_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "TrafficIncidentRow", type(
+        "X", (), {"model_validate": staticmethod(lambda raw: raw)}
+    ))
+    monkeypatch.setattr(runner, "to_bronze_row", lambda meta, validated: validated)
+
+    def fake_post_query(soql, *, page_number, page_size, headers=None):
+        start = (page_number - 1) * page_size
+        return [{"incident_id": f"inc_{i}"} for i in range(start, min(start + page_size, 25))]
+
+    monkeypatch.setattr(runner, "post_query", fake_post_query)
+    meta = IngestionMeta(
+        snapshot_id="snap_test",
+        snapshot_ts=datetime(2026, 2, 17, 12, 0, tzinfo=timezone.utc),
+        run_type="daily",
+        query_name="incremental",
+    )
+
+    with collect_stages() as stages:
+        stats = runner._pull_pages_to_ndjson(
+            soql="SELECT *", page_size=10, max_pages=None, meta=meta, out_path=str(tmp_path / "out.jsonl"),
+        )
+
+    for name in ("validate", "map", "serialize", "file_io"):
+        assert stages[name].rows == 25
+        assert stages[name].calls == 3
+    assert stages["file_io"].bytes == stats.bytes_written
@@ -0,0 +1,57 @@
+import threading
+
+from src.common.instrumentation import stage
+from src.common.profiling import profile_prefix, profile_run
+
+
+def _inside_stage():
+    return sum(i * i for i in range(20_000))
+
+
+def _outside_stage():
+    return sorted(range(20_000), reverse=True)
+
+
+def _work():
+    with stage("validate"):
+        _inside_stage()
+    _outside_stage()
+
+
+def test_profile_prefix_sits_next_to_the_output():
+    assert str(profile_prefix("data/raw/backfill/2026_01.jsonl")) == "data/raw/backfill/2026_01"
+    assert str(profile_prefix("data/raw/backfill")) == "data/raw/backfill/profile"
+
+
+def test_profile_run_writes_stats_and_collapsed_stacks(tmp_path):
+    with profile_run(tmp_path / "run") as prof:
+        _work()
+
+    result = prof.result
+    assert (tmp_path / "run.prof").exists()
+    collapsed = (tmp_path / "run.collapsed").read_text().splitlines()
+    assert collapsed and all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
+    functions = [row["function"] for row in result["top_functions"]]
+    assert any("_inside_stage" in f or "<genexpr>" in f for f in functions)
+    assert any("_outside_stage" in f or "sorted" in f for f in functions)
+
+
+def test_stage_profile_only_sees_the_stage_in_every_thread(tmp_path):
+    with profile_run(tmp_path / "run", stage="validate") as prof:
+        _work()
+        worker = threading.Thread(target=_work)
+        worker.start()
+        worker.join()
+
+    functions = [row["function"] for row in prof.result["top_functions"]]
+    assert prof.result["stage"] == "validate"
+    assert any("_inside_stage" in f for f in functions)
+    assert not any("_outside_stage" in f for f in functions)
+
+
+def test_disabled_profile_writes_nothing(tmp_path):
+    with profile_run(tmp_path / "run", enabled=False) as prof:
+        _work()
+
+    assert prof.result is None
+    assert not list(tmp_path.iterdir())
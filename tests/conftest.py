@@ -1,5 +1,13 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
-sys.path.insert(0, str(ROOT / "src"))
\ No newline at end of file
+sys.path.insert(0, str(ROOT / "src"))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_load_ledger(tmp_path, monkeypatch):
+    # Loads record their content hash in the ledger; keep it out of the repo's state/.
+    monkeypatch.setenv("LOAD_LEDGER_PATH", str(tmp_path / "load_ledger.jsonl"))
@@ -0,0 +1,32 @@
+import pytest
+
+from src.utils.geo_utils import geohash, location_key
+
+
+def test_round_key_matches_dbt_concat_format():
+    # CAST(ROUND(x, 3) AS STRING) in BigQuery: trailing zeros dropped
+    assert location_key("NW", 51.0447, -114.0719) == "NW_51.045_-114.072"
+    assert location_key("SE", 51.0, -114.1) == "SE_51_-114.1"
+
+
+def test_round_key_rounds_half_away_from_zero():
+    assert location_key("NE", 51.0445, -114.0445) == "NE_51.045_-114.045"
+
+
+def test_round_key_precision_is_configurable():
+    assert location_key("SW", 51.04471, -114.07191, precision=2) == "SW_51.04_-114.07"
+
+
+def test_geohash_key():
+    assert geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert location_key("NW", 57.64911, 10.40744, scheme="geohash", precision=5) == "NW_u4pru"
+
+
+def test_missing_inputs_give_no_key():
+    assert location_key(None, 51.0, -114.0) is None
+    assert location_key("NW", None, -114.0) is None
+
+
+def test_unknown_scheme_raises():
+    with pytest.raises(ValueError):
+        location_key("NW", 51.0, -114.0, scheme="h3")
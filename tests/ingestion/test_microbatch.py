@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+import src.ingestion.microbatch as microbatch
+from src.storage.duckdb_backend import DuckDBBackend
+
+
+def _row(snapshot_id, incident_id, updated_at):
+    return {
+        "snapshot_id": snapshot_id,
+        "snapshot_ts": "2026-02-17T12:00:00Z",
+        "run_type": "daily",
+        "query_name": "incremental",
+        "incident_id": incident_id,
+        "incident_info": "Collision",
+        "description": "Collision description",
+        "start_ts": "2026-02-17T10:00:00Z",
+        "modified_ts": None,
+        "quadrant": "NW",
+        "longitude": -114.0719,
+        "latitude": 51.0447,
+        "location_key": "NW_51.045_-114.072",
+        "count": 1,
+        "source_row_id": f"row-{incident_id}",
+        "source_version": "v1",
+        "source_created_at": "2026-02-17T10:00:00Z",
+        "source_updated_at": updated_at,
+    }
+
+
+def _spool(spool_dir, name, snapshot_id, rows):
+    path = spool_dir / f"pull_{name}.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    path.with_suffix(".meta.json").write_text(json.dumps({"snapshot_id": snapshot_id, "rows_written": len(rows)}))
+
+
+def test_flush_loads_all_spooled_pulls_as_one_batch(tmp_path, monkeypatch):
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "warehouse.duckdb"))
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+
+    _spool(spool_dir, "1", "snap_1", [_row("snap_1", "inc_a", "2026-02-17T10:00:00Z")])
+    _spool(spool_dir, "2", "snap_2", [
+        _row("snap_2", "inc_a", "2026-02-17T10:05:00Z"),
+        _row("snap_2", "inc_b", "2026-02-17T10:06:00Z"),
+    ])
+
+    status = microbatch.spool_status(str(spool_dir))
+    assert status["files"] == 2
+    assert status["rows"] == 3
+    assert microbatch.should_flush(status, max_rows=3, max_age_minutes=60)
+    assert not microbatch.should_flush(status, max_rows=10, max_age_minutes=60)
+
+    result = microbatch.flush_spool(spool_dir=str(spool_dir), batch_dir=str(tmp_path), backend="duckdb")
+
+    assert result["flushed"] is True
+    assert result["rows_loaded"] == 3
+    assert result["snapshot_ids"] == ["snap_1", "snap_2"]
+    assert result["latency_max_s"] >= result["latency_p50_s"] > 0
+    # one load + one merge for the whole spool
+    assert [job["kind"] for job in result["bq_jobs"]] == ["load", "merge"]
+    assert list(spool_dir.iterdir()) == []
+
+
+def test_flush_retried_after_merge_failure_reloads_the_same_batch(tmp_path, monkeypatch):
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "warehouse.duckdb"))
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    _spool(spool_dir, "1", "snap_1", [_row("snap_1", "inc_a", "2026-02-17T10:00:00Z")])
+
+    real_merge = DuckDBBackend.merge_silver
+    calls = []
+
+    def merge_fails_once(self, *args, **kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise RuntimeError("merge failed")
+        return real_merge(self, *args, **kwargs)
+
+    monkeypatch.setattr(DuckDBBackend, "merge_silver", merge_fails_once)
+
+    with pytest.raises(RuntimeError, match="merge failed"):
+        microbatch.flush_spool(spool_dir=str(spool_dir), batch_dir=str(tmp_path), backend="duckdb")
+    assert microbatch.spool_status(str(spool_dir))["pending_batches"] == 1
+
+    # the next tick spools another pull before flushing
+    _spool(spool_dir, "2", "snap_2", [_row("snap_2", "inc_b", "2026-02-17T10:06:00Z")])
+    status = microbatch.spool_status(str(spool_dir))
+    assert microbatch.should_flush(status, max_rows=100, max_age_minutes=60)
+
+    retried = microbatch.flush_spool(spool_dir=str(spool_dir), batch_dir=str(tmp_path), backend="duckdb")
+    assert retried["load_skipped"] is True
+    assert retried["snapshot_ids"] == ["snap_1"]
+
+    following = microbatch.flush_spool(spool_dir=str(spool_dir), batch_dir=str(tmp_path), backend="duckdb")
+    assert following["load_skipped"] is False
+    assert following["snapshot_ids"] == ["snap_2"]
+
+    bronze = DuckDBBackend(str(tmp_path / "warehouse.duckdb")).conn.execute(
+        "SELECT snapshot_id, count(*) FROM traffic_bronze.traffic_incidents_raw GROUP BY 1 ORDER BY 1"
+    ).fetchall()
+    assert bronze == [("snap_1", 1), ("snap_2", 1)]
+    assert list(spool_dir.glob("pull_*")) == []
+    assert microbatch.spool_status(str(spool_dir))["pending_batches"] == 0
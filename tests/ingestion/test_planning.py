@@ -0,0 +1,105 @@
+import json
+from datetime import datetime, timezone
+
+import src.ingestion.planning as planning
+import src.ingestion.runner as runner
+from src.ingestion.mappers import IngestionMeta
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_slice_days_covers_the_window_exactly():
+    rows_by_day = {"2026-01-01": 10, "2026-01-02": 10, "2026-01-03": 10, "2026-01-04": 10}
+
+    slices = planning.slice_days(rows_by_day, start=_utc(2026, 1, 1), end=_utc(2026, 2, 1), rows_per_slice=20)
+
+    assert slices == [
+        (_utc(2026, 1, 1), _utc(2026, 1, 3)),
+        (_utc(2026, 1, 3), _utc(2026, 2, 1)),
+    ]
+
+
+def test_slice_days_keeps_a_single_slice_for_small_windows():
+    slices = planning.slice_days({"2026-01-05": 3}, start=_utc(2026, 1, 4, 23, 55), end=None, rows_per_slice=20)
+
+    assert slices == [(_utc(2026, 1, 4, 23, 55), None)]
+
+
+def test_plan_window_sizes_pages_slices_and_workers(monkeypatch):
+    captured = {}
+
+    def fake_post_query(soql, *, page_number, page_size, headers=None):
+        captured["soql"] = soql
+        return [{"day": f"2026-01-0{d}T00:00:00.000", "n": str(n)} for d, n in [(1, 150), (2, 150), (3, 40)]]
+
+    monkeypatch.setattr(runner, "post_query", fake_post_query)
+
+    plan = planning.plan_window(
+        field_name="start_dt",
+        where="WHERE start_dt >= '2026-01-01T00:00:00.000' ",
+        start=_utc(2026, 1, 1),
+        end=_utc(2026, 2, 1),
+        max_page_size=1000,
+        rows_per_slice=150,
+        max_workers=2,
+    )
+
+    assert "GROUP BY day" in captured["soql"]
+    assert plan.expected_rows == 340
+    assert plan.rows_by_day == {"2026-01-01": 150, "2026-01-02": 150, "2026-01-03": 40}
+    assert len(plan.slices) == 3
+    assert plan.workers == 2
+    # largest slice (150 rows) fits one short page
+    assert plan.page_size == 200
+    assert plan.expected_pages == 3
+    assert plan.as_dict()["slices"][0] == ["2026-01-01T00:00:00Z", "2026-01-02T00:00:00Z"]
+
+
+def test_sliced_pull_stitches_parts_in_window_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "TrafficIncidentRow", type(
+        "X", (), {"model_validate": staticmethod(lambda raw: raw)}
+    ))
+    monkeypatch.setattr(runner, "to_bronze_row", lambda meta, validated: validated)
+
+    by_start = {
+        "2026-01-01": [{"incident_id": "a", "source_updated_at": "2026-01-01T10:00:00Z"}],
+        "2026-01-02": [{"incident_id": "b", "source_updated_at": "2026-01-02T10:00:00Z"},
+                       {"incident_id": "a", "source_updated_at": "2026-01-02T11:00:00Z"}],
+    }
+
+    def fake_post_query(soql, *, page_number, page_size, headers=None):
+        if page_number > 1:
+            return []
+        for day, rows in by_start.items():
+            if f"start_dt >= '{day}" in soql:
+                return rows
+        return []
+
+    monkeypatch.setattr(runner, "post_query", fake_post_query)
+
+    out_path = tmp_path / "out.jsonl"
+    meta = IngestionMeta(
+        snapshot_id="snap_test",
+        snapshot_ts=_utc(2026, 2, 1),
+        run_type="monthly",
+        query_name="backfill",
+    )
+
+    stats = runner._pull_slices(
+        field="start_dt",
+        slices=[(_utc(2026, 1, 1), _utc(2026, 1, 2)), (_utc(2026, 1, 2), _utc(2026, 1, 3))],
+        page_size=10,
+        meta=meta,
+        out_path=str(out_path),
+        workers=2,
+    )
+
+    lines = [json.loads(line) for line in out_path.read_text().splitlines()]
+    assert [r["incident_id"] for r in lines] == ["a", "b", "a"]
+    assert stats.rows_written == 3
+    assert stats.distinct_incidents == 2
+    assert stats.stop_reason == "exhausted"
+    assert stats.max_source_updated_at == _utc(2026, 1, 2, 11)
+    assert not list(tmp_path.glob("*.part*"))
@@ -0,0 +1,213 @@
+import json
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import src.ingestion.runner as runner
+from src.ingestion.mappers import IngestionMeta
+from src.ingestion.runner import PullBudget, PullStats
+
+
+def _meta():
+    return IngestionMeta(
+        snapshot_id="snap_test",
+        snapshot_ts=datetime(2026, 2, 17, 12, 0, tzinfo=timezone.utc),
+        run_type="monthly",
+        query_name="backfill",
+    )
+
+
+def _fake_source(monkeypatch, total_rows, max_page_size=None):
+    """Endpoint with total_rows rows, capping pageSize at max_page_size; records the page numbers requested."""
+    monkeypatch.setattr(runner, "TrafficIncidentRow", type(
+        "X", (), {"model_validate": staticmethod(lambda raw: raw)}
+    ))
+    monkeypatch.setattr(runner, "to_bronze_row", lambda meta, validated: validated)
+
+    requested = []
+
+    def fake_post_query(soql, *, page_number, page_size, headers=None):
+        requested.append(page_number)
+        page_size = min(page_size, max_page_size or page_size)
+        start = (page_number - 1) * page_size
+        return [
+            {"incident_id": f"inc_{i}", "source_updated_at": f"2026-02-17T10:00:{i % 60:02d}Z"}
+            for i in range(start, min(start + page_size, total_rows))
+        ]
+
+    monkeypatch.setattr(runner, "post_query", fake_post_query)
+    return requested
+
+
+def test_exhaustive_pull_stops_on_short_page(tmp_path, monkeypatch):
+    requested = _fake_source(monkeypatch, total_rows=25)
+
+    stats = runner._pull_pages_to_ndjson(
+        soql="SELECT *", page_size=10, max_pages=None, meta=_meta(), out_path=str(tmp_path / "out.jsonl"),
+    )
+
+    assert requested == [1, 2, 3]
+    assert stats.rows_written == 25
+    assert stats.stop_reason == "exhausted"
+    assert not stats.truncated
+    assert stats.resume_from is None
+    assert stats.bytes_written == (tmp_path / "out.jsonl").stat().st_size
+
+
+def test_api_page_cap_below_page_size_is_not_the_end(tmp_path, monkeypatch):
+    requested = _fake_source(monkeypatch, total_rows=25, max_page_size=4)
+
+    stats = runner._pull_pages_to_ndjson(
+        soql="SELECT *", page_size=10, max_pages=None, meta=_meta(), out_path=str(tmp_path / "out.jsonl"),
+    )
+
+    assert stats.rows_written == 25
+    assert stats.stop_reason == "exhausted"
+    # pages of 4, the last one short
+    assert requested == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_max_pages_cap_is_reported_as_truncation(tmp_path, monkeypatch):
+    _fake_source(monkeypatch, total_rows=100)
+
+    stats = runner._pull_pages_to_ndjson(
+        soql="SELECT *", page_size=10, max_pages=2, meta=_meta(), out_path=str(tmp_path / "out.jsonl"),
+        resume_column="source_updated_at",
+    )
+
+    assert stats.rows_written == 20
+    assert stats.stop_reason == "max_pages"
+    assert stats.truncated
+    # the window field of the last row written
+    assert stats.resume_from == datetime(2026, 2, 17, 10, 0, 19, tzinfo=timezone.utc)
+
+
+def _fake_backfill_source(monkeypatch, rows):
+    """Offset-paged endpoint over rows (incident_id, start_ts), honouring start_dt >= '...' and ORDER BY start_dt, :id."""
+    monkeypatch.setattr(runner, "TrafficIncidentRow", type(
+        "X", (), {"model_validate": staticmethod(lambda raw: raw)}
+    ))
+    monkeypatch.setattr(runner, "to_bronze_row", lambda meta, validated: validated)
+
+    def fake_post_query(soql, *, page_number, page_size, headers=None):
+        start = datetime.fromisoformat(re.search(r"start_dt >= '([^']+)'", soql).group(1))
+        matching = sorted(
+            (r for r in rows if datetime.fromisoformat(r["start_ts"]).replace(tzinfo=None) >= start),
+            key=lambda r: (r["start_ts"], r["incident_id"]),
+        )
+        offset = (page_number - 1) * page_size
+        return matching[offset:offset + page_size]
+
+    monkeypatch.setattr(runner, "post_query", fake_post_query)
+
+
+def _backfill_row(i, start):
+    return {"incident_id": f"inc_{i:03d}", "start_ts": start.isoformat()}
+
+
+def _pulled_ids(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["incident_id"] for line in f]
+
+
+@pytest.mark.parametrize("new_start_hour", [0, 23])
+def test_row_budget_stops_between_pages_and_resumes_by_start_dt(tmp_path, monkeypatch, new_start_hour):
+    monkeypatch.setattr(runner, "STATE_DIR", str(tmp_path))
+    month_start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    # two rows per hour, so the stop lands among ties of start_dt
+    rows = [_backfill_row(i, month_start + timedelta(hours=i // 2)) for i in range(60)]
+    _fake_backfill_source(monkeypatch, rows)
+
+    _, stats = runner.backfill(
+        month="2026-01", page_size=10, max_pages=None, budget=PullBudget(max_rows=25),
+        out_path=str(tmp_path / "first.jsonl"),
+    )
+    assert stats.rows_written == 30
+    assert stats.stop_reason == "row_budget"
+    assert stats.resume_from == month_start + timedelta(hours=14)
+    runner._update_checkpoint(runner._backfill_checkpoint_key("2026-01"), "snap_1", stats)
+
+    # a row lands before (or after) the stop point in between: offset pages would shift
+    rows.append(_backfill_row(99, month_start + timedelta(hours=new_start_hour, minutes=30)))
+
+    start = runner._backfill_resume(runner.read_checkpoint(runner._backfill_checkpoint_key("2026-01")))
+    _, resumed = runner.backfill(
+        month="2026-01", page_size=10, max_pages=None, start=start, out_path=str(tmp_path / "second.jsonl"),
+    )
+    assert resumed.stop_reason == "exhausted"
+
+    first, second = set(_pulled_ids(tmp_path / "first.jsonl")), set(_pulled_ids(tmp_path / "second.jsonl"))
+    # nothing from the first run's window is skipped; only the ties at the resume point are pulled twice
+    assert first | second >= {f"inc_{i:03d}" for i in range(60)}
+    assert first & second == {"inc_028", "inc_029"}
+    assert ("inc_099" in second) == (new_start_hour >= 14)
+
+
+def test_budget_exceeded_reasons():
+    budget = PullBudget(max_seconds=60, max_rows=1000, max_bytes=10_000)
+
+    assert budget.exceeded(elapsed_s=1, rows=10, bytes_written=100) is None
+    assert budget.exceeded(elapsed_s=61, rows=10, bytes_written=100) == "time_budget"
+    assert budget.exceeded(elapsed_s=1, rows=1000, bytes_written=100) == "row_budget"
+    assert budget.exceeded(elapsed_s=1, rows=10, bytes_written=10_000) == "byte_budget"
+    assert PullBudget().exceeded(elapsed_s=1e9, rows=10**9, bytes_written=10**12) is None
+
+
+def test_checkpoint_written_on_truncation_and_cleared_when_exhausted(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "STATE_DIR", str(tmp_path))
+    key = runner._backfill_checkpoint_key("2026-01")
+
+    truncated = PullStats(
+        rows_written=30,
+        max_source_updated_at=datetime(2026, 1, 20, tzinfo=timezone.utc),
+        stop_reason="time_budget",
+        resume_from=datetime(2026, 1, 20, tzinfo=timezone.utc),
+    )
+    runner._update_checkpoint(key, "snap_1", truncated)
+
+    checkpoint = runner.read_checkpoint(key)
+    assert "next_page" not in checkpoint
+    assert checkpoint["stop_reason"] == "time_budget"
+    assert checkpoint["resume_since"] == "2026-01-20T00:00:00Z"
+    assert os.path.exists(os.path.join(str(tmp_path), "checkpoints", f"{key}.json"))
+
+    runner._update_checkpoint(key, "snap_2", PullStats(rows_written=70))
+    assert runner.read_checkpoint(key) is None
+
+
+@pytest.mark.parametrize(
+    "checkpoint, expected_start",
+    [
+        ({"resume_since": "2026-01-20T00:00:00Z"}, datetime(2026, 1, 20, tzinfo=timezone.utc)),
+        # a page-number checkpoint from before keyset resume redoes the month
+        ({"next_page": 7}, None),
+    ],
+)
+def test_backfill_resumes_from_checkpoint_start_dt(tmp_path, monkeypatch, checkpoint, expected_start):
+    monkeypatch.setattr(runner, "STATE_DIR", str(tmp_path))
+    runner.write_checkpoint(runner._backfill_checkpoint_key("2026-01"), checkpoint)
+    (tmp_path / "out.jsonl").write_text("loaded pages\n")
+
+    captured = {}
+
+    def fake_backfill(*, month, out_path, start, **kwargs):
+        captured["start"] = start
+        captured["out_path"] = out_path
+        return _meta(), PullStats()
+
+    monkeypatch.setattr(runner, "backfill", fake_backfill)
+
+    result = runner.run_pipeline(
+        command="backfill", month="2026-01", page_size=10, max_pages=None,
+        out=str(tmp_path / "out.jsonl"), load_to_bq=False, run_silver_merge_flag=False,
+    )
+
+    assert captured["start"] == expected_start
+    assert result["resumed_from"] == checkpoint
+    # the truncated run's file (already loaded, needed by replay) is left alone
+    assert captured["out_path"] == str(tmp_path / "out.resume1.jsonl")
+    assert (tmp_path / "out.jsonl").read_text() == "loaded pages\n"
+    # nothing left in the window: the resumed month is complete
+    assert runner.read_checkpoint(runner._backfill_checkpoint_key("2026-01")) is None
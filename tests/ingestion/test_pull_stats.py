@@ -0,0 +1,62 @@
+import json
+from datetime import datetime, timezone
+
+import ingestion.runner as runner
+from ingestion.mappers import IngestionMeta
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.text = json.dumps(payload)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+def _row(incident_id, updated_at):
+    return {"incident_id": incident_id, "source_updated_at": updated_at}
+
+
+def test_pull_stats_track_distinct_incidents_and_updated_range(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "API_BASE_URL", "https://example.test/api")
+    monkeypatch.setattr(runner, "TrafficIncidentRow", type(
+        "X", (), {"model_validate": staticmethod(lambda raw: raw)}
+    ))
+    monkeypatch.setattr(runner, "to_bronze_row", lambda meta, validated: validated)
+
+    responses = [
+        FakeResponse({"data": [_row("a", "2026-02-01T10:00:00Z"), _row("b", "2026-02-01T08:00:00Z")]}),
+        FakeResponse([_row("a", "2026-02-01T12:00:00Z")]),
+        FakeResponse({"data": []}),
+    ]
+    monkeypatch.setattr(runner.requests, "post", lambda *a, **k: responses.pop(0))
+
+    meta = IngestionMeta(
+        snapshot_id="snap_test",
+        snapshot_ts=datetime(2026, 2, 2, tzinfo=timezone.utc),
+        run_type="daily",
+        query_name="incremental",
+    )
+
+    stats = runner._pull_pages_to_ndjson(
+        soql="SELECT *",
+        page_size=2,
+        max_pages=10,
+        meta=meta,
+        out_path=str(tmp_path / "out.jsonl"),
+    )
+
+    assert stats.pages == 2
+    assert stats.rows_written == 3
+    assert stats.distinct_incidents == 2
+    assert stats.min_source_updated_at == datetime(2026, 2, 1, 8, tzinfo=timezone.utc)
+    assert stats.max_source_updated_at == datetime(2026, 2, 1, 12, tzinfo=timezone.utc)
+
+    info = runner._run_info(meta, stats)
+    assert info["snapshot_ts"] == "2026-02-02T00:00:00Z"
+    assert info["max_source_updated_at"] == "2026-02-01T12:00:00Z"
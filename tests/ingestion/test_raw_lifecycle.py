@@ -0,0 +1,168 @@
+import gzip
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+import src.ingestion.raw_lifecycle as lifecycle
+import src.ingestion.replay as replay
+from src.storage.load_ledger import content_hash
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def _row(incident_id, snapshot_ts):
+    return {
+        "snapshot_id": f"snap_{snapshot_ts[:10]}",
+        "snapshot_ts": snapshot_ts,
+        "run_type": "daily",
+        "query_name": "incremental",
+        "incident_id": incident_id,
+        "incident_info": "Collision",
+        "description": None,
+        "start_ts": "2026-01-01T10:00:00Z",
+        "modified_ts": None,
+        "quadrant": "NW",
+        "longitude": -114.0719,
+        "latitude": 51.0447,
+        "location_key": "NW_51.045_-114.072",
+        "count": 1,
+        "source_row_id": f"row-{incident_id}",
+        "source_version": "v1",
+        "source_created_at": "2026-01-01T10:00:00Z",
+        "source_updated_at": snapshot_ts,
+    }
+
+
+def _write_aged(path, days_old, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    ts = (NOW - timedelta(days=days_old)).timestamp()
+    os.utime(path, (ts, ts))
+    return path
+
+
+@pytest.fixture
+def raw_tree(tmp_path):
+    root = tmp_path / "raw" / "incremental"
+    return {
+        "root": root,
+        "archive": tmp_path / "raw" / "archive",
+        "fresh": _write_aged(root / "fresh.jsonl", 1, [_row("a", "2026-05-31T00:00:00Z")]),
+        "warm": _write_aged(root / "warm.jsonl", 5, [_row("b", "2026-05-27T00:00:00Z")]),
+        "cold": _write_aged(root / "2026" / "cold.jsonl", 30, [_row("c", "2026-05-02T00:00:00Z")]),
+        "expired": _write_aged(root / "expired.jsonl", 400, [_row("d", "2025-04-27T00:00:00Z")]),
+        "spooled": _write_aged(root / "spool" / "pull.jsonl", 30, [_row("e", "2026-05-02T00:00:00Z")]),
+    }
+
+
+def _entries(archive, source_path):
+    return [e for e in lifecycle.read_manifest(archive).values() if e["source_path"] == str(source_path)]
+
+
+def _run(tree, **kwargs):
+    return lifecycle.run_lifecycle(
+        roots=[str(tree["root"])], archive_root=tree["archive"], now=NOW,
+        compress_after_days=2, archive_after_days=14, delete_after_days=180, **kwargs,
+    )
+
+
+def test_scan_is_one_pass_and_skips_spool(raw_tree):
+    found = lifecycle.scan_raw_files(raw_tree["root"])
+
+    assert sorted(os.path.basename(f.path) for f in found) == ["cold.jsonl", "expired.jsonl", "fresh.jsonl", "warm.jsonl"]
+
+
+def test_lifecycle_moves_each_file_to_its_tier(raw_tree):
+    cold_hash = content_hash(raw_tree["cold"])["content_hash"]
+
+    result = _run(raw_tree)
+
+    assert (result["kept"], result["compressed"], result["archived"], result["deleted"]) == (1, 1, 1, 1)
+    assert raw_tree["fresh"].exists()
+    assert not raw_tree["warm"].exists() and raw_tree["warm"].with_suffix(".jsonl.gz").exists()
+    assert not raw_tree["expired"].exists()
+    assert raw_tree["spooled"].exists()
+
+    archived = raw_tree["archive"] / "2026-05-02" / "incremental" / "2026" / "cold.jsonl.gz"
+    with gzip.open(archived, "rt") as f:
+        assert json.loads(f.readline())["incident_id"] == "c"
+
+    [entry] = _entries(raw_tree["archive"], raw_tree["cold"])
+    assert entry["state"] == "archived"
+    assert entry["path"] == str(archived)
+    assert entry["rows"] == 1
+    assert entry["content_hash"] == cold_hash
+    assert entry["snapshot_from"] == "2026-05-02T00:00:00Z"
+    assert [e["state"] for e in _entries(raw_tree["archive"], raw_tree["expired"])] == ["deleted"]
+
+    # compressed files keep aging from their original mtime
+    later = lifecycle.run_lifecycle(
+        roots=[str(raw_tree["root"])], archive_root=raw_tree["archive"], now=NOW + timedelta(days=10),
+    )
+    assert later["archived"] == 1
+    assert [e["state"] for e in _entries(raw_tree["archive"], raw_tree["warm"])] == ["archived"]
+
+
+def test_reused_output_name_does_not_replace_the_earlier_file(raw_tree):
+    _run(raw_tree)
+    earlier = raw_tree["archive"] / "2026-05-02" / "incremental" / "2026" / "cold.jsonl.gz"
+
+    # a later pull wrote the same output name again, with other rows of the same day
+    _write_aged(raw_tree["cold"], 20, [_row("f", "2026-05-02T06:00:00Z")])
+    _write_aged(raw_tree["root"] / "warm.jsonl", 5, [_row("g", "2026-05-27T06:00:00Z")])
+    _run(raw_tree)
+
+    cold = _entries(raw_tree["archive"], raw_tree["cold"])
+    assert len(cold) == 2 and len({e["path"] for e in cold}) == 2
+    assert earlier.exists() and str(earlier) in {e["path"] for e in cold}
+    warm = _entries(raw_tree["archive"], raw_tree["warm"])
+    assert len({e["path"] for e in warm}) == 2
+
+    rows = set()
+    for entry in cold + warm:
+        with gzip.open(entry["path"], "rt") as f:
+            rows.update(json.loads(line)["incident_id"] for line in f)
+    assert rows == {"b", "c", "f", "g"}
+
+
+def test_dry_run_changes_nothing(raw_tree):
+    result = _run(raw_tree, dry_run=True)
+
+    assert result["archived"] == 1
+    assert raw_tree["cold"].exists() and raw_tree["expired"].exists()
+    assert not lifecycle.manifest_path(raw_tree["archive"]).exists()
+
+
+def test_replay_finds_archived_files_through_the_manifest(raw_tree, tmp_path, monkeypatch):
+    pytest.importorskip("duckdb")
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "warehouse.duckdb"))
+    _run(raw_tree)
+
+    files = replay.discover_raw_files(
+        roots=[str(raw_tree["root"])], archive_root=str(raw_tree["archive"]),
+        from_date=date(2026, 5, 1), to_date=date(2026, 5, 31),
+    )
+    assert [p.name for p in files] == ["cold.jsonl.gz", "warm.jsonl.gz", "fresh.jsonl"]
+
+    result = replay.replay_files(files, backend="duckdb", run_silver_merge_flag=False)
+    assert result["rows_loaded"] == 3
+
+
+def test_replay_defaults_after_a_lifecycle_pass_load_each_file_once(tmp_path, monkeypatch):
+    pytest.importorskip("duckdb")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "warehouse.duckdb"))
+    root = tmp_path / "data" / "raw" / "incremental"
+    _write_aged(root / "warm.jsonl", 5, [_row("b", "2026-05-27T00:00:00Z")])
+
+    # the Dagster op passes absolute roots; replay's defaults are relative
+    lifecycle.run_lifecycle(
+        roots=[str(root)], archive_root=str(tmp_path / lifecycle.ARCHIVE_ROOT), now=NOW,
+    )
+    files = replay.discover_raw_files()
+    result = replay.replay_files(files, backend="duckdb")
+
+    assert [p.name for p in files] == ["warm.jsonl.gz"]
+    assert result["rows_loaded"] == 1
@@ -0,0 +1,135 @@
+import json
+from datetime import date
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+import src.ingestion.replay as replay
+
+
+def _row(snapshot_id, incident_id, snapshot_ts="2026-02-17T12:00:00Z"):
+    return {
+        "snapshot_id": snapshot_id,
+        "snapshot_ts": snapshot_ts,
+        "run_type": "daily",
+        "query_name": "incremental",
+        "incident_id": incident_id,
+        "incident_info": "Collision",
+        "description": "Collision description",
+        "start_ts": "2026-02-17T10:00:00Z",
+        "modified_ts": None,
+        "quadrant": "NW",
+        "longitude": -114.0719,
+        "latitude": 51.0447,
+        "location_key": "NW_51.045_-114.072",
+        "count": 1,
+        "source_row_id": f"row-{incident_id}",
+        "source_version": "v1",
+        "source_created_at": "2026-02-17T10:00:00Z",
+        "source_updated_at": "2026-02-17T10:05:00Z",
+    }
+
+
+def _write(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    return path
+
+
+def test_discover_filters_by_snapshot_day_and_skips_spool(tmp_path):
+    _write(tmp_path / "incremental" / "a.jsonl", [_row("snap_a", "inc_1", "2026-02-10T00:00:00Z")])
+    _write(tmp_path / "incremental" / "b.jsonl", [_row("snap_b", "inc_2", "2026-02-17T00:00:00Z")])
+    _write(tmp_path / "microbatch" / "spool" / "pull_1.jsonl", [_row("snap_c", "inc_3")])
+
+    all_files = replay.discover_raw_files(roots=[str(tmp_path)])
+    assert [p.name for p in all_files] == ["a.jsonl", "b.jsonl"]
+
+    recent = replay.discover_raw_files(roots=[str(tmp_path)], from_date=date(2026, 2, 15))
+    assert [p.name for p in recent] == ["b.jsonl"]
+
+
+def test_validate_reports_schema_mismatches(tmp_path):
+    bad = _row("snap_a", "inc_1")
+    bad["count"] = "one"
+    bad["unexpected"] = True
+    del bad["incident_id"]
+    path = _write(tmp_path / "bad.jsonl", [_row("snap_a", "inc_0"), bad])
+
+    check = replay.validate_raw_file(path)
+
+    assert check["valid"] is False
+    assert check["rows"] == 2
+    assert any("unknown columns ['unexpected']" in e for e in check["errors"])
+    assert any("missing required incident_id" in e for e in check["errors"])
+    assert any("count='one'" in e for e in check["errors"])
+
+    with pytest.raises(RuntimeError, match="do not match the bronze schema"):
+        replay.replay_files([path], backend="duckdb")
+
+
+@pytest.mark.parametrize("single_load", [False, True])
+def test_replay_loads_files_and_merges_once(tmp_path, monkeypatch, single_load):
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "warehouse.duckdb"))
+    files = [
+        _write(tmp_path / "raw" / "a.jsonl", [_row("snap_a", "inc_1")]),
+        _write(tmp_path / "raw" / "b.jsonl", [_row("snap_b", "inc_1"), _row("snap_b", "inc_2")]),
+    ]
+
+    result = replay.replay_files(
+        files, backend="duckdb", single_load=single_load, batch_dir=str(tmp_path / "replay"),
+    )
+
+    assert result["rows_loaded"] == 3
+    assert result["snapshot_ids"] == ["snap_a", "snap_b"]
+    kinds = [job["kind"] for job in result["bq_jobs"]]
+    assert kinds == (["load", "merge"] if single_load else ["load", "load", "merge"])
+
+
+def test_replay_skips_files_already_in_the_ledger(tmp_path, monkeypatch):
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "warehouse.duckdb"))
+    files = [_write(tmp_path / "raw" / "a.jsonl", [_row("snap_a", "inc_1")])]
+
+    first = replay.replay_files(files, backend="duckdb")
+    again = replay.replay_files(files, backend="duckdb")
+    forced = replay.replay_files(files, backend="duckdb", force=True)
+
+    assert first["rows_loaded"] == 1
+    assert again["rows_loaded"] == 0
+    assert again["skipped_files"] == [str(files[0])]
+    assert again["snapshot_ids"] == ["snap_a"]
+    assert forced["rows_loaded"] == 1
+
+
+def test_replay_loads_the_same_rows_once_per_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "warehouse.duckdb"))
+    # a re-pull under a new snapshot: same rows, different file
+    files = [
+        _write(tmp_path / "raw" / "a.jsonl", [_row("snap_a", "inc_1")]),
+        _write(tmp_path / "raw" / "b.jsonl", [_row("snap_b", "inc_1")]),
+    ]
+
+    result = replay.replay_files(files, backend="duckdb")
+
+    assert result["rows_loaded"] == 1
+    assert result["skipped_files"] == [str(files[1])]
+    assert result["snapshot_ids"] == ["snap_a"]
+
+
+def test_failed_merge_keeps_the_loads_in_the_ledger(tmp_path, monkeypatch):
+    from src.storage.duckdb_backend import DuckDBBackend
+
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "warehouse.duckdb"))
+    files = [_write(tmp_path / "raw" / "a.jsonl", [_row("snap_a", "inc_1")])]
+
+    merge = DuckDBBackend.merge_silver
+    monkeypatch.setattr(DuckDBBackend, "merge_silver", lambda self, *a, **kw: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        replay.replay_files(files, backend="duckdb")
+    monkeypatch.setattr(DuckDBBackend, "merge_silver", merge)
+
+    retry = replay.replay_files(files, backend="duckdb")
+
+    assert retry["rows_loaded"] == 0
+    assert retry["skipped_files"] == [str(files[0])]
+    assert retry["silver_merge_job_id"] is not None
@@ -0,0 +1,167 @@
+import json
+import multiprocessing
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import ingestion.runner as runner
+from ingestion.mappers import IngestionMeta
+from ingestion.runner import PullStats
+
+
+def _use_tmp_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "STATE_DIR", str(tmp_path))
+    monkeypatch.setattr(runner, "WATERMARK_PATH", os.path.join(str(tmp_path), "watermark.json"))
+
+
+def test_advance_watermark_never_moves_back(tmp_path, monkeypatch):
+    _use_tmp_state(tmp_path, monkeypatch)
+
+    newer = datetime(2026, 2, 17, 12, 0, tzinfo=timezone.utc)
+    older = datetime(2026, 2, 10, 12, 0, tzinfo=timezone.utc)
+
+    assert runner.advance_watermark(newer) is True
+    assert runner.advance_watermark(older) is False
+    assert runner.advance_watermark(newer) is False
+    assert runner.read_watermark() == newer
+
+
+def _advance_many(offsets):
+    base = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    for minutes in offsets:
+        runner.advance_watermark(base + timedelta(minutes=minutes))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses fork to share the patched state dir")
+def test_concurrent_advances_keep_the_newest(tmp_path, monkeypatch):
+    _use_tmp_state(tmp_path, monkeypatch)
+
+    # interleaved old and new values from several processes at once
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_advance_many, args=(range(i, 400, 8),)) for i in range(8)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert all(w.exitcode == 0 for w in workers)
+    assert runner.read_watermark() == datetime(2026, 2, 1, tzinfo=timezone.utc) + timedelta(minutes=399)
+
+
+def test_incremental_until_bounds_the_window(monkeypatch):
+    captured = {}
+
+    def fake_pull(*, soql, **kwargs):
+        captured["soql"] = soql
+        return PullStats()
+
+    monkeypatch.setattr(runner, "_pull_pages_to_ndjson", fake_pull)
+
+    runner.incremental(
+        since=datetime(2026, 2, 16, 23, 55, tzinfo=timezone.utc),
+        until=datetime(2026, 2, 18, tzinfo=timezone.utc),
+        page_size=10,
+        max_pages=1,
+        out_path="unused.jsonl",
+    )
+
+    assert ":updated_at >= '2026-02-16T23:55:00Z'" in captured["soql"]
+    assert ":updated_at < '2026-02-18T00:00:00Z'" in captured["soql"]
+
+
+def _write_bronze_row(out_path, meta):
+    row = {
+        "snapshot_id": meta.snapshot_id, "snapshot_ts": runner._iso_z(meta.snapshot_ts), "run_type": "daily",
+        "query_name": "incremental", "incident_id": "inc_a", "incident_info": "Collision",
+        "description": "Collision", "start_ts": "2026-02-17T10:00:00Z", "modified_ts": None,
+        "quadrant": "NW", "longitude": -114.0719, "latitude": 51.0447, "count": 1,
+        "source_row_id": "row-inc_a", "source_version": "v1",
+        "source_created_at": "2026-02-17T10:00:00Z", "source_updated_at": "2026-02-17T10:05:00Z",
+    }
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(row) + "\n")
+
+
+def test_failed_run_stats_insert_does_not_block_watermark(tmp_path, monkeypatch):
+    pytest.importorskip("duckdb")
+    _use_tmp_state(tmp_path, monkeypatch)
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "warehouse.duckdb"))
+
+    updated = datetime(2026, 2, 17, 10, 5, tzinfo=timezone.utc)
+    meta = IngestionMeta(
+        snapshot_id="snap_1",
+        snapshot_ts=datetime(2026, 2, 17, 12, 0, tzinfo=timezone.utc),
+        run_type="daily",
+        query_name="incremental",
+    )
+
+    def fake_incremental(*, out_path, **kwargs):
+        _write_bronze_row(out_path, meta)
+        return meta, PullStats(pages=1, rows_written=1, max_source_updated_at=updated)
+
+    def failing_insert(run):
+        raise RuntimeError("control table unavailable")
+
+    monkeypatch.setattr(runner, "incremental", fake_incremental)
+    monkeypatch.setattr(runner, "record_pipeline_run", failing_insert)
+
+    result = runner.run_pipeline(
+        command="pull",
+        since="2026-02-17T00:00:00Z",
+        page_size=10,
+        max_pages=1,
+        out=str(tmp_path / "pull.jsonl"),
+        load_to_bq=True,
+        run_silver_merge_flag=True,
+        record_run_stats_flag=True,
+        backend="duckdb",
+    )
+
+    assert result["rows_loaded"] == 1
+    assert result["watermark_after"] == "2026-02-17T10:05:00Z"
+    assert runner.read_watermark() == updated
+
+
+def test_retry_after_failed_merge_reports_the_loaded_snapshot(tmp_path, monkeypatch):
+    pytest.importorskip("duckdb")
+    from src.storage.duckdb_backend import DuckDBBackend
+    from orchestration.traffic_orchestrator.traffic_orchestrator.dbt_selection import dbt_build_args
+
+    _use_tmp_state(tmp_path, monkeypatch)
+    monkeypatch.setenv("DUCKDB_PATH", str(tmp_path / "warehouse.duckdb"))
+
+    attempts = iter([
+        IngestionMeta("snap_1", datetime(2026, 2, 17, 12, 0, tzinfo=timezone.utc), "daily", "incremental"),
+        IngestionMeta("snap_2", datetime(2026, 2, 17, 13, 0, tzinfo=timezone.utc), "daily", "incremental"),
+    ])
+
+    def fake_incremental(*, out_path, **kwargs):
+        meta = next(attempts)
+        _write_bronze_row(out_path, meta)
+        return meta, PullStats(pages=1, rows_written=1)
+
+    monkeypatch.setattr(runner, "incremental", fake_incremental)
+    run = dict(
+        command="pull", since="2026-02-17T00:00:00Z", page_size=10, max_pages=1,
+        load_to_bq=True, run_silver_merge_flag=True, backend="duckdb",
+    )
+
+    merge = DuckDBBackend.merge_silver
+    monkeypatch.setattr(DuckDBBackend, "merge_silver", lambda self, *a, **kw: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        runner.run_pipeline(out=str(tmp_path / "first.jsonl"), **run)
+    monkeypatch.setattr(DuckDBBackend, "merge_silver", merge)
+
+    result = runner.run_pipeline(out=str(tmp_path / "retry.jsonl"), **run)
+
+    # the rows are in bronze under the first attempt's snapshot, not the retry's
+    assert result["load_skipped"] is True and result["rows_loaded"] == 0
+    assert result["snapshot_id"] == "snap_1"
+    assert result["snapshot_ids"] == ["snap_1"]
+    assert result["snapshot_ts"] == "2026-02-17T12:00:00Z"
+    assert result["silver_merge_job_id"] is not None
+    # dbt still builds the snapshot that never reached it
+    args = dbt_build_args(result)
+    assert json.loads(args[args.index("--vars") + 1]) == {"snapshot_ids": ["snap_1"], "snapshot_ts": "2026-02-17T12:00:00Z"}
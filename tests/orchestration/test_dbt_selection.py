@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+from orchestration.traffic_orchestrator.traffic_orchestrator.dbt_selection import (
+    CURRENT_STATE_SELECTION,
+    SNAPSHOT_SELECTION,
+    dbt_build_args,
+    dbt_selection,
+)
+
+DBT_PROJECT_DIR = Path(__file__).resolve().parents[2] / "dbt" / "traffic_incidents"
+
+
+@pytest.fixture(scope="module")
+def dbt_ls():
+    """Model names dbt itself selects for a selector, from the real project."""
+    pytest.importorskip("dbt.adapters.bigquery")
+    from dbt.cli.main import dbtRunner
+
+    if not (DBT_PROJECT_DIR / "dbt_packages").is_dir():
+        pytest.skip("dbt packages not installed (run dbt deps)")
+
+    project_args = ["--project-dir", str(DBT_PROJECT_DIR), "--profiles-dir", str(DBT_PROJECT_DIR)]
+
+    def ls(*selectors: str) -> set[str]:
+        res = dbtRunner().invoke(
+            ["ls", "--resource-type", "model", "--output", "name", "--select", *selectors, *project_args]
+        )
+        assert res.success, res.exception
+        return set(res.result)
+
+    return ls
+
+
+def _result(*, rows_loaded=100, silver_merge_ran=True, merge_rows=5):
+    return {
+        "command": "pull",
+        "snapshot_id": "daily_incremental_20260218T000000Z",
+        "snapshot_ids": ["daily_incremental_20260218T000000Z"] if rows_loaded else [],
+        "snapshot_ts": "2026-02-18T00:00:00Z",
+        "run_type": "daily",
+        "rows_loaded": rows_loaded,
+        "loaded_to_bq": True,
+        "silver_merge_ran": silver_merge_ran,
+        "bq_jobs": [{"kind": "load", "rows_affected": rows_loaded}]
+        + ([{"kind": "merge", "rows_affected": merge_rows}] if silver_merge_ran else []),
+    }
+
+
+def test_daily_run_does_not_select_the_whole_project(dbt_ls):
+    selected = dbt_ls(*dbt_selection(_result()))
+
+    assert selected < dbt_ls("*")
+    assert {"fact_incident_snapshot", "dim_incident_history", "dim_incident", "fact_incident"} <= selected
+    assert not selected & dbt_ls("config.materialized:view")
+
+
+def test_bronze_only_run_skips_current_state_tables(dbt_ls):
+    for result in (_result(silver_merge_ran=False), _result(merge_rows=0)):
+        selected = dbt_ls(*dbt_selection(result))
+        assert "fact_incident_snapshot" in selected
+        assert not selected & {"dim_incident", "fact_incident"}
+
+
+def test_selection_follows_what_the_run_changed():
+    assert dbt_selection(_result()) == [SNAPSHOT_SELECTION, CURRENT_STATE_SELECTION]
+    assert dbt_selection(_result(silver_merge_ran=False)) == [SNAPSHOT_SELECTION]
+    assert dbt_selection(_result(merge_rows=0)) == [SNAPSHOT_SELECTION]
+
+
+def test_nothing_loaded_builds_nothing():
+    assert dbt_selection(_result(rows_loaded=0)) == []
+    assert dbt_build_args(_result(rows_loaded=0)) == []
+    assert "--vars" in dbt_build_args(_result())
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+
+import pytest
+
+import src.storage.bq_compaction as bq_compaction
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def result(self):
+        return iter(self._rows)
+
+
+class FakeClient:
+    def __init__(self, *, rows_scanned, rows_kept, bytes_before):
+        self.rows_scanned = rows_scanned
+        self.rows_kept = rows_kept
+        self.bytes_before = bytes_before
+        self.sql = []
+
+    def query(self, sql, job_config=None):
+        self.sql.append(sql)
+        if "INFORMATION_SCHEMA.PARTITIONS" in sql:
+            return FakeQuery([SimpleNamespace(logical_bytes=self.bytes_before)])
+        if "COUNTIF(keep)" in sql:
+            return FakeQuery([SimpleNamespace(rows_scanned=self.rows_scanned, rows_kept=self.rows_kept)])
+        raise AssertionError("compaction script should not run in dry-run mode")
+
+
+@pytest.fixture
+def env(monkeypatch):
+    monkeypatch.setenv("GCP_PROJECT_ID", "proj")
+    monkeypatch.setenv("BRONZE_DATASET_ID", "traffic_bronze")
+    monkeypatch.setenv("BRONZE_TABLE_ID", "traffic_incidents_raw")
+    monkeypatch.setattr(bq_compaction, "assert_dataset_access", lambda c, d: None)
+    monkeypatch.setattr(bq_compaction, "assert_table_access", lambda c, t: None)
+
+
+def test_dry_run_reports_rows_and_estimated_bytes(env, monkeypatch):
+    client = FakeClient(rows_scanned=1_000, rows_kept=250, bytes_before=4_000)
+    monkeypatch.setattr(bq_compaction, "make_bq_client", lambda: client)
+
+    result = bq_compaction.compact_bronze(older_than_days=30, dry_run=True)
+
+    assert result["dry_run"] is True
+    assert result["rows_removed"] == 750
+    assert result["bytes_reclaimed"] == 3_000
+    assert result["job_id"] is None
+    assert not any("BEGIN TRANSACTION" in sql for sql in client.sql)
+
+
+def _bronze_row(snapshot_id, snapshot_ts, incident_id, updated_at, query_name="incremental"):
+    return (
+        snapshot_id, snapshot_ts, "daily", query_name,
+        incident_id, "Collision", "Collision description",
+        "2026-01-01 08:00:00+00", None,
+        "NW", -114.0719, 51.0447, "NW:51.04:-114.07", 1,
+        f"row-{incident_id}", "v1", "2026-01-01 08:00:00+00", updated_at,
+    )
+
+
+def test_keep_rule_only_drops_exact_duplicates_within_a_snapshot():
+    pytest.importorskip("duckdb")
+    from src.storage.duckdb_backend import BRONZE_TABLE, DuckDBBackend
+
+    rows = [
+        _bronze_row("snap_1", "2026-01-02 00:00:00+00", "inc_a", "2026-01-01 09:00:00+00"),
+        # same incident version re-observed by a later snapshot: snapshot-grain models need it
+        _bronze_row("snap_2", "2026-01-03 00:00:00+00", "inc_a", "2026-01-01 09:00:00+00"),
+        # the same row appended twice to one snapshot
+        _bronze_row("snap_2", "2026-01-03 00:00:00+00", "inc_b", None),
+        _bronze_row("snap_2", "2026-01-03 00:00:00+00", "inc_b", None),
+        # same incident from another query in the same snapshot is a different row
+        _bronze_row("snap_2", "2026-01-03 00:00:00+00", "inc_b", None, query_name="backfill"),
+    ]
+    backend = DuckDBBackend(":memory:")
+    placeholders = ", ".join("?" * len(rows[0]))
+    backend.conn.executemany(f"INSERT INTO {BRONZE_TABLE} VALUES ({placeholders})", rows)
+
+    kept = backend.conn.execute(
+        f"""
+        SELECT snapshot_id, incident_id, query_name
+        FROM {BRONZE_TABLE}
+        QUALIFY {bq_compaction.KEEP_ROW_PREDICATE}
+        ORDER BY snapshot_id, incident_id, query_name
+        """
+    ).fetchall()
+
+    assert kept == [
+        ("snap_1", "inc_a", "incremental"),
+        ("snap_2", "inc_a", "incremental"),
+        ("snap_2", "inc_b", "backfill"),
+        ("snap_2", "inc_b", "incremental"),
+    ]
+
+
+def test_rewrite_stages_survivors_before_dropping_the_window():
+    sql = bq_compaction.COMPACTION_SQL_TEMPLATE.format(
+        bronze_table="p.d.t",
+        window_filter=bq_compaction.WINDOW_FILTER,
+        keep_row_predicate=bq_compaction.KEEP_ROW_PREDICATE,
+    )
+    assert sql.index("CREATE TEMP TABLE") < sql.index("DELETE FROM") < sql.index("INSERT INTO")
+
+
+def test_rejects_since_inside_retention_window(env):
+    with pytest.raises(ValueError, match="since_days"):
+        bq_compaction.compact_bronze(older_than_days=30, since_days=10)
@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+from src.storage.bq_jobs import BqJobHandle, wait_all
+
+
+class FakeJob:
+    def __init__(self, job_id, states, error_result=None):
+        self.job_id = job_id
+        self._states = list(states)
+        self.state = self._states.pop(0)
+        self.error_result = error_result
+        self.errors = None
+        self.output_rows = 3
+
+    def reload(self):
+        if self._states:
+            self.state = self._states.pop(0)
+
+
+def test_handle_polls_until_done_and_logs_transitions(capsys):
+    handle = BqJobHandle(
+        lambda: FakeJob("job_1", ["PENDING", "RUNNING", "DONE"]),
+        kind="load",
+        poll_interval=0,
+    )
+
+    job = handle.wait(timeout=5)
+
+    assert job.job_id == "job_1"
+    assert handle.done()
+    assert handle.timings()["submit_to_done_s"] is not None
+
+    out = capsys.readouterr().out
+    assert "[bq][load] job=job_1 SUBMITTED -> PENDING" in out
+    assert "job=job_1 PENDING -> RUNNING" in out
+    assert "job=job_1 RUNNING -> DONE" in out
+
+
+def test_dependent_job_is_submitted_only_after_dependency():
+    release_load = threading.Event()
+    order = []
+
+    def submit_load():
+        release_load.wait(timeout=5)
+        order.append("load")
+        return FakeJob("load_1", ["DONE"])
+
+    def submit_merge():
+        order.append("merge")
+        return FakeJob("merge_1", ["DONE"])
+
+    load = BqJobHandle(submit_load, kind="load", poll_interval=0)
+    merge = BqJobHandle(submit_merge, kind="merge", depends_on=[load], poll_interval=0)
+
+    # caller is not blocked while the load is still outstanding
+    assert not merge.done()
+
+    release_load.set()
+    wait_all([load, merge])
+
+    assert order == ["load", "merge"]
+
+
+def test_failed_dependency_prevents_submission():
+    submitted = []
+
+    load = BqJobHandle(
+        lambda: FakeJob("load_1", ["DONE"], error_result={"reason": "invalid"}),
+        kind="load",
+        poll_interval=0,
+    )
+    merge = BqJobHandle(lambda: submitted.append("merge"), kind="merge", depends_on=[load], poll_interval=0)
+
+    with pytest.raises(RuntimeError, match="BigQuery job failed"):
+        wait_all([load, merge])
+
+    with pytest.raises(RuntimeError, match="dependency load failed"):
+        merge.wait()
+    assert submitted == []
+
+
+def test_waiting_handles_do_not_hold_poller_threads():
+    release_load = threading.Event()
+
+    def submit_load():
+        release_load.wait(timeout=10)
+        return FakeJob("load_1", ["DONE"])
+
+    load = BqJobHandle(submit_load, kind="load", poll_interval=0)
+    # more dependents than poller threads, all waiting on the same load
+    merges = [
+        BqJobHandle(lambda i=i: FakeJob(f"merge_{i}", ["DONE"]), kind="merge", depends_on=[load], poll_interval=0)
+        for i in range(20)
+    ]
+
+    # an unrelated job still gets a thread while they wait
+    other = BqJobHandle(lambda: FakeJob("other_1", ["DONE"]), kind="load", poll_interval=0)
+    assert other.wait(timeout=2).job_id == "other_1"
+
+    release_load.set()
+    assert [job.job_id for job in wait_all(merges)] == [f"merge_{i}" for i in range(20)]
@@ -0,0 +1,96 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from src.storage.bq_jobs import BqJobHandle
+from src.storage.bq_telemetry import collect_job_stats, job_stats, summarize_job_stats
+
+
+T0 = datetime(2026, 3, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+
+class FakeQueryJob:
+    job_id = "merge_1"
+    job_type = "query"
+    statement_type = "MERGE"
+    state = "DONE"
+    error_result = None
+    errors = None
+    created = T0
+    started = T0 + timedelta(milliseconds=250)
+    ended = T0 + timedelta(seconds=2)
+    total_bytes_processed = 1_000
+    total_bytes_billed = 10_485_760
+    slot_millis = 4_200
+    num_dml_affected_rows = 17
+    cache_hit = False
+
+    def reload(self):
+        pass
+
+
+class FakeLoadJob:
+    job_id = "load_1"
+    job_type = "load"
+    state = "DONE"
+    error_result = None
+    errors = None
+    created = T0
+    started = T0 + timedelta(seconds=1)
+    ended = T0 + timedelta(seconds=3)
+    input_file_bytes = 2_048
+    output_rows = 40
+    _properties = {"statistics": {"totalSlotMs": "900"}}
+
+    def reload(self):
+        pass
+
+
+def test_job_stats_for_query_and_load_jobs():
+    merge = job_stats(FakeQueryJob(), kind="merge")
+    assert merge["queue_ms"] == 250
+    assert merge["run_ms"] == 1750
+    assert merge["bytes_billed"] == 10_485_760
+    assert merge["slot_ms"] == 4_200
+    assert merge["rows_affected"] == 17
+
+    load = job_stats(FakeLoadJob(), kind="load")
+    assert load["slot_ms"] == 900
+    assert load["rows_affected"] == 40
+    assert load["input_bytes"] == 2_048
+    assert load["bytes_billed"] is None
+
+
+def test_collector_captures_every_finished_handle():
+    with collect_job_stats() as collected:
+        handles = [
+            BqJobHandle(FakeLoadJob, kind="load", poll_interval=0),
+            BqJobHandle(FakeQueryJob, kind="merge", poll_interval=0),
+        ]
+        for h in handles:
+            h.wait(timeout=5)
+
+    assert sorted(s["job_id"] for s in collected) == ["load_1", "merge_1"]
+
+    totals = summarize_job_stats(collected)
+    assert totals["bq_job_count"] == 2
+    assert totals["bq_slot_ms"] == 5_100
+
+
+def test_concurrent_runs_only_collect_their_own_jobs():
+    barrier = threading.Barrier(2)
+    collected = {}
+
+    def run(job):
+        with collect_job_stats() as jobs:
+            barrier.wait()
+            BqJobHandle(job, kind=job.job_type, poll_interval=0).wait(timeout=5)
+            barrier.wait()
+        collected[job.job_id] = [s["job_id"] for s in jobs]
+
+    threads = [threading.Thread(target=run, args=(job,)) for job in (FakeLoadJob, FakeQueryJob)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert collected == {"load_1": ["load_1"], "merge_1": ["merge_1"]}
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+from src.storage.duckdb_backend import DuckDBBackend, SILVER_TABLE, translate_ddl
+
+
+def _bronze_row(snapshot_id, snapshot_ts, incident_id, info, updated_at, version="v1"):
+    return {
+        "snapshot_id": snapshot_id,
+        "snapshot_ts": snapshot_ts,
+        "run_type": "daily",
+        "query_name": "incremental",
+        "incident_id": incident_id,
+        "incident_info": info,
+        "description": f"{info} description",
+        "start_ts": "2026-01-01T08:00:00Z",
+        "modified_ts": None,
+        "quadrant": "NW",
+        "longitude": -114.0719,
+        "latitude": 51.0447,
+        "count": 1,
+        "source_row_id": f"row-{incident_id}",
+        "source_version": version,
+        "source_created_at": "2026-01-01T08:00:00Z",
+        "source_updated_at": updated_at,
+    }
+
+
+SNAPSHOTS = {
+    "snap_1": [
+        _bronze_row("snap_1", "2026-01-02T00:00:00Z", "inc_a", "Stalled vehicle", "2026-01-01T09:00:00Z"),
+        _bronze_row("snap_1", "2026-01-02T00:00:00Z", "inc_b", "Collision", "2026-01-01T10:00:00Z"),
+    ],
+    "snap_2": [
+        # newer source update for inc_a, stale re-observation of inc_b
+        _bronze_row("snap_2", "2026-01-03T00:00:00Z", "inc_a", "Stalled vehicle cleared", "2026-01-02T09:00:00Z"),
+        _bronze_row("snap_2", "2026-01-03T00:00:00Z", "inc_b", "Collision (old)", "2026-01-01T08:00:00Z"),
+        _bronze_row("snap_2", "2026-01-03T00:00:00Z", "inc_c", "Road closure", "2026-01-02T11:00:00Z"),
+    ],
+}
+
+
+def _write(tmp_path, name, rows):
+    path = tmp_path / f"{name}.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    return path
+
+
+def _silver(backend):
+    return backend.conn.execute(
+        f"SELECT incident_id, incident_info, last_snapshot_id FROM {SILVER_TABLE} ORDER BY incident_id"
+    ).fetchall()
+
+
+def test_translate_ddl_drops_bigquery_only_clauses():
+    statements = translate_ddl(
+        "CREATE TABLE IF NOT EXISTS `PROJECT_ID.traffic_bronze.t` (a STRING, b INT64)\n"
+        "PARTITION BY DATE(ts)\nCLUSTER BY a;"
+    )
+    assert statements[0] == "CREATE SCHEMA IF NOT EXISTS traffic_bronze"
+    assert "traffic_bronze.t" in statements[1]
+    assert "VARCHAR" in statements[1] and "BIGINT" in statements[1]
+    assert "PARTITION" not in statements[1] and "CLUSTER" not in statements[1]
+
+
+def test_load_and_merge_end_to_end(tmp_path):
+    backend = DuckDBBackend()
+
+    assert backend.load_jsonl(_write(tmp_path, "snap_1", SNAPSHOTS["snap_1"])) == 2
+    backend.merge_silver("snap_1")
+
+    assert _silver(backend) == [
+        ("inc_a", "Stalled vehicle", "snap_1"),
+        ("inc_b", "Collision", "snap_1"),
+    ]
+
+
+def test_batched_merge_matches_one_at_a_time(tmp_path):
+    one_by_one = DuckDBBackend()
+    batched = DuckDBBackend()
+
+    for name, rows in SNAPSHOTS.items():
+        path = _write(tmp_path, name, rows)
+        one_by_one.load_jsonl(path)
+        batched.load_jsonl(path)
+
+    for name in SNAPSHOTS:
+        one_by_one.merge_silver(name)
+    batched.merge_silver(snapshot_ids=list(SNAPSHOTS))
+
+    assert _silver(batched) == _silver(one_by_one) == [
+        ("inc_a", "Stalled vehicle cleared", "snap_2"),
+        ("inc_b", "Collision", "snap_1"),
+        ("inc_c", "Road closure", "snap_2"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"snapshot_id": "snap_1", "snapshot_ids": ["snap_2"]},
+        {"snapshot_id": "snap_1", "snapshot_ts_start": "2026-01-01", "snapshot_ts_end": "2026-01-04"},
+        {"snapshot_ids": []},
+        {"snapshot_ts_start": "2026-01-04", "snapshot_ts_end": "2026-01-01"},
+    ],
+)
+def test_merge_rejects_ambiguous_snapshot_selection(kwargs):
+    # the shared queries.resolve_snapshot_selection rules
+    with pytest.raises(ValueError):
+        DuckDBBackend().merge_silver(**kwargs)
@@ -0,0 +1,120 @@
+import json
+import multiprocessing
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+from src.storage import load_ledger
+from src.storage.duckdb_backend import DuckDBBackend
+
+
+def _row(snapshot_id, incident_id):
+    return {
+        "snapshot_id": snapshot_id,
+        "snapshot_ts": "2026-02-17T12:00:00Z",
+        "run_type": "daily",
+        "query_name": "incremental",
+        "incident_id": incident_id,
+        "incident_info": "Collision",
+        "description": None,
+        "start_ts": "2026-02-17T10:00:00Z",
+        "modified_ts": None,
+        "quadrant": "NW",
+        "longitude": -114.0719,
+        "latitude": 51.0447,
+        "location_key": "NW_51.045_-114.072",
+        "count": 1,
+        "source_row_id": f"row-{incident_id}",
+        "source_version": "v1",
+        "source_created_at": "2026-02-17T10:00:00Z",
+        "source_updated_at": "2026-02-17T10:05:00Z",
+    }
+
+
+def _write(path, rows):
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    return path
+
+
+def test_content_hash_ignores_snapshot_metadata(tmp_path):
+    first = _write(tmp_path / "a.jsonl", [_row("snap_1", "inc_1")])
+    rerun = _write(tmp_path / "b.jsonl", [_row("snap_2", "inc_1")])
+    changed = _write(tmp_path / "c.jsonl", [_row("snap_1", "inc_2")])
+
+    assert load_ledger.content_hash(first)["content_hash"] == load_ledger.content_hash(rerun)["content_hash"]
+    assert load_ledger.content_hash(first)["content_hash"] != load_ledger.content_hash(changed)["content_hash"]
+    assert load_ledger.content_hash(rerun)["snapshot_ids"] == ["snap_2"]
+
+
+def test_load_once_skips_a_rerun_and_returns_the_prior_job(tmp_path):
+    warehouse = DuckDBBackend(tmp_path / "warehouse.duckdb")
+    first = load_ledger.load_once(warehouse, _write(tmp_path / "a.jsonl", [_row("snap_1", "inc_1")]))
+    rerun = load_ledger.load_once(warehouse, _write(tmp_path / "b.jsonl", [_row("snap_2", "inc_1")]))
+
+    assert first["skipped"] is False and first["rows_loaded"] == 1
+    assert rerun["skipped"] is True and rerun["rows_loaded"] == 0
+    assert rerun["load_job_id"] == first["load_job_id"]
+    # the rows are in bronze under the first snapshot
+    assert rerun["snapshot_ids"] == ["snap_1"]
+    assert warehouse.conn.execute("SELECT count(*) FROM traffic_bronze.traffic_incidents_raw").fetchone()[0] == 1
+
+
+def test_ledger_off_loads_every_time(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOAD_LEDGER", "off")
+    warehouse = DuckDBBackend(tmp_path / "warehouse.duckdb")
+    path = _write(tmp_path / "a.jsonl", [_row("snap_1", "inc_1")])
+
+    load_ledger.load_once(warehouse, path)
+    again = load_ledger.load_once(warehouse, path)
+
+    assert again["skipped"] is False and again["rows_loaded"] == 1
+
+
+def test_ledger_is_scoped_to_the_bronze_table(tmp_path):
+    path = _write(tmp_path / "a.jsonl", [_row("snap_1", "inc_1")])
+    load_ledger.load_once(DuckDBBackend(tmp_path / "old.duckdb"), path)
+
+    # a new DUCKDB_PATH has an empty bronze table: the same rows must load there
+    fresh = DuckDBBackend(tmp_path / "new.duckdb")
+    again = load_ledger.load_once(fresh, path)
+
+    assert again["skipped"] is False and again["rows_loaded"] == 1
+    assert fresh.conn.execute("SELECT count(*) FROM traffic_bronze.traffic_incidents_raw").fetchone()[0] == 1
+
+
+class _SlowWarehouse:
+    """Counts loads in a file shared across processes; slow enough for the processes to overlap."""
+
+    name = "fake"
+
+    def __init__(self, loads_path):
+        self.loads_path = loads_path
+
+    @property
+    def bronze_target(self):
+        return "fake.bronze"
+
+    def load_jsonl(self, path):
+        time.sleep(0.2)
+        with open(self.loads_path, "a", encoding="utf-8") as f:
+            f.write(f"{path}\n")
+        return 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses fork to share the patched ledger path")
+def test_concurrent_load_once_loads_the_same_rows_once(tmp_path):
+    warehouse = _SlowWarehouse(tmp_path / "loads.txt")
+    paths = [_write(tmp_path / f"{i}.jsonl", [_row(f"snap_{i}", "inc_1")]) for i in range(4)]
+
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=load_ledger.load_once, args=(warehouse, path)) for path in paths]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert all(w.exitcode == 0 for w in workers)
+    assert len((tmp_path / "loads.txt").read_text().splitlines()) == 1
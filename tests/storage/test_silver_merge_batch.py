@@ -0,0 +1,85 @@
+import pytest
+
+import src.storage.bq_silver as bq_silver
+from src.ingestion.queries import build_merge_sql, SNAPSHOT_IDS_FILTER
+
+
+class FakeJob:
+    job_id = "job_test"
+    error_result = None
+    errors = None
+    state = "DONE"
+
+    def reload(self):
+        pass
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def query(self, sql, job_config=None):
+        self.calls.append({"sql": sql, "job_config": job_config})
+        return FakeJob()
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    for name, value in {
+        "GCP_PROJECT_ID": "proj",
+        "BRONZE_DATASET_ID": "traffic_bronze",
+        "BRONZE_TABLE_ID": "traffic_incidents_raw",
+        "SILVER_DATASET_ID": "traffic_silver",
+        "SILVER_TABLE_ID": "incident_current",
+    }.items():
+        monkeypatch.setenv(name, value)
+
+    client = FakeClient()
+    monkeypatch.setattr(bq_silver, "make_bq_client", lambda: client)
+    monkeypatch.setattr(bq_silver, "assert_dataset_access", lambda c, d: None)
+    monkeypatch.setattr(bq_silver, "assert_table_access", lambda c, t: None)
+    return client
+
+
+def test_build_merge_sql_defaults_to_single_snapshot():
+    sql = build_merge_sql(
+        gcp_project_id="p",
+        bronze_dataset_id="b",
+        bronze_table_id="raw",
+        silver_dataset_id="s",
+        silver_table_id="cur",
+    )
+    assert "WHERE snapshot_id = @snapshot_id" in sql
+
+
+def test_run_silver_merge_folds_snapshot_ids_into_one_merge(fake_client):
+    job_id = bq_silver.run_silver_merge(snapshot_ids=["snap_b", "snap_a", "snap_b"])
+
+    assert job_id == "job_test"
+    assert len(fake_client.calls) == 1
+    call = fake_client.calls[0]
+    assert SNAPSHOT_IDS_FILTER in call["sql"]
+
+    (param,) = call["job_config"].query_parameters
+    assert param.name == "snapshot_ids"
+    assert param.values == ["snap_a", "snap_b"]
+
+
+def test_run_silver_merge_snapshot_ts_range(fake_client):
+    bq_silver.run_silver_merge(
+        snapshot_ts_start="2026-01-01T00:00:00Z",
+        snapshot_ts_end="2026-02-01T00:00:00Z",
+    )
+
+    call = fake_client.calls[0]
+    assert "snapshot_ts >= @snapshot_ts_start AND snapshot_ts < @snapshot_ts_end" in call["sql"]
+    names = [p.name for p in call["job_config"].query_parameters]
+    assert names == ["snapshot_ts_start", "snapshot_ts_end"]
+
+
+def test_run_silver_merge_rejects_mixed_selection(fake_client):
+    with pytest.raises(ValueError, match="only one of"):
+        bq_silver.run_silver_merge("snap_a", snapshot_ids=["snap_b"])
+
+    with pytest.raises(ValueError, match="both start and end"):
+        bq_silver.run_silver_merge(snapshot_ts_start="2026-01-01T00:00:00Z")